@@ -21,29 +21,104 @@ MONGODB_COLLECTION = os.getenv("MONGODB_COLLECTION")
 AWS_CONN_ID = "aws_default"
 AWS_BEDROCK_REGION = os.getenv("AWS_REGION")
 
+# Deferrable operators hand remote waits to the triggerer instead of holding a worker slot;
+# enable only where a triggerer is running, otherwise deferred tasks never resume
+DEFERRABLE_OPERATORS = os.getenv("DEFERRABLE_OPERATORS", "false").lower() == "true"
+
 # Data Sources
+# Structured sources are loaded incrementally from staging: rows with
+# watermark_column above the persisted high-water mark are MERGEd on merge_keys.
 DATA_SOURCES = {
     "flights": {
         "table": "flights",
-        "columns": ["flight_number", "airline_code", "departure_airport", "arrival_airport"]
+        "staging_table": "staging.flights_raw",
+        "watermark_column": "ingested_at",
+        "merge_keys": ["flight_number", "scheduled_departure"],
+        "columns": [
+            "flight_number", "airline_code", "departure_airport", "arrival_airport",
+            "scheduled_departure", "scheduled_arrival", "status", "aircraft_type", "distance_km"
+        ]
     },
     "cargo_manifests": {
         "table": "cargo_manifests", 
-        "columns": ["flight_number", "waybill_number", "cargo_description", "hazardous_material"]
+        "staging_table": "staging.cargo_raw",
+        "watermark_column": "ingested_at",
+        "merge_keys": ["waybill_number"],
+        "columns": [
+            "flight_number", "waybill_number", "shipper_name", "consignee_name", "cargo_description",
+            "weight_kg", "volume_cubic_m", "special_handling", "hazardous_material", "hazmat_class"
+        ]
     },
     "aviation_docs": {
         "paths": [
             "/data/aviation/manuals",
             "/data/aviation/regulations", 
             "/data/aviation/procedures"
-        ]
+        ],
+        # Upper bound on mapped task instances; files are balanced across shards by size
+        "max_shards": int(os.getenv("DOCUMENT_MAX_SHARDS", "16"))
     }
 }
 
+# Shared Bedrock runtime client (plugins/bedrock_client.py)
+BEDROCK_CLIENT_CONFIG = {
+    "max_pool_connections": int(os.getenv("BEDROCK_MAX_POOL_CONNECTIONS", "50")),
+    "connect_timeout": float(os.getenv("BEDROCK_CONNECT_TIMEOUT", "2")),
+    "read_timeout": float(os.getenv("BEDROCK_READ_TIMEOUT", "60")),
+    "initial_concurrency": int(os.getenv("BEDROCK_INITIAL_CONCURRENCY", "4")),
+    "max_concurrency": int(os.getenv("BEDROCK_MAX_CONCURRENCY", "32")),
+    "max_attempts": int(os.getenv("BEDROCK_MAX_ATTEMPTS", "4")),
+    "deadline": float(os.getenv("BEDROCK_DEADLINE_SECONDS", "30")),
+    # Hedge embedding calls still running after this latency percentile; unset disables hedging
+    "hedge_percentile": float(os.getenv("BEDROCK_HEDGE_PERCENTILE")) if os.getenv("BEDROCK_HEDGE_PERCENTILE") else None
+}
+
+# PDF text is streamed page by page; large files are split into page ranges across worker processes
+PDF_EXTRACTION_CONFIG = {
+    "cache_dir": os.getenv("PDF_PAGE_CACHE_DIR", "/data/aviation/cache/pdf_pages"),
+    "workers": int(os.getenv("PDF_EXTRACTION_WORKERS", "4")),
+    "pages_per_task": 100
+}
+
 # Vector Store Configuration
 VECTOR_STORE_CONFIG = {
     "embedding_model": os.getenv("TEXT_EMBEDDING_MODEL"),
     "chunk_size": 1000,
     "chunk_overlap": 200,
-    "index_name": "aviation_vector_index"
-}
\ No newline at end of file
+    "index_name": "aviation_vector_index",
+    # metadata.<field> paths indexed for pre-filtering; keep in sync with the backend's search_filters.FILTER_FIELDS
+    "filter_fields": ["category", "aircraft_type", "version", "doc_type", "source"],
+    "embedding_cache_path": os.getenv("EMBEDDING_CACHE_PATH", "/data/aviation/cache/embeddings.sqlite"),
+    "embedding_cache_max_bytes": int(os.getenv("EMBEDDING_CACHE_MAX_MB", "2048")) * 1024 * 1024,
+    # Atlas index quantization, 'scalar' (int8) or 'binary'; unset keeps float32 only
+    "quantization": os.getenv("VECTOR_QUANTIZATION") or None,
+    # Held-out questions (one per line) for the index recall report, besides the query log's
+    "recall_questions_path": os.getenv("VECTOR_RECALL_QUESTIONS", "/data/aviation/eval/recall_questions.txt"),
+    "recall_k": 10,
+    # Bedrock batch inference for the deferrable embedding operator
+    "batch_s3_uri": os.getenv("BEDROCK_BATCH_S3_URI"),
+    "batch_role_arn": os.getenv("BEDROCK_BATCH_ROLE_ARN"),
+    "index_batch_size": 1000,
+    "index_max_workers": 4,
+    # Airflow dataset updated by each successful refresh; schedules the answer_warming DAG
+    "dataset_uri": f"mongodb://{MONGODB_DATABASE}/{MONGODB_COLLECTION}"
+}
+
+# Answer warming: precompute the most asked recent questions after each vector-store refresh.
+# query_log_dir is the backend's QUERY_LOG_DIR, mounted on the Airflow workers.
+ANSWER_WARMING_CONFIG = {
+    "query_log_dir": os.getenv("QUERY_LOG_DIR", "/data/aviation/query_log"),
+    "backend_url": os.getenv("BACKEND_URL", "http://backend-service.aviation-platform:8000"),
+    "lookback_days": int(os.getenv("ANSWER_WARMING_LOOKBACK_DAYS", "7")),
+    "top_n": int(os.getenv("ANSWER_WARMING_TOP_N", "200")),
+    "min_count": int(os.getenv("ANSWER_WARMING_MIN_COUNT", "3")),
+    # Requests per second to the backend, below its Bedrock limits so live traffic keeps priority
+    "rate_per_second": float(os.getenv("ANSWER_WARMING_RATE", "0.5")),
+    "request_timeout": 120,
+    "max_failures": 20
+}
+
+# Pipeline instrumentation: per-task JSON/OpenMetrics run reports (empty disables the files)
+PIPELINE_METRICS_CONFIG = {
+    "report_dir": os.getenv("PIPELINE_REPORT_DIR", "/data/aviation/run_reports")
+}
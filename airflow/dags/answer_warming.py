@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+import time
+from airflow import DAG
+from airflow.datasets import Dataset
+
+from airflow.operators.python import PythonOperator
+
+from answer_store import AnswerStore
+from answer_warming import frequent_questions, read_query_log, warm_answers
+
+from aviation_config import *
+
+def answer_store(mongodb_conn_id, database_name):
+    from airflow.providers.mongo.hooks.mongo import MongoHook
+
+    hook = MongoHook(mongodb_conn_id)
+    return AnswerStore.from_database(hook.get_conn()[database_name])
+
+def mine_frequent_questions(query_log_dir, lookback_days, top_n, min_count):
+    """Most frequent recent questions from the backend query log"""
+    entries = read_query_log(query_log_dir, since=time.time() - lookback_days * 86400)
+    questions = frequent_questions(entries, top_n=top_n, min_count=min_count)
+    print(f"{len(questions)} questions asked at least {min_count} times in {len(entries)} logged queries")
+    return questions
+
+def publish_build(mongodb_conn_id, database_name, build):
+    """Make build the current vector-store build; answers for older builds stop being served"""
+    answer_store(mongodb_conn_id, database_name).publish_build(build)
+    print(f"Published vector-store build {build}")
+
+def precompute_answers(mongodb_conn_id, database_name, build, questions, backend_url,
+                       rate_per_second, request_timeout, max_failures):
+    """Answer each question through the backend and store it for this build"""
+    store = answer_store(mongodb_conn_id, database_name)
+    return warm_answers(
+        store, build, questions or [], backend_url,
+        rate_per_second=rate_per_second, timeout=request_timeout, max_failures=max_failures
+    )
+
+def prune_answers(mongodb_conn_id, database_name, build):
+    """Drop answers computed against earlier builds"""
+    deleted = answer_store(mongodb_conn_id, database_name).prune(build)
+    print(f"Removed {deleted} answers from earlier builds")
+
+
+default_args = {
+    'owner': 'aviation_ai',
+    'depends_on_past': False,
+    'start_date': datetime(2024, 1, 1),
+    'email_on_failure': True,
+    'email_on_retry': False,
+    'retries': 2,
+    'retry_delay': timedelta(minutes=5)
+}
+
+# One build per dataset-triggered run
+BUILD_ID = '{{ ts_nodash }}'
+MONGO_KWARGS = {'mongodb_conn_id': MONGODB_CONN_ID, 'database_name': MONGODB_DATABASE}
+
+with DAG(
+    'answer_warming',
+    default_args=default_args,
+    description='Precompute answers to frequent questions after each vector store refresh',
+    # Runs when update_vector_store or validate_vector_store succeeds
+    schedule=[Dataset(VECTOR_STORE_CONFIG['dataset_uri'])],
+    catchup=False,
+    max_active_runs=1,
+    tags=['aviation', 'vector_store', 'mongodb', 'answer_cache']
+) as dag:
+
+    mine_questions = PythonOperator(
+        task_id='mine_frequent_questions',
+        python_callable=mine_frequent_questions,
+        op_kwargs={
+            'query_log_dir': ANSWER_WARMING_CONFIG['query_log_dir'],
+            'lookback_days': ANSWER_WARMING_CONFIG['lookback_days'],
+            'top_n': ANSWER_WARMING_CONFIG['top_n'],
+            'min_count': ANSWER_WARMING_CONFIG['min_count']
+        }
+    )
+
+    # Answers are keyed by build, so publishing first means none computed
+    # against the previous documents are served once the refresh has landed
+    publish_vector_store_build = PythonOperator(
+        task_id='publish_vector_store_build',
+        python_callable=publish_build,
+        op_kwargs={'build': BUILD_ID, **MONGO_KWARGS}
+    )
+
+    # Rate limited so warming does not compete with live traffic for Bedrock capacity
+    warm_answer_store = PythonOperator(
+        task_id='warm_answer_store',
+        python_callable=precompute_answers,
+        op_kwargs={
+            'build': BUILD_ID,
+            'questions': mine_questions.output,
+            'backend_url': ANSWER_WARMING_CONFIG['backend_url'],
+            'rate_per_second': ANSWER_WARMING_CONFIG['rate_per_second'],
+            'request_timeout': ANSWER_WARMING_CONFIG['request_timeout'],
+            'max_failures': ANSWER_WARMING_CONFIG['max_failures'],
+            **MONGO_KWARGS
+        },
+        execution_timeout=timedelta(hours=2)
+    )
+
+    prune_previous_builds = PythonOperator(
+        task_id='prune_previous_builds',
+        python_callable=prune_answers,
+        op_kwargs={'build': BUILD_ID, **MONGO_KWARGS}
+    )
+
+    # Define workflow
+    [mine_questions, publish_vector_store_build] >> warm_answer_store >> prune_previous_builds
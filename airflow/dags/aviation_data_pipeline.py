@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from airflow import DAG
+from airflow.datasets import Dataset
 from airflow.operators.python import PythonOperator
 from airflow.operators.trigger_dagrun import TriggerDagRunOperator
 from airflow.providers.snowflake.operators.snowflake import SnowflakeSqlApiOperator
@@ -12,9 +13,12 @@ from airflow.providers.snowflake.transfers.copy_into_snowflake import CopyFromEx
 from aviation_operators import (
     ProcessAviationDocumentsOperator,
     UpdateVectorStoreOperator,
-    DataQualityCheckOperator
+    DataQualityCheckOperator,
+    DeferrableDataQualityCheckOperator
 )
 
+from document_sharding import merge_shard_manifests, plan_document_shards
+
 from aviation_config import *
 
 default_args = {
@@ -28,13 +32,157 @@ default_args = {
     'snowflake_conn_id': SNOWFLAKE_CONN_ID
 }
 
+QualityCheckOperator = DeferrableDataQualityCheckOperator if DEFERRABLE_OPERATORS else DataQualityCheckOperator
+
+def incremental_merge_sql(source: dict) -> str:
+    """
+    MERGE the staging rows that arrived after the persisted high-water mark
+    into the target table, then advance the mark in the same transaction.
+
+    The batch is bounded by [low_wm, high_wm] so a retry re-reads exactly the
+    same rows, and the MERGE on natural keys keeps it idempotent.
+    """
+    staging = source['staging_table']
+    watermark = source['watermark_column']
+    keys = source['merge_keys']
+    columns = source['columns']
+
+    return f'''
+        SET low_wm = (
+            SELECT COALESCE(MAX(high_water_mark), '1970-01-01'::TIMESTAMP_NTZ)
+            FROM etl_watermarks WHERE source_table = '{staging}'
+        );
+        SET high_wm = (
+            SELECT COALESCE(MAX({watermark}), $low_wm)
+            FROM {staging} WHERE {watermark} > $low_wm
+        );
+        BEGIN;
+        MERGE INTO {source['table']} t
+        USING (
+            SELECT {', '.join(columns)}
+            FROM {staging}
+            WHERE {watermark} > $low_wm AND {watermark} <= $high_wm
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {', '.join(keys)} ORDER BY {watermark} DESC) = 1
+        ) s
+        ON {' AND '.join(f"t.{key} = s.{key}" for key in keys)}
+        WHEN MATCHED THEN UPDATE SET
+            {', '.join(f"{column} = s.{column}" for column in columns if column not in keys)},
+            loaded_at = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}, loaded_at)
+            VALUES ({', '.join(f"s.{column}" for column in columns)}, CURRENT_TIMESTAMP());
+        MERGE INTO etl_watermarks w
+        USING (SELECT '{staging}' AS source_table, $high_wm AS high_water_mark) s
+        ON w.source_table = s.source_table
+        WHEN MATCHED THEN UPDATE SET high_water_mark = s.high_water_mark, updated_at = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN INSERT (source_table, high_water_mark) VALUES (s.source_table, s.high_water_mark);
+        COMMIT;
+    '''
+
+def statement_count(sql: str) -> int:
+    """Statements in a multi-statement request; the SQL API rejects a request whose statement_count differs"""
+    return sum(1 for statement in sql.split(';') if statement.strip())
+
+FLIGHTS_MERGE_SQL = incremental_merge_sql(DATA_SOURCES['flights'])
+CARGO_MERGE_SQL = incremental_merge_sql(DATA_SOURCES['cargo_manifests'])
+
+# Per-flight aggregates behind daily_operations_report; {flight_filter} narrows the flights recomputed
+REPORT_AGGREGATE_SQL = '''
+            SELECT
+                f.flight_number,
+                f.scheduled_departure,
+                DATE(f.scheduled_departure) AS report_date,
+                f.airline_code,
+                f.departure_airport,
+                f.arrival_airport,
+                f.status,
+                COUNT(cm.waybill_number) as total_shipments,
+                SUM(cm.weight_kg) as total_cargo_weight,
+                SUM(CASE WHEN cm.hazardous_material THEN 1 ELSE 0 END) as hazardous_shipments,
+                CURRENT_TIMESTAMP() AS refreshed_at
+            FROM flights f
+            LEFT JOIN cargo_manifests cm ON f.flight_number = cm.flight_number
+            WHERE f.scheduled_departure >= DATEADD(day, -{{{{ params.report_retention_days }}}}, CURRENT_DATE())
+            {flight_filter}
+            GROUP BY f.flight_number, f.scheduled_departure, f.airline_code, f.departure_airport,
+                     f.arrival_airport, f.status'''
+
+# Flights whose own row or any cargo row was loaded since the last report refresh
+CHANGED_FLIGHTS_FILTER = '''AND f.flight_number IN (
+                SELECT flight_number FROM flights WHERE loaded_at > $low_wm AND loaded_at <= $high_wm
+                UNION
+                SELECT flight_number FROM cargo_manifests WHERE loaded_at > $low_wm AND loaded_at <= $high_wm
+            )'''
+
+REPORT_COLUMNS = [
+    'flight_number', 'scheduled_departure', 'report_date', 'airline_code', 'departure_airport',
+    'arrival_airport', 'status', 'total_shipments', 'total_cargo_weight', 'hazardous_shipments', 'refreshed_at'
+]
+
+# Full rebuilds build a new table and swap it in atomically. Incremental runs
+# recompute only flights whose flight or cargo rows were loaded since the last
+# refresh and MERGE them in, so readers never see the table disappear.
+DAILY_REPORT_SQL = f'''
+        SET low_wm = (
+            SELECT COALESCE(MAX(high_water_mark), '1970-01-01'::TIMESTAMP_NTZ)
+            FROM etl_watermarks WHERE source_table = 'daily_operations_report'
+        );
+        SET high_wm = GREATEST(
+            COALESCE((SELECT MAX(loaded_at) FROM flights WHERE loaded_at > $low_wm), $low_wm),
+            COALESCE((SELECT MAX(loaded_at) FROM cargo_manifests WHERE loaded_at > $low_wm), $low_wm)
+        );
+        {{% if params.report_full_rebuild %}}
+        CREATE OR REPLACE TABLE daily_operations_report_rebuild AS{REPORT_AGGREGATE_SQL.format(flight_filter='')};
+        CREATE TABLE IF NOT EXISTS daily_operations_report LIKE daily_operations_report_rebuild;
+        ALTER TABLE daily_operations_report SWAP WITH daily_operations_report_rebuild;
+        DROP TABLE daily_operations_report_rebuild;
+        {{% else %}}
+        CREATE TABLE IF NOT EXISTS daily_operations_report (
+            flight_number VARCHAR(10),
+            scheduled_departure TIMESTAMP_NTZ,
+            report_date DATE,
+            airline_code VARCHAR(3),
+            departure_airport VARCHAR(3),
+            arrival_airport VARCHAR(3),
+            status VARCHAR(20),
+            total_shipments NUMBER,
+            total_cargo_weight NUMBER(12,2),
+            hazardous_shipments NUMBER,
+            refreshed_at TIMESTAMP_NTZ
+        );
+        BEGIN;
+        MERGE INTO daily_operations_report r
+        USING ({REPORT_AGGREGATE_SQL.format(flight_filter=CHANGED_FLIGHTS_FILTER)}
+        ) s
+        ON r.flight_number = s.flight_number AND r.scheduled_departure = s.scheduled_departure
+        WHEN MATCHED THEN UPDATE SET
+            {', '.join(f"{column} = s.{column}" for column in REPORT_COLUMNS[2:])}
+        WHEN NOT MATCHED THEN INSERT ({', '.join(REPORT_COLUMNS)})
+            VALUES ({', '.join(f"s.{column}" for column in REPORT_COLUMNS)});
+        DELETE FROM daily_operations_report
+        WHERE scheduled_departure < DATEADD(day, -{{{{ params.report_retention_days }}}}, CURRENT_DATE());
+        {{% endif %}}
+        MERGE INTO etl_watermarks w
+        USING (SELECT 'daily_operations_report' AS source_table, $high_wm AS high_water_mark) s
+        ON w.source_table = s.source_table
+        WHEN MATCHED THEN UPDATE SET high_water_mark = s.high_water_mark, updated_at = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN INSERT (source_table, high_water_mark) VALUES (s.source_table, s.high_water_mark);
+        {{% if not params.report_full_rebuild %}}
+        COMMIT;
+        {{% endif %}}
+    '''
+
 with DAG(
     'aviation_data_pipeline',
     default_args=default_args,
     description='End-to-end aviation data processing pipeline',
     # schedule_interval='0 6 * * *',  # Daily at 6 AM
     catchup=False,
-    tags=['aviation', 'etl', 'snowflake', 'vector_store']
+    tags=['aviation', 'etl', 'snowflake', 'vector_store'],
+    params={
+        # Trigger with {"report_full_rebuild": true} to rebuild the report from scratch
+        'report_full_rebuild': False,
+        'report_retention_days': 7
+    }
 ) as dag:
 
     # Start Pipeline
@@ -43,49 +191,20 @@ with DAG(
         python_callable=lambda: print("Starting Aviation Data Pipeline")
     )
 
-    # Extract flight data from source systems
+    # Incrementally merge new and updated flights from staging
     extract_flight_data = SnowflakeSqlApiOperator(
         task_id='extract_flight_data',
-        sql='''
-        INSERT INTO {{ params.target_table }}
-        SELECT 
-            flight_number,
-            airline_code,
-            departure_airport,
-            arrival_airport,
-            scheduled_departure,
-            scheduled_arrival,
-            status,
-            aircraft_type,
-            distance_km,
-            CURRENT_TIMESTAMP() as loaded_at
-        FROM staging.flights_raw
-        WHERE DATE(scheduled_departure) = CURRENT_DATE()
-        ''',
-        params={'target_table': 'flights'}
+        sql=FLIGHTS_MERGE_SQL,
+        statement_count=statement_count(FLIGHTS_MERGE_SQL),
+        deferrable=DEFERRABLE_OPERATORS
     )
 
-    # Extract cargo manifests
+    # Incrementally merge new and updated cargo manifests from staging
     extract_cargo_data = SnowflakeSqlApiOperator(
         task_id='extract_cargo_data',
-        sql='''
-        INSERT INTO {{ params.target_table }}
-        SELECT 
-            flight_number,
-            waybill_number,
-            shipper_name,
-            consignee_name,
-            cargo_description,
-            weight_kg,
-            volume_cubic_m,
-            special_handling,
-            hazardous_material,
-            hazmat_class,
-            CURRENT_TIMESTAMP() as loaded_at
-        FROM staging.cargo_raw
-        WHERE DATE(created_at) = CURRENT_DATE()
-        ''',
-        params={'target_table': 'cargo_manifests'}
+        sql=CARGO_MERGE_SQL,
+        statement_count=statement_count(CARGO_MERGE_SQL),
+        deferrable=DEFERRABLE_OPERATORS
     )
 
     # Load data from S3 (if you have external data sources)
@@ -98,12 +217,28 @@ with DAG(
         file_format='(TYPE = CSV, SKIP_HEADER = 1)'
     )
 
-    # Process aviation documents for vector store
-    process_aviation_documents = ProcessAviationDocumentsOperator(
+    # Partition the document corpus into byte-balanced shards
+    plan_document_processing = PythonOperator(
+        task_id='plan_document_processing',
+        python_callable=plan_document_shards,
+        op_kwargs={
+            'source_paths': DATA_SOURCES['aviation_docs']['paths'],
+            'max_shards': DATA_SOURCES['aviation_docs']['max_shards']
+        }
+    )
+
+    # Process aviation documents for vector store, one mapped task instance per shard
+    process_aviation_documents = ProcessAviationDocumentsOperator.partial(
         task_id='process_aviation_documents',
-        document_paths=DATA_SOURCES['aviation_docs']['paths'],
         mongodb_conn_id=MONGODB_CONN_ID,
         aws_conn_id=AWS_CONN_ID
+    ).expand(document_paths=plan_document_processing.output)
+
+    # Combine the per-shard document counts
+    merge_document_manifests = PythonOperator(
+        task_id='merge_document_manifests',
+        python_callable=merge_shard_manifests,
+        op_kwargs={'manifests': process_aviation_documents.output}
     )
 
     # Update vector store with new documents
@@ -112,47 +247,39 @@ with DAG(
         message="update_vector_store",
         mongodb_conn_id=MONGODB_CONN_ID,
         aws_conn_id=AWS_CONN_ID,
-        collection_name=MONGODB_COLLECTION
+        collection_name=MONGODB_COLLECTION,
+        model_id=VECTOR_STORE_CONFIG['embedding_model'],
+        cache_path=VECTOR_STORE_CONFIG['embedding_cache_path'],
+        # Schedules the answer_warming DAG
+        outlets=[Dataset(VECTOR_STORE_CONFIG['dataset_uri'])]
     )
 
     # Data quality checks
-    data_quality_flights = DataQualityCheckOperator(
+    data_quality_flights = QualityCheckOperator(
         task_id='data_quality_flights',
         table_name='flights',
+        mode='single_scan',
         checks=[
             {'check_sql': 'SELECT COUNT(*) FROM flights WHERE flight_number IS NULL', 'expected_result': 0},
             {'check_sql': 'SELECT COUNT(*) FROM flights WHERE scheduled_departure > scheduled_arrival', 'expected_result': 0}
         ]
     )
 
-    data_quality_cargo = DataQualityCheckOperator(
+    data_quality_cargo = QualityCheckOperator(
         task_id='data_quality_cargo',
         table_name='cargo_manifests',
+        mode='single_scan',
         checks=[
             {'check_sql': 'SELECT COUNT(*) FROM cargo_manifests WHERE weight_kg <= 0', 'expected_result': 0},
             {'check_sql': 'SELECT COUNT(*) FROM cargo_manifests WHERE flight_number IS NULL', 'expected_result': 0}
         ]
     )
 
-    # Generate daily reports
+    # Refresh the daily operations report (incremental unless a full rebuild is requested)
     generate_daily_report = SnowflakeSqlApiOperator(
         task_id='generate_daily_report',
-        sql='''
-        CREATE OR REPLACE TABLE daily_operations_report AS
-        SELECT 
-            f.flight_number,
-            f.airline_code,
-            f.departure_airport,
-            f.arrival_airport,
-            f.status,
-            COUNT(cm.waybill_number) as total_shipments,
-            SUM(cm.weight_kg) as total_cargo_weight,
-            SUM(CASE WHEN cm.hazardous_material THEN 1 ELSE 0 END) as hazardous_shipments
-        FROM flights f
-        LEFT JOIN cargo_manifests cm ON f.flight_number = cm.flight_number
-        WHERE DATE(f.scheduled_departure) = CURRENT_DATE()
-        GROUP BY f.flight_number, f.airline_code, f.departure_airport, f.arrival_airport, f.status
-        '''
+        sql=DAILY_REPORT_SQL,
+        deferrable=DEFERRABLE_OPERATORS
     )
 
     # End Pipeline
@@ -166,9 +293,9 @@ with DAG(
     
     extract_flight_data >> data_quality_flights
     extract_cargo_data >> data_quality_cargo
-    load_external_data >> process_aviation_documents
+    load_external_data >> plan_document_processing >> process_aviation_documents >> merge_document_manifests
     
     [data_quality_flights, data_quality_cargo] >> generate_daily_report
-    process_aviation_documents >> update_vector_store
+    merge_document_manifests >> update_vector_store
     
     [generate_daily_report, update_vector_store] >> end_pipeline
\ No newline at end of file
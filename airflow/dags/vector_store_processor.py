@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from airflow import DAG
+from airflow.datasets import Dataset
 
 from airflow.operators.python import PythonOperator
 from airflow.operators.empty import EmptyOperator
@@ -11,11 +12,93 @@ from airflow.operators.empty import EmptyOperator
 from aviation_operators import (
     DocumentChunkingOperator,
     VectorEmbeddingOperator,
-    MongoDBIndexOperator
+    DeferrableVectorEmbeddingOperator,
+    MongoDBIndexOperator,
+    VectorIndexRecallOperator
 )
 
+from document_sharding import merge_shard_manifests, prepare_chunk_shards
+from embedding_quantization import QUANTIZATION_MODES
+
 from aviation_config import *
 
+def create_mongodb_vector_index(mongodb_conn_id, database_name, collection_name, index_name, quantization=None):
+    """Create vector search index in MongoDB"""
+    from airflow.providers.mongo.hooks.mongo import MongoHook
+    import pymongo
+    
+    hook = MongoHook(mongodb_conn_id)
+    client = hook.get_conn()
+    db = client[database_name]
+    collection = db[collection_name]
+    
+    vector_field = {
+        'type': 'vector',
+        'path': 'embedding',
+        'numDimensions': 1536,  # Titan embedding dimensions
+        'similarity': 'cosine'
+    }
+    # Atlas keeps full-fidelity vectors for rescoring and searches the quantized copy
+    if quantization:
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {quantization}")
+        vector_field['quantization'] = quantization
+
+    # Create vector search index, with the metadata fields queries pre-filter on
+    index_definition = {
+        'fields': [vector_field] + [
+            {
+                'type': 'filter',
+                'path': f'metadata.{field}'
+            }
+            for field in VECTOR_STORE_CONFIG['filter_fields']
+        ]
+    }
+    
+    # An existing index is updated in place so new filter fields are picked up
+    if list(collection.list_search_indexes(index_name)):
+        db.command({
+            'updateSearchIndex': collection_name,
+            'name': index_name,
+            'definition': index_definition
+        })
+        print(f"Vector index '{index_name}' updated successfully")
+        return
+
+    # Create search index
+    db.command({
+        'createSearchIndexes': collection_name,
+        'indexes': [{
+            'name': index_name,
+            'definition': index_definition
+        }]
+    })
+    
+    print(f"Vector index '{index_name}' created successfully")
+
+def validate_vector_embeddings(mongodb_conn_id, collection_name):
+    """Validate that embeddings were created correctly"""
+    from airflow.providers.mongo.hooks.mongo import MongoHook
+    
+    hook = MongoHook(mongodb_conn_id)
+    client = hook.get_conn()
+    db = client[MONGODB_DATABASE]
+    collection = db[collection_name]
+    
+    # Count documents with embeddings
+    total_docs = collection.count_documents({})
+    docs_with_embeddings = collection.count_documents({'embedding': {'$exists': True}})
+    
+    print(f"Total documents: {total_docs}")
+    print(f"Documents with embeddings: {docs_with_embeddings}")
+    
+    if docs_with_embeddings == 0:
+        raise ValueError("No documents with embeddings found!")
+    
+    if docs_with_embeddings < total_docs * 0.9:  # At least 90% should have embeddings
+        raise ValueError(f"Only {docs_with_embeddings}/{total_docs} documents have embeddings")
+
+
 default_args = {
     'owner': 'aviation_ai',
     'depends_on_past': False,
@@ -37,24 +120,51 @@ with DAG(
 
     start_processing = EmptyOperator(task_id='start_processing')
 
-    # Chunk documents for processing
-    chunk_documents = DocumentChunkingOperator(
+    # Partition the document corpus into byte-balanced shards
+    plan_chunk_shards = PythonOperator(
+        task_id='plan_chunk_shards',
+        python_callable=prepare_chunk_shards,
+        op_kwargs={
+            'source_paths': DATA_SOURCES['aviation_docs']['paths'],
+            'output_path': '/tmp/aviation_chunks/',
+            'max_shards': DATA_SOURCES['aviation_docs']['max_shards']
+        }
+    )
+
+    # Chunk documents for processing, one mapped task instance per shard
+    chunk_documents = DocumentChunkingOperator.partial(
         task_id='chunk_documents',
         message='DocumentChunkingOperator test',
-        source_paths=DATA_SOURCES['aviation_docs']['paths'],
         chunk_size=VECTOR_STORE_CONFIG['chunk_size'],
         chunk_overlap=VECTOR_STORE_CONFIG['chunk_overlap'],
         output_path='/tmp/aviation_chunks/'
+    ).expand(source_paths=plan_chunk_shards.output)
+
+    # Combine the per-shard chunk counts
+    merge_chunk_manifests = PythonOperator(
+        task_id='merge_chunk_manifests',
+        python_callable=merge_shard_manifests,
+        op_kwargs={'manifests': chunk_documents.output}
     )
 
     # Generate embeddings using AWS Bedrock
-    generate_embeddings = VectorEmbeddingOperator(
+    embedding_kwargs = dict(
         task_id='generate_embeddings',
         input_path='/tmp/aviation_chunks/',
         aws_conn_id=AWS_CONN_ID,
         model_id=VECTOR_STORE_CONFIG['embedding_model'],
-        output_path='/tmp/aviation_embeddings/'
+        output_path='/tmp/aviation_embeddings/',
+        cache_path=VECTOR_STORE_CONFIG['embedding_cache_path'],
+        cache_max_bytes=VECTOR_STORE_CONFIG['embedding_cache_max_bytes']
     )
+    if DEFERRABLE_OPERATORS and VECTOR_STORE_CONFIG['batch_s3_uri']:
+        generate_embeddings = DeferrableVectorEmbeddingOperator(
+            s3_batch_uri=VECTOR_STORE_CONFIG['batch_s3_uri'],
+            role_arn=VECTOR_STORE_CONFIG['batch_role_arn'],
+            **embedding_kwargs
+        )
+    else:
+        generate_embeddings = VectorEmbeddingOperator(**embedding_kwargs)
 
     # Store embeddings in MongoDB
     store_embeddings = MongoDBIndexOperator(
@@ -64,7 +174,9 @@ with DAG(
         mongodb_conn_id=MONGODB_CONN_ID,
         database_name=MONGODB_DATABASE,
         collection_name=MONGODB_COLLECTION,
-        index_name=VECTOR_STORE_CONFIG['index_name']
+        index_name=VECTOR_STORE_CONFIG['index_name'],
+        batch_size=VECTOR_STORE_CONFIG['index_batch_size'],
+        max_workers=VECTOR_STORE_CONFIG['index_max_workers']
     )
 
     # Create vector search index
@@ -75,7 +187,8 @@ with DAG(
             'mongodb_conn_id': MONGODB_CONN_ID,
             'database_name': MONGODB_DATABASE,
             'collection_name': MONGODB_COLLECTION,
-            'index_name': VECTOR_STORE_CONFIG['index_name']
+            'index_name': VECTOR_STORE_CONFIG['index_name'],
+            'quantization': VECTOR_STORE_CONFIG['quantization']
         }
     )
 
@@ -86,70 +199,28 @@ with DAG(
         op_kwargs={
             'mongodb_conn_id': MONGODB_CONN_ID,
             'collection_name': MONGODB_COLLECTION
-        }
+        },
+        # A validated refresh schedules the answer_warming DAG
+        outlets=[Dataset(VECTOR_STORE_CONFIG['dataset_uri'])]
     )
 
-    end_processing = DummyOperator(task_id='end_processing')
-
-    # Define workflow
-    start_processing >> chunk_documents >> generate_embeddings >> store_embeddings
-    store_embeddings >> create_vector_index >> validate_vector_store >> end_processing
+    # Recall of the deployed (quantized) index against exact search on held-out questions
+    evaluate_index_recall = VectorIndexRecallOperator(
+        task_id='evaluate_index_recall',
+        mongodb_conn_id=MONGODB_CONN_ID,
+        aws_conn_id=AWS_CONN_ID,
+        collection_name=MONGODB_COLLECTION,
+        index_name=VECTOR_STORE_CONFIG['index_name'],
+        model_id=VECTOR_STORE_CONFIG['embedding_model'],
+        quantization=VECTOR_STORE_CONFIG['quantization'],
+        questions_path=VECTOR_STORE_CONFIG['recall_questions_path'],
+        query_log_dir=ANSWER_WARMING_CONFIG['query_log_dir'],
+        k=VECTOR_STORE_CONFIG['recall_k']
+    )
 
-def create_mongodb_vector_index(mongodb_conn_id, database_name, collection_name, index_name):
-    """Create vector search index in MongoDB"""
-    from airflow.providers.mongo.hooks.mongo import MongoHook
-    import pymongo
-    
-    hook = MongoHook(mongodb_conn_id)
-    client = hook.get_conn()
-    db = client[database_name]
-    collection = db[collection_name]
-    
-    # Create vector search index
-    index_definition = {
-        'fields': [
-            {
-                'type': 'vector',
-                'path': 'embedding',
-                'numDimensions': 1536,  # Titan embedding dimensions
-                'similarity': 'cosine'
-            },
-            {
-                'type': 'filter',
-                'path': 'metadata.category'
-            }
-        ]
-    }
-    
-    # Create search index
-    db.command({
-        'createSearchIndexes': collection_name,
-        'indexes': [{
-            'name': index_name,
-            'definition': index_definition
-        }]
-    })
-    
-    print(f"Vector index '{index_name}' created successfully")
+    end_processing = EmptyOperator(task_id='end_processing')
 
-def validate_vector_embeddings(mongodb_conn_id, collection_name):
-    """Validate that embeddings were created correctly"""
-    from airflow.providers.mongo.hooks.mongo import MongoHook
-    
-    hook = MongoHook(mongodb_conn_id)
-    client = hook.get_conn()
-    db = client[MONGODB_DATABASE]
-    collection = db[collection_name]
-    
-    # Count documents with embeddings
-    total_docs = collection.count_documents({})
-    docs_with_embeddings = collection.count_documents({'embedding': {'$exists': True}})
-    
-    print(f"Total documents: {total_docs}")
-    print(f"Documents with embeddings: {docs_with_embeddings}")
-    
-    if docs_with_embeddings == 0:
-        raise ValueError("No documents with embeddings found!")
-    
-    if docs_with_embeddings < total_docs * 0.9:  # At least 90% should have embeddings
-        raise ValueError(f"Only {docs_with_embeddings}/{total_docs} documents have embeddings")
\ No newline at end of file
+    # Define workflow
+    start_processing >> plan_chunk_shards >> chunk_documents >> merge_chunk_manifests
+    merge_chunk_manifests >> generate_embeddings >> store_embeddings
+    store_embeddings >> create_vector_index >> validate_vector_store >> evaluate_index_recall >> end_processing
@@ -0,0 +1,116 @@
+import hashlib
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Shared by the backend and the Airflow answer_warming DAG: backend/app/answer_store.py and
+# airflow/plugins/answer_store.py are identical copies, since each is deployed without the other
+ANSWERS_COLLECTION = "answer_cache"
+STATE_COLLECTION = "pipeline_state"
+BUILD_STATE_ID = "vector_store_build"
+# Response fields kept for a precomputed answer
+RESPONSE_FIELDS = ("answer", "source_documents", "question", "retrieval", "model_tier")
+
+
+def normalize_question(question: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the answer"""
+    return re.sub(r"\s+", " ", question.lower()).strip().rstrip("?!. ")
+
+
+def answer_key(question: str, context_type: str, build: str) -> str:
+    digest = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()[:32]
+    return f"{build}:{context_type or 'general'}:{digest}"
+
+
+class AnswerStore:
+    """
+    Precomputed /query answers in MongoDB, versioned by vector-store build.
+
+    The current build id lives in the pipeline_state collection; answers are
+    keyed by build, context_type and normalized question, so publishing a new
+    build makes every older answer a miss. The build id is cached for
+    refresh_seconds to keep lookups to one _id read.
+    """
+
+    def __init__(self, answers, state, refresh_seconds: float = 60.0):
+        self.answers = answers
+        self.state = state
+        self.refresh_seconds = refresh_seconds
+        self.hits = 0
+        self.misses = 0
+        self._build: Optional[str] = None
+        self._build_checked = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_database(cls, db, refresh_seconds: float = 60.0) -> "AnswerStore":
+        return cls(db[ANSWERS_COLLECTION], db[STATE_COLLECTION], refresh_seconds)
+
+    def build(self) -> Optional[str]:
+        """The published vector-store build id, None before the first warming run"""
+        now = time.monotonic()
+        if now - self._build_checked >= self.refresh_seconds:
+            state = self.state.find_one({"_id": BUILD_STATE_ID})
+            with self._lock:
+                self._build = state["build"] if state else None
+                self._build_checked = now
+        return self._build
+
+    def get(self, question: str, context_type: str) -> Optional[Dict]:
+        """The precomputed response for the current build, or None; store errors count as misses"""
+        try:
+            build = self.build()
+            doc = self.answers.find_one(
+                {"_id": answer_key(question, context_type, build)}, {"response": 1}
+            ) if build else None
+        except Exception as e:
+            print(f"Answer store lookup failed: {e}")
+            doc = None
+        with self._lock:
+            if doc:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not doc:
+            return None
+        return dict(doc["response"], cache="hit", build=build)
+
+    def put(self, question: str, context_type: str, build: str, response: Dict, count: int = 0):
+        self.answers.replace_one(
+            {"_id": answer_key(question, context_type, build)},
+            {
+                "build": build,
+                "question": normalize_question(question),
+                "context_type": context_type,
+                "count": count,
+                "response": {field: response.get(field) for field in RESPONSE_FIELDS},
+                "created_at": datetime.now(timezone.utc)
+            },
+            upsert=True
+        )
+
+    def publish_build(self, build: str):
+        self.state.replace_one(
+            {"_id": BUILD_STATE_ID},
+            {"build": build, "published_at": datetime.now(timezone.utc)},
+            upsert=True
+        )
+        with self._lock:
+            self._build = build
+            self._build_checked = time.monotonic()
+
+    def prune(self, build: str) -> int:
+        """Delete answers computed against any other build"""
+        return self.answers.delete_many({"build": {"$ne": build}}).deleted_count
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "build": self._build,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None
+            }
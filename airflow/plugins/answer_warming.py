@@ -0,0 +1,122 @@
+import glob
+import json
+import logging
+import os
+import re
+import time
+import urllib.request
+from collections import Counter
+from typing import Dict, List, Optional
+
+from answer_store import normalize_question
+
+log = logging.getLogger(__name__)
+
+# Placeholders QueryLog substitutes for PII; such questions are never precomputed
+REDACTED = re.compile(r"<(?:email|card|phone|document_id|ip)>")
+
+
+def read_query_log(log_dir: str, since: float) -> List[Dict]:
+    """Entries of the backend QueryLog (queries.jsonl and its rotated files) logged at or after since"""
+    entries = []
+    for file_path in glob.glob(os.path.join(log_dir, "queries.jsonl*")):
+        if os.path.getmtime(file_path) < since:
+            continue
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # partially written line
+                if entry.get("ts", 0) >= since:
+                    entries.append(entry)
+    return entries
+
+
+def frequent_questions(entries: List[Dict], top_n: int = 200, min_count: int = 2) -> List[Dict]:
+    """
+    The top_n most asked (normalized question, context_type) pairs with at
+    least min_count asks. Only successful, unfiltered RAG queries count:
+    structured lookups serve live data and filtered requests bypass the
+    answer store. Each pair keeps its most common wording.
+    """
+    counts = Counter()
+    wordings: Dict[tuple, Counter] = {}
+    for entry in entries:
+        question = (entry.get("question") or "").strip()
+        if (entry.get("status", "ok") != "ok" or entry.get("filters") or not question
+                or REDACTED.search(question) or (entry.get("route") or "").startswith("structured")):
+            continue
+        key = (normalize_question(question), entry.get("context_type") or "general")
+        counts[key] += 1
+        wordings.setdefault(key, Counter())[question] += 1
+
+    return [
+        {"question": wordings[key].most_common(1)[0][0], "context_type": key[1], "count": count}
+        for key, count in counts.most_common(top_n)
+        if count >= min_count
+    ]
+
+
+class RatePacer:
+    """Spaces calls at most rate_per_second apart"""
+
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next = 0.0
+
+    def wait(self):
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self.interval
+
+
+def fetch_answer(backend_url: str, question: str, context_type: str, timeout: float = 120.0) -> Dict:
+    """A fresh answer from the backend's /query, bypassing the answer store"""
+    payload = {"question": question, "context_type": context_type, "use_answer_cache": False}
+    request = urllib.request.Request(
+        backend_url.rstrip("/") + "/query",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def cacheable(response: Dict) -> bool:
+    """RAG answers only; errors and live structured lookups are not stored"""
+    answer = response.get("answer") or ""
+    return (
+        bool(answer.strip())
+        and not answer.startswith("Error:")
+        and not (response.get("retrieval") or "").startswith("structured")
+    )
+
+
+def warm_answers(store, build: str, questions: List[Dict], backend_url: str,
+                 rate_per_second: float = 1.0, timeout: float = 120.0,
+                 max_failures: Optional[int] = None) -> Dict[str, int]:
+    """Precompute each question's answer through the backend and store it under build"""
+    pacer = RatePacer(rate_per_second)
+    counts = {"stored": 0, "skipped": 0, "failed": 0}
+    for item in questions:
+        pacer.wait()
+        try:
+            response = fetch_answer(backend_url, item["question"], item["context_type"], timeout)
+        except Exception as e:
+            counts["failed"] += 1
+            log.warning(f"Warming '{item['question']}' failed: {e}")
+            if max_failures is not None and counts["failed"] > max_failures:
+                raise RuntimeError(f"Answer warming aborted after {counts['failed']} failures") from e
+            continue
+        if not cacheable(response):
+            counts["skipped"] += 1
+            continue
+        store.put(item["question"], item["context_type"], build, response, item.get("count", 0))
+        counts["stored"] += 1
+
+    log.info(f"Answer warming for build {build}: {counts}")
+    return counts
@@ -1,94 +1,67 @@
+from airflow.exceptions import AirflowException
 from airflow.models.baseoperator import BaseOperator
 # from airflow.utils.decorators import apply_defaults
 from airflow.providers.mongo.hooks.mongo import MongoHook
 from airflow.providers.amazon.aws.hooks.base_aws import AwsBaseHook
 import boto3
+import hashlib
 import json
 import os
-from typing import List, Dict
-import PyPDF2
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterator, List, Dict, Optional, Tuple
 from docx import Document
 # import chromadb
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader, TextLoader, Docx2txtLoader
 
-class ProcessAviationDocumentsOperator(BaseOperator):
-    """
-    Operator to process aviation documents and prepare for vector storage
-    """
-    
-    # @apply_defaults
-    def __init__(
-        self,
-        document_paths: List[str],
-        mongodb_conn_id: str,
-        aws_conn_id: str,
-        *args, **kwargs
-    ):
-        super().__init__(*args, **kwargs)
-        self.document_paths = document_paths
-        self.mongodb_conn_id = mongodb_conn_id
-        self.aws_conn_id = aws_conn_id
+from aviation_triggers import BedrockBatchInferenceTrigger, SnowflakeQueryTrigger
+from bedrock_client import AdaptiveLimiter, BedrockClient, client_config
+from document_sharding import list_document_files
+from embedding_cache import EmbeddingCache
+from embedding_quantization import index_recall_report
+from embedding_shards import (
+    EmbeddingShardWriter, clear_shards, content_hash, iter_shards, load_manifest, make_chunk_id
+)
+from page_extraction import PdfPageExtractor, chunk_pages
+from pipeline_metrics import StageMetrics
+from pymongo import UpdateOne
 
-    def execute(self, context):
-        self.log.info("Starting aviation document processing")
-        
-        # Process documents from all paths
-        processed_docs = []
-        for path in self.document_paths:
-            if os.path.exists(path):
-                docs = self._process_documents_in_path(path)
-                processed_docs.extend(docs)
-        
-        # Store in MongoDB
-        self._store_documents(processed_docs)
-        
-        self.log.info(f"Processed {len(processed_docs)} documents")
-        return len(processed_docs)
+from aviation_config import (
+    BEDROCK_CLIENT_CONFIG, MONGODB_DATABASE, PDF_EXTRACTION_CONFIG, PIPELINE_METRICS_CONFIG, VECTOR_STORE_CONFIG
+)
 
-    def _process_documents_in_path(self, path: str) -> List[Dict]:
-        """Process all documents in a given path"""
-        documents = []
-        
-        for filename in os.listdir(path):
-            file_path = os.path.join(path, filename)
-            if filename.endswith('.pdf'):
-                content = self._read_pdf(file_path)
-            elif filename.endswith('.docx'):
-                content = self._read_docx(file_path)
-            elif filename.endswith('.txt'):
-                content = self._read_txt(file_path)
-            else:
-                continue
-            
-            if content:
-                documents.append({
-                    'filename': filename,
-                    'content': content,
-                    'file_path': file_path,
-                    'processed_at': context['ts'],
-                    'metadata': {
-                        'source': 'aviation_docs',
-                        'category': self._categorize_document(filename),
-                        'file_type': filename.split('.')[-1]
-                    }
-                })
-        
-        return documents
+class DocumentReaderMixin:
+    """Text extraction and categorization shared by the document operators"""
+
+    def _read_document(self, file_path: str) -> str:
+        """Extract text from a supported document, empty string if it can't be read"""
+        if file_path.endswith('.pdf'):
+            return self._read_pdf(file_path)
+        elif file_path.endswith('.docx'):
+            return self._read_docx(file_path)
+        elif file_path.endswith('.txt'):
+            return self._read_txt(file_path)
+        return ""
 
     def _read_pdf(self, file_path: str) -> str:
         """Extract text from PDF files"""
         try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text()
-                return text
+            return '\n'.join(text for _, text in self._pdf_extractor().iter_pages(file_path))
         except Exception as e:
             self.log.error(f"Error reading PDF {file_path}: {e}")
             return ""
 
+    def _iter_document_pages(self, file_path: str) -> Iterator[Tuple[Optional[int], str]]:
+        """Stream (page number, text) pages; documents without pages are one page numbered None"""
+        if file_path.endswith('.pdf'):
+            return self._pdf_extractor().iter_pages(file_path)
+        return iter([(None, self._read_document(file_path))])
+
+    def _pdf_extractor(self) -> PdfPageExtractor:
+        return PdfPageExtractor(**PDF_EXTRACTION_CONFIG)
+
     def _read_docx(self, file_path: str) -> str:
         """Extract text from DOCX files"""
         try:
@@ -121,6 +94,71 @@ class ProcessAviationDocumentsOperator(BaseOperator):
         else:
             return 'general'
 
+    def _document_metadata(self, filename: str) -> Dict:
+        return {
+            'source': 'aviation_docs',
+            'category': self._categorize_document(filename),
+            'file_type': filename.split('.')[-1]
+        }
+
+class ProcessAviationDocumentsOperator(DocumentReaderMixin, BaseOperator):
+    """
+    Operator to process aviation documents and prepare for vector storage
+
+    document_paths may mix directories and individual files, so a mapped task
+    instance can process one shard from plan_document_shards.
+    """
+    
+    # @apply_defaults
+    def __init__(
+        self,
+        document_paths: List[str],
+        mongodb_conn_id: str,
+        aws_conn_id: str,
+        *args, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.document_paths = document_paths
+        self.mongodb_conn_id = mongodb_conn_id
+        self.aws_conn_id = aws_conn_id
+
+    def execute(self, context):
+        self.log.info("Starting aviation document processing")
+        metrics = StageMetrics.from_context(context)
+        
+        # Process documents from all paths
+        files = list_document_files(self.document_paths)
+        processed_docs = []
+        failed_files = []
+        for file_path, size in files:
+            with metrics.measure(bytes=size):
+                content = self._read_document(file_path)
+            if not content:
+                metrics.count('errors')
+                failed_files.append(file_path)
+                continue
+
+            filename = os.path.basename(file_path)
+            processed_docs.append({
+                'filename': filename,
+                'content': content,
+                'file_path': file_path,
+                'processed_at': context['ts'],
+                'metadata': self._document_metadata(filename)
+            })
+        
+        # Store in MongoDB
+        self._store_documents(processed_docs)
+        
+        self.log.info(f"Processed {len(processed_docs)} documents")
+        metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
+        return {
+            'files': len(files),
+            'bytes': sum(size for _, size in files),
+            'documents': len(processed_docs),
+            'failed_files': failed_files
+        }
+
     def _store_documents(self, documents: List[Dict]):
         """Store processed documents in MongoDB"""
         hook = MongoHook(self.mongodb_conn_id)
@@ -132,7 +170,88 @@ class ProcessAviationDocumentsOperator(BaseOperator):
             collection.insert_many(documents)
             self.log.info(f"Stored {len(documents)} documents in MongoDB")
 
-class VectorEmbeddingOperator(BaseOperator):
+class BedrockEmbeddingMixin:
+    """
+    Bedrock embedding calls with an optional EmbeddingCache, shared by the embedding operators
+
+    When the operator sets self.metrics, every chunk is counted with its
+    latency and bytes, and cache hits, throttles, retries, hedges and failed
+    calls are counted.
+    """
+
+    metrics: Optional[StageMetrics] = None
+
+    def _bedrock_client(self) -> BedrockClient:
+        """Runtime client behind the shared adaptive limiter, retries and (optional) hedging"""
+        aws_hook = AwsBaseHook(
+            self.aws_conn_id,
+            client_type='bedrock-runtime',
+            config=client_config(
+                max_pool_connections=BEDROCK_CLIENT_CONFIG['max_pool_connections'],
+                connect_timeout=BEDROCK_CLIENT_CONFIG['connect_timeout'],
+                read_timeout=BEDROCK_CLIENT_CONFIG['read_timeout']
+            )
+        )
+        return BedrockClient(
+            aws_hook.get_conn(),
+            limiter=AdaptiveLimiter(
+                initial=BEDROCK_CLIENT_CONFIG['initial_concurrency'],
+                maximum=BEDROCK_CLIENT_CONFIG['max_concurrency']
+            ),
+            max_attempts=BEDROCK_CLIENT_CONFIG['max_attempts'],
+            deadline=BEDROCK_CLIENT_CONFIG['deadline'],
+            hedge_models=[self.model_id],
+            hedge_percentile=BEDROCK_CLIENT_CONFIG['hedge_percentile'],
+            on_event=self._count_bedrock_event
+        )
+
+    def _count_bedrock_event(self, name: str):
+        if self.metrics:
+            self.metrics.count(name)
+
+    def _get_embedding(self, bedrock_client, text: str, cache: Optional[EmbeddingCache]) -> List[float]:
+        """Return a cached embedding if one exists, otherwise call Bedrock and cache the result"""
+        if not text or len(text.strip()) == 0:
+            return None
+
+        start = time.monotonic()
+        # Key on the text actually sent to the model
+        text = text[:10000]
+        embedding = cache.get(text, self.model_id) if cache else None
+        if embedding:
+            if self.metrics:
+                self.metrics.count('cache_hits')
+        else:
+            embedding = self._generate_embedding(bedrock_client, text)
+            if embedding and cache:
+                cache.put(text, self.model_id, embedding)
+
+        if self.metrics:
+            self.metrics.add(bytes=len(text.encode('utf-8')), latency=time.monotonic() - start)
+        return embedding
+
+    def _generate_embedding(self, bedrock_client, text: str) -> List[float]:
+        """Generate embedding using AWS Bedrock"""
+        try:
+            if not text or len(text.strip()) == 0:
+                return None
+                
+            response = bedrock_client.invoke_model(
+                modelId=self.model_id,
+                body=json.dumps({'inputText': text[:10000]})  # Limit text length
+            )
+            
+            response_body = json.loads(response['body'].read())
+            return response_body.get('embedding')
+            
+        except Exception as e:
+            # Throttled attempts were already counted by the client as they happened
+            if self.metrics:
+                self.metrics.count('errors')
+            self.log.error(f"Error generating embedding: {e}")
+            return None
+
+class VectorEmbeddingOperator(BedrockEmbeddingMixin, BaseOperator):
     """
     Operator to generate vector embeddings using AWS Bedrock
     """
@@ -144,6 +263,10 @@ class VectorEmbeddingOperator(BaseOperator):
         aws_conn_id: str,
         model_id: str,
         output_path: str,
+        cache_path: Optional[str] = None,
+        cache_max_bytes: Optional[int] = None,
+        shard_size: int = 10000,
+        append: bool = False,
         *args, **kwargs
     ):
         super().__init__(*args, **kwargs)
@@ -151,58 +274,200 @@ class VectorEmbeddingOperator(BaseOperator):
         self.aws_conn_id = aws_conn_id
         self.model_id = model_id
         self.output_path = output_path
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        self.shard_size = shard_size
+        self.append = append
 
     def execute(self, context):
         self.log.info("Starting vector embedding generation")
+        self.metrics = StageMetrics.from_context(context)
         
         # Initialize AWS Bedrock client
-        aws_hook = AwsBaseHook(self.aws_conn_id, client_type='bedrock-runtime')
-        bedrock_client = aws_hook.get_conn()
-        
-        # Process documents and generate embeddings
-        embeddings = []
-        for filename in os.listdir(self.input_path):
+        bedrock_client = self._bedrock_client()
+
+        cache = self._open_cache()
+        try:
+            embedded = (
+                (chunk_id, content, record, self._get_embedding(bedrock_client, content, cache))
+                for chunk_id, content, record in self._iter_chunks()
+            )
+            embedded_count = self._write_shards(embedded)
+        finally:
+            self._close_cache(cache)
+        self.metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
+        return embedded_count
+
+    def _iter_chunks(self):
+        """Yield (chunk_id, content, record) for every chunk file in input_path"""
+        for filename in sorted(os.listdir(self.input_path)):
             if filename.endswith('.json'):
                 file_path = os.path.join(self.input_path, filename)
                 with open(file_path, 'r') as f:
                     doc_data = json.load(f)
-                
-                embedding = self._generate_embedding(bedrock_client, doc_data['content'])
-                if embedding:
-                    doc_data['embedding'] = embedding
-                    embeddings.append(doc_data)
-        
-        # Save embeddings
-        os.makedirs(self.output_path, exist_ok=True)
-        for i, emb_data in enumerate(embeddings):
-            output_file = os.path.join(self.output_path, f"embedding_{i}.json")
-            with open(output_file, 'w') as f:
-                json.dump(emb_data, f, indent=2)
-        
-        self.log.info(f"Generated {len(embeddings)} embeddings")
-        return len(embeddings)
 
-    def _generate_embedding(self, bedrock_client, text: str) -> List[float]:
-        """Generate embedding using AWS Bedrock"""
-        try:
-            if not text or len(text.strip()) == 0:
-                return None
-                
-            response = bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps({'inputText': text[:10000]})  # Limit text length
-            )
-            
-            response_body = json.loads(response['body'].read())
-            return response_body.get('embedding')
-            
-        except Exception as e:
-            self.log.error(f"Error generating embedding: {e}")
+                content = doc_data.pop('content')
+                chunk_id = doc_data.pop('chunk_id', None) or make_chunk_id(
+                    doc_data.get('file_path', filename), content
+                )
+                yield chunk_id, content, doc_data
+
+    def _write_shards(self, embedded) -> int:
+        """Stream (chunk_id, content, record, embedding) rows into float32 .npy shards with Parquet metadata"""
+        if not self.append:
+            clear_shards(self.output_path)
+        writer = EmbeddingShardWriter(self.output_path, shard_size=self.shard_size)
+
+        embedded_count = 0
+        for chunk_id, content, record, embedding in embedded:
+            if embedding:
+                writer.add(chunk_id, content, record, embedding)
+                embedded_count += 1
+        manifest = writer.close()
+
+        self.log.info(
+            f"Generated {embedded_count} embeddings, "
+            f"{manifest['total_rows']} rows in {len(manifest['shards'])} shards at {self.output_path}"
+        )
+        return embedded_count
+
+    def _open_cache(self) -> Optional[EmbeddingCache]:
+        if not self.cache_path:
             return None
+        return EmbeddingCache(self.cache_path, max_size_bytes=self.cache_max_bytes)
+
+    def _close_cache(self, cache: Optional[EmbeddingCache]):
+        if not cache:
+            return
+        cache_stats = cache.stats()
+        cache.close()
+        self.log.info(
+            f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"(hit rate {cache_stats['hit_rate']:.1%}), {cache_stats['entries']} entries, "
+            f"{cache_stats['size_bytes']} bytes"
+        )
+
+# Bedrock model invocation job names: at most 63 characters matching [a-zA-Z0-9](-*[a-zA-Z0-9\+\-\.])*
+BATCH_JOB_NAME_MAX_LENGTH = 63
+
+def batch_job_name(dag_id: str, task_id: str, ts_nodash: str) -> str:
+    """
+    Bedrock batch job name for a task run. Disallowed characters become '-';
+    names that are too long keep the run timestamp and a hash of the full
+    name, so distinct tasks still get distinct jobs.
+    """
+    name = re.sub(r'[^a-zA-Z0-9+.-]', '-', f"{dag_id}-{task_id}-{ts_nodash}").lstrip('-+.')
+    if len(name) <= BATCH_JOB_NAME_MAX_LENGTH:
+        return name
+    suffix = f"-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}-{ts_nodash}"
+    return name[:BATCH_JOB_NAME_MAX_LENGTH - len(suffix)] + suffix
+
+class DeferrableVectorEmbeddingOperator(VectorEmbeddingOperator):
+    """
+    VectorEmbeddingOperator that sends uncached chunks to a Bedrock batch
+    inference job and waits for it in the triggerer instead of holding a
+    worker slot. The batch results are loaded into the embedding cache, so the
+    resumed task writes the shards from the cache alone.
+
+    Runs with fewer than min_batch_records uncached chunks are embedded
+    synchronously, because Bedrock batch jobs have a minimum record count.
+    """
+
+    def __init__(
+        self,
+        s3_batch_uri: str,
+        role_arn: str,
+        poll_interval: float = 60.0,
+        min_batch_records: int = 100,
+        *args, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        if not self.cache_path:
+            raise ValueError("DeferrableVectorEmbeddingOperator requires cache_path")
+        self.s3_batch_uri = s3_batch_uri.rstrip('/')
+        self.role_arn = role_arn
+        self.poll_interval = poll_interval
+        self.min_batch_records = min_batch_records
+
+    def execute(self, context):
+        cache = self._open_cache()
+        try:
+            records = []
+            for chunk_id, content, _ in self._iter_chunks():
+                text = content[:10000]
+                if text.strip() and not cache.contains(text, self.model_id):
+                    records.append({'recordId': chunk_id, 'modelInput': {'inputText': text}})
+        finally:
+            # Keep the refreshed last_used_at of live chunks; the embedding pass compacts
+            cache.close(compact=False)
+
+        if len(records) < self.min_batch_records:
+            self.log.info(f"{len(records)} uncached chunks, embedding synchronously")
+            return super().execute(context)
+
+        from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+        job_name = batch_job_name(self.dag_id, self.task_id, context['ts_nodash'])
+        input_uri = f"{self.s3_batch_uri}/{job_name}/input/records.jsonl"
+        output_uri = f"{self.s3_batch_uri}/{job_name}/output/"
+        S3Hook(aws_conn_id=self.aws_conn_id).load_string(
+            '\n'.join(json.dumps(record) for record in records), key=input_uri, replace=True
+        )
+
+        bedrock = AwsBaseHook(self.aws_conn_id, client_type='bedrock').get_conn()
+        job = bedrock.create_model_invocation_job(
+            jobName=job_name,
+            roleArn=self.role_arn,
+            modelId=self.model_id,
+            inputDataConfig={'s3InputDataConfig': {'s3Uri': input_uri}},
+            outputDataConfig={'s3OutputDataConfig': {'s3Uri': output_uri}}
+        )
+        self.log.info(f"Submitted Bedrock batch job {job['jobArn']} for {len(records)} chunks")
+
+        self.defer(
+            trigger=BedrockBatchInferenceTrigger(
+                aws_conn_id=self.aws_conn_id,
+                job_arn=job['jobArn'],
+                poll_interval=self.poll_interval
+            ),
+            method_name='execute_complete',
+            kwargs={'output_uri': output_uri}
+        )
+
+    def execute_complete(self, context, event, output_uri: str):
+        if event['status'] != 'success':
+            raise AirflowException(f"Bedrock batch embedding job failed: {event['message']}")
+
+        from airflow.providers.amazon.aws.hooks.s3 import S3Hook
+        s3_hook = S3Hook(aws_conn_id=self.aws_conn_id)
+        bucket, prefix = S3Hook.parse_s3_url(output_uri)
+
+        cache = self._open_cache()
+        loaded = 0
+        try:
+            for key in s3_hook.list_keys(bucket_name=bucket, prefix=prefix):
+                if not key.endswith('.jsonl.out'):
+                    continue
+                for line in s3_hook.read_key(key, bucket_name=bucket).splitlines():
+                    result = json.loads(line)
+                    embedding = (result.get('modelOutput') or {}).get('embedding')
+                    if embedding:
+                        cache.put(result['modelInput']['inputText'], self.model_id, embedding)
+                        loaded += 1
+        finally:
+            cache.close()
+        self.log.info(f"Loaded {loaded} batch embeddings ({event['job_status']}) into the cache")
+
+        # Anything the batch job skipped is embedded synchronously here
+        return super().execute(context)
 
 class DataQualityCheckOperator(BaseOperator):
     """
     Operator to perform data quality checks on Snowflake tables
+
+    mode='serial' runs each check_sql on its own. mode='single_scan' folds
+    every "SELECT COUNT(*) FROM <table> WHERE <condition>" check on the same
+    table into one COUNT_IF aggregate, so the table is scanned once, and runs
+    the resulting queries concurrently.
     """
     
     # @apply_defaults
@@ -211,45 +476,193 @@ class DataQualityCheckOperator(BaseOperator):
         table_name: str,
         checks: List[Dict],
         snowflake_conn_id: str = 'snowflake_default',
+        mode: str = 'serial',
+        max_concurrency: int = 4,
         *args, **kwargs
     ):
         super().__init__(*args, **kwargs)
+        if mode not in ('serial', 'single_scan'):
+            raise ValueError(f"Unknown data quality check mode: {mode}")
         self.table_name = table_name
         self.checks = checks
         self.snowflake_conn_id = snowflake_conn_id
+        self.mode = mode
+        self.max_concurrency = max_concurrency
 
     def execute(self, context):
-        self.log.info(f"Running data quality checks for {self.table_name}")
+        self.log.info(f"Running data quality checks for {self.table_name} ({self.mode})")
+        self.metrics = StageMetrics.from_context(context)
         
         from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
         hook = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
-        
+
+        start = time.monotonic()
+        if self.mode == 'single_scan':
+            results = self._run_single_scan(hook)
+        else:
+            results = [self._run_query(hook, check['check_sql'], [i])[0] for i, check in enumerate(self.checks)]
+        return self._evaluate(context, results, time.monotonic() - start)
+
+    def _compile_queries(self) -> List[tuple]:
+        """(sql, check indexes) pairs for the configured mode"""
+        if self.mode == 'single_scan':
+            return compile_check_queries([check['check_sql'] for check in self.checks])
+        return [(check['check_sql'], [i]) for i, check in enumerate(self.checks)]
+
+    def _run_single_scan(self, hook) -> List[Dict]:
+        """Compile compatible checks into one aggregate per table and run all queries concurrently"""
+        queries = self._compile_queries()
+        self.log.info(f"Compiled {len(self.checks)} checks into {len(queries)} queries")
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [executor.submit(self._run_query, hook, sql, indexes) for sql, indexes in queries]
+            for future in futures:
+                results.extend(future.result())
+        return sorted(results, key=lambda result: result['index'])
+
+    def _run_query(self, hook, sql: str, check_indexes: List[int]) -> List[Dict]:
+        """Run one query whose columns answer the given checks, in order"""
+        start = time.monotonic()
+        row = hook.get_first(sql)
+        return self._check_results(sql, check_indexes, row, time.monotonic() - start)
+
+    def _check_results(self, sql: str, check_indexes: List[int], row, duration: float) -> List[Dict]:
+        """Compare one result row against the expected value of each check it answers"""
+        self.metrics.add(items=len(check_indexes), latency=duration)
+        results = []
+        for column, index in enumerate(check_indexes):
+            check = self.checks[index]
+            results.append({
+                'index': index,
+                'check_sql': check['check_sql'],
+                'expected': check['expected_result'],
+                'actual': row[column],
+                'passed': row[column] == check['expected_result'],
+                'query': sql,
+                'duration_s': round(duration, 3)
+            })
+        return results
+
+    def _evaluate(self, context, results: List[Dict], duration: float) -> Dict:
+        """Fail the task if any check failed, otherwise return the per-check results"""
         failed_checks = []
-        
-        for check in self.checks:
-            check_sql = check['check_sql']
-            expected_result = check['expected_result']
-            
-            result = hook.get_first(check_sql)[0]
-            
-            if result != expected_result:
+        for result in results:
+            if not result['passed']:
+                self.metrics.count('errors')
                 failed_checks.append({
-                    'check_sql': check_sql,
-                    'expected': expected_result,
-                    'actual': result
+                    'check_sql': result['check_sql'],
+                    'expected': result['expected'],
+                    'actual': result['actual']
                 })
-                self.log.error(f"Data quality check failed: {check_sql}")
+                self.log.error(f"Data quality check failed: {result['check_sql']}")
+        self.metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
         
         if failed_checks:
             error_msg = f"Data quality checks failed for {self.table_name}: {failed_checks}"
             raise ValueError(error_msg)
         
         self.log.info(f"All data quality checks passed for {self.table_name}")
-        return f"All checks passed for {self.table_name}"
+        return {
+            'table_name': self.table_name,
+            'mode': self.mode,
+            'duration_s': round(duration, 3),
+            'checks': results
+        }
+
+
+class DeferrableDataQualityCheckOperator(DataQualityCheckOperator):
+    """
+    DataQualityCheckOperator that submits its queries asynchronously and waits
+    for them in the triggerer, releasing the worker slot in the meantime.
+    """
+
+    def __init__(self, poll_interval: float = 5.0, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.poll_interval = poll_interval
+
+    def execute(self, context):
+        self.log.info(f"Submitting data quality checks for {self.table_name} ({self.mode})")
+
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        hook = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id)
+
+        submitted = []
+        conn = hook.get_conn()
+        try:
+            cursor = conn.cursor()
+            for sql, indexes in self._compile_queries():
+                cursor.execute_async(sql)
+                submitted.append({'query_id': cursor.sfqid, 'sql': sql, 'indexes': indexes})
+        finally:
+            conn.close()
+
+        self.defer(
+            trigger=SnowflakeQueryTrigger(
+                snowflake_conn_id=self.snowflake_conn_id,
+                query_ids=[query['query_id'] for query in submitted],
+                poll_interval=self.poll_interval
+            ),
+            method_name='execute_complete',
+            kwargs={'queries': submitted, 'submitted_at': time.time()}
+        )
+
+    def execute_complete(self, context, event, queries: List[Dict], submitted_at: float):
+        if event['status'] != 'success':
+            raise AirflowException(f"Data quality queries for {self.table_name} failed: {event['message']}")
+
+        duration = time.time() - submitted_at
+        # Latencies recorded here cover submission to completion, including the deferral
+        self.metrics = StageMetrics.from_context(context)
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+        conn = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id).get_conn()
+        results = []
+        try:
+            cursor = conn.cursor()
+            for query in queries:
+                cursor.get_results_from_sfqid(query['query_id'])
+                results.extend(self._check_results(query['sql'], query['indexes'], cursor.fetchone(), duration))
+        finally:
+            conn.close()
+        return self._evaluate(context, sorted(results, key=lambda result: result['index']), duration)
+
+
+COUNT_CHECK_PATTERN = re.compile(
+    r"^\s*SELECT\s+COUNT\(\s*\*\s*\)\s+FROM\s+([\w.\"]+)\s+WHERE\s+(.+?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+
+def compile_check_queries(check_sqls: List[str]) -> List[tuple]:
+    """
+    Group "SELECT COUNT(*) FROM t WHERE cond" checks by table into
+    "SELECT COUNT_IF(cond), ... FROM t". Returns (sql, check indexes) pairs;
+    checks that do not match the pattern are kept as standalone queries.
+    """
+    conditions_by_table = {}
+    queries = []
+    for index, check_sql in enumerate(check_sqls):
+        match = COUNT_CHECK_PATTERN.match(check_sql)
+        if match:
+            table, condition = match.groups()
+            conditions_by_table.setdefault(table.lower(), (table, []))[1].append((index, condition))
+        else:
+            queries.append((check_sql, [index]))
+
+    for table, conditions in conditions_by_table.values():
+        columns = ',\n    '.join(
+            f"COUNT_IF({condition}) AS check_{index}" for index, condition in conditions
+        )
+        queries.append((f"SELECT\n    {columns}\nFROM {table}", [index for index, _ in conditions]))
+    return queries
 
 # Additional operators for document processing
-class DocumentChunkingOperator(BaseOperator):
-    """Operator to chunk documents for vector processing"""
+class DocumentChunkingOperator(DocumentReaderMixin, BaseOperator):
+    """
+    Operator to chunk documents for vector processing
+
+    Writes one {chunk_id}.json per chunk to output_path. Chunk ids are derived
+    from the file path and chunk text, so mapped shards can share output_path.
+    """
     # @apply_defaults
     def __init__(self, message, 
                  source_paths:list[str], 
@@ -265,12 +678,82 @@ class DocumentChunkingOperator(BaseOperator):
         self.chunk_overlap  = chunk_overlap
         self.output_path    = output_path
 
-    # TODO: business logic
-
     def execute(self, context):
         self.log.info("Chunking documents for vector processing")
-        # Implementation for document chunking
-        return "Documents chunked successfully"
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
+        )
+        os.makedirs(self.output_path, exist_ok=True)
+
+        metrics = StageMetrics.from_context(context)
+        files = list_document_files(self.source_paths)
+        documents = 0
+        chunks = 0
+        failed_files = []
+        for file_path, size in files:
+            with metrics.measure(bytes=size):
+                written = self._chunk_document(file_path, splitter)
+                if not written:
+                    metrics.count('errors')
+                    failed_files.append(file_path)
+                    continue
+                chunks += written
+                documents += 1
+
+        metrics.count('chunks', chunks)
+        self.log.info(f"Wrote {chunks} chunks from {documents} documents to {self.output_path}")
+        metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
+        return {
+            'files': len(files),
+            'bytes': sum(size for _, size in files),
+            'documents': documents,
+            'chunks': chunks,
+            'failed_files': failed_files
+        }
+
+    def _chunk_document(self, file_path: str, splitter) -> int:
+        """
+        Chunk one document as its pages stream in, so memory stays bounded by
+        the page size. PDF chunks record the pages they came from.
+        """
+        filename = os.path.basename(file_path)
+        metadata = self._document_metadata(filename)
+        written = []
+        try:
+            pages = self._iter_document_pages(file_path)
+            for index, (text, page_start, page_end) in enumerate(chunk_pages(pages, splitter.split_text)):
+                chunk_id = make_chunk_id(file_path, text)
+                if chunk_id in written:
+                    # Repeated text in one document is stored and embedded once
+                    continue
+                chunk = {
+                    'chunk_id': chunk_id,
+                    'content': text,
+                    'filename': filename,
+                    'file_path': file_path,
+                    'chunk_index': index,
+                    'metadata': metadata
+                }
+                if page_start is not None:
+                    chunk['page_start'] = page_start
+                    chunk['page_end'] = page_end
+                self._write_chunk(chunk)
+                written.append(chunk['chunk_id'])
+        except Exception as e:
+            # Don't leave half a document behind for the embedding stage
+            self.log.error(f"Error chunking {file_path}: {e}")
+            for chunk_id in written:
+                os.remove(os.path.join(self.output_path, f"{chunk_id}.json"))
+            return 0
+        return len(written)
+
+    def _write_chunk(self, chunk: Dict):
+        chunk_file = os.path.join(self.output_path, f"{chunk['chunk_id']}.json")
+        with open(chunk_file + '.tmp', 'w') as f:
+            json.dump(chunk, f)
+        os.replace(chunk_file + '.tmp', chunk_file)
 
 class MongoDBIndexOperator(BaseOperator):
     """Operator to store embeddings in MongoDB"""
@@ -282,6 +765,8 @@ class MongoDBIndexOperator(BaseOperator):
                  database_name:str,
                  collection_name:str,
                  index_name:str,
+                 batch_size:int = 1000,
+                 max_workers:int = 4,
                  *args, 
                  **kwargs):
         super().__init__(*args, **kwargs)
@@ -291,21 +776,121 @@ class MongoDBIndexOperator(BaseOperator):
         self.database_name = database_name
         self.collection_name = collection_name
         self.index_name = index_name
+        self.batch_size = batch_size
+        self.max_workers = max_workers
 
     def execute(self, context):
         self.log.info("Storing embeddings in MongoDB")
-        # Implementation for MongoDB storage
-        return "Embeddings stored in MongoDB"
+
+        manifest = load_manifest(self.embeddings_path)
+        if not manifest or not manifest['total_rows']:
+            self.log.warning(f"No embedding shards found in {self.embeddings_path}")
+            return 0
+
+        hook = MongoHook(self.mongodb_conn_id)
+        client = hook.get_conn()
+        collection = client[self.database_name][self.collection_name]
+        metrics = StageMetrics.from_context(context)
+
+        # Upserts keyed on chunk id make a retried or re-run load idempotent
+        start = time.monotonic()
+        upserted = 0
+        modified = 0
+        written = 0
+        in_flight = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for batch in self._iter_batches(context['ts']):
+                # Bound the number of pending batches so memory stays flat
+                if len(in_flight) >= self.max_workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        upserted += result.upserted_count
+                        modified += result.modified_count
+                in_flight.add(executor.submit(self._write_batch, collection, batch, metrics))
+                written += len(batch)
+
+            for future in in_flight:
+                result = future.result()
+                upserted += result.upserted_count
+                modified += result.modified_count
+
+        elapsed = time.monotonic() - start
+        rate = written / elapsed if elapsed > 0 else 0.0
+        self.log.info(
+            f"Wrote {written} embeddings to {self.database_name}.{self.collection_name} "
+            f"({upserted} inserted, {modified} updated) in {elapsed:.1f}s, {rate:.0f} docs/sec"
+        )
+        metrics.count('upserted', upserted)
+        metrics.count('modified', modified)
+        metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
+        return written
+
+    def _write_batch(self, collection, batch: List[UpdateOne], metrics: StageMetrics):
+        """bulk_write one batch, recording its latency (latency percentiles are per batch)"""
+        start = time.monotonic()
+        result = collection.bulk_write(batch, ordered=False)
+        metrics.add(items=len(batch), latency=time.monotonic() - start)
+        return result
+
+    def _iter_batches(self, indexed_at: str):
+        """Stream upsert batches from the memory-mapped shards"""
+        batch = []
+        for vectors, metadata in iter_shards(self.embeddings_path):
+            columns = metadata.to_pydict()
+            for row in range(metadata.num_rows):
+                document = build_vector_document(
+                    chunk_id=columns['chunk_id'][row],
+                    content=columns['content'][row],
+                    content_hash=columns['content_hash'][row],
+                    record=json.loads(columns['metadata'][row]),
+                    embedding=vectors[row].tolist()
+                )
+                document['indexed_at'] = indexed_at
+                batch.append(UpdateOne({'_id': document.pop('_id')}, {'$set': document}, upsert=True))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+
+def build_vector_document(chunk_id: str, content: str, content_hash: str, record: Dict, embedding: List[float]) -> Dict:
+    """Shape a chunk the way the backend's MongoDBAtlasVectorSearch reads it"""
+    metadata = dict(record.get('metadata', {}))
+    for key, value in record.items():
+        if key != 'metadata':
+            metadata.setdefault(key, value)
+    return {
+        '_id': chunk_id,
+        'text': content,
+        'embedding': embedding,
+        'content_hash': content_hash,
+        'metadata': metadata
+    }
     
-class UpdateVectorStoreOperator(BaseOperator):
-    """UpdateVectorStoreOperator embeddings in MongoDB"""
-    # TODO: business logic
+class UpdateVectorStoreOperator(BedrockEmbeddingMixin, DocumentReaderMixin, BaseOperator):
+    """
+    Delta-sync the vector collection with processed_documents.
+
+    Chunk ids are derived from the source path and chunk text, so a chunk whose
+    content changed gets a new id: only new ids are embedded and upserted, and
+    ids that no longer exist in the latest version of a document (or whose
+    document was removed) are deleted. Documents are chunked exactly as
+    DocumentChunkingOperator does, so both DAGs agree on chunk ids.
+    """
     # @apply_defaults
     def __init__(self, 
                  message:str,
                  mongodb_conn_id:str,
                  aws_conn_id:str,
                  collection_name:str,
+                 model_id:str = VECTOR_STORE_CONFIG['embedding_model'],
+                 database_name:str = MONGODB_DATABASE,
+                 chunk_size:int = VECTOR_STORE_CONFIG['chunk_size'],
+                 chunk_overlap:int = VECTOR_STORE_CONFIG['chunk_overlap'],
+                 cache_path:Optional[str] = None,
+                 batch_size:int = 500,
                  *args, 
                  **kwargs):
         super().__init__(*args, **kwargs)
@@ -313,8 +898,242 @@ class UpdateVectorStoreOperator(BaseOperator):
         self.mongodb_conn_id = mongodb_conn_id
         self.aws_conn_id = aws_conn_id
         self.collection_name = collection_name
+        self.model_id = model_id
+        self.database_name = database_name
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.cache_path = cache_path
+        self.batch_size = batch_size
 
     def execute(self, context):
-        self.log.info("UpdateVectorStoreOperator")
-        # Implementation for MongoDB storage
-        return "UpdateVectorStoreOperator"
\ No newline at end of file
+        self.log.info(f"Delta-syncing {self.collection_name} with processed_documents")
+        self.metrics = StageMetrics.from_context(context)
+
+        hook = MongoHook(self.mongodb_conn_id)
+        client = hook.get_conn()
+        db = client[self.database_name]
+        collection = db[self.collection_name]
+
+        desired = self._desired_chunks(db['processed_documents'])
+        existing = self._existing_chunks(collection)
+
+        new_ids = [chunk_id for chunk_id in desired if chunk_id not in existing]
+        stale_ids = [chunk_id for chunk_id in existing if chunk_id not in desired]
+        removed_sources = {existing[chunk_id] for chunk_id in stale_ids} - {
+            chunk['record']['file_path'] for chunk in desired.values()
+        }
+
+        added, failed_sources = self._embed_and_upsert(collection, desired, new_ids, context['ts'])
+
+        # Keep the previous version of a document searchable if its new chunks failed to embed
+        stale_ids = [chunk_id for chunk_id in stale_ids if existing[chunk_id] not in failed_sources]
+        deleted = 0
+        for i in range(0, len(stale_ids), self.batch_size):
+            result = collection.delete_many({'_id': {'$in': stale_ids[i:i + self.batch_size]}})
+            deleted += result.deleted_count
+
+        summary = {
+            'sources': len({chunk['record']['file_path'] for chunk in desired.values()}),
+            'sources_removed': len(removed_sources),
+            'chunks_total': len(desired),
+            'chunks_unchanged': len(desired) - len(new_ids),
+            'chunks_added': added,
+            'chunks_failed': len(new_ids) - added,
+            'chunks_deleted': deleted
+        }
+        self.log.info(f"Vector store delta sync summary: {summary}")
+        self.metrics.count('chunks_deleted', deleted)
+        self.metrics.publish(context, PIPELINE_METRICS_CONFIG['report_dir'])
+        return summary
+
+    def _desired_chunks(self, processed_documents) -> Dict[str, Dict]:
+        """Chunk the latest version of every processed document page by page, keyed by chunk id"""
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap
+        )
+        latest_documents = processed_documents.aggregate([
+            {'$sort': {'processed_at': -1}},
+            {'$group': {'_id': '$file_path', 'doc': {'$first': '$$ROOT'}}}
+        ], allowDiskUse=True)
+
+        desired = {}
+        for entry in latest_documents:
+            doc = entry['doc']
+            # A source file deleted from the document paths drops out of the vector store
+            if not os.path.exists(doc['file_path']):
+                continue
+            record = {
+                'filename': doc['filename'],
+                'file_path': doc['file_path'],
+                # Lands in the chunk metadata, where the backend reads it for recency rescoring
+                'processed_at': doc.get('processed_at'),
+                'metadata': doc.get('metadata', {})
+            }
+            desired.update(self._document_chunks(doc['file_path'], splitter, record))
+        return desired
+
+    def _document_chunks(self, file_path: str, splitter, record: Dict) -> Dict[str, Dict]:
+        """The chunks DocumentChunkingOperator writes for file_path, with their pages"""
+        chunks = {}
+        for text, page_start, page_end in chunk_pages(self._iter_document_pages(file_path), splitter.split_text):
+            chunk_record = record
+            if page_start is not None:
+                chunk_record = dict(record, page_start=page_start, page_end=page_end)
+            chunks[make_chunk_id(file_path, text)] = {'content': text, 'record': chunk_record}
+        return chunks
+
+    def _existing_chunks(self, collection) -> Dict[str, str]:
+        """Map chunk id to source path for every vector that came from processed_documents"""
+        cursor = collection.find(
+            {'metadata.file_path': {'$exists': True}},
+            {'_id': 1, 'metadata.file_path': 1}
+        )
+        return {doc['_id']: doc['metadata']['file_path'] for doc in cursor}
+
+    def _embed_and_upsert(self, collection, desired: Dict[str, Dict], chunk_ids: List[str], indexed_at: str):
+        """Embed the given chunks and upsert them in batches"""
+        if not chunk_ids:
+            return 0, set()
+
+        bedrock_client = self._bedrock_client()
+        cache = EmbeddingCache(self.cache_path) if self.cache_path else None
+
+        added = 0
+        failed_sources = set()
+        batch = []
+        try:
+            for chunk_id in chunk_ids:
+                chunk = desired[chunk_id]
+                embedding = self._get_embedding(bedrock_client, chunk['content'], cache)
+                if not embedding:
+                    failed_sources.add(chunk['record']['file_path'])
+                    continue
+
+                document = build_vector_document(
+                    chunk_id=chunk_id,
+                    content=chunk['content'],
+                    content_hash=content_hash(chunk['content']),
+                    record=chunk['record'],
+                    embedding=embedding
+                )
+                document['indexed_at'] = indexed_at
+                batch.append(UpdateOne({'_id': document.pop('_id')}, {'$set': document}, upsert=True))
+                if len(batch) >= self.batch_size:
+                    collection.bulk_write(batch, ordered=False)
+                    added += len(batch)
+                    batch = []
+            if batch:
+                collection.bulk_write(batch, ordered=False)
+                added += len(batch)
+        finally:
+            if cache:
+                self.log.info(f"Embedding cache: {cache.stats()}")
+                cache.close()
+
+        return added, failed_sources
+
+class VectorIndexRecallOperator(BedrockEmbeddingMixin, BaseOperator):
+    """
+    Recall@k of the deployed Atlas vector index, with its quantization,
+    against exact search on held-out questions.
+
+    Questions come from questions_path (one per line) and the most asked
+    questions in the backend query log. Neither is part of the corpus, so
+    recall is not inflated by chunks finding themselves. Each question is
+    embedded with the corpus model and searched approximately at every
+    candidate count and exhaustively ($vectorSearch exact), once the index
+    has finished building.
+    """
+    # @apply_defaults
+    def __init__(self,
+                 mongodb_conn_id:str,
+                 aws_conn_id:str,
+                 collection_name:str,
+                 index_name:str,
+                 model_id:str = VECTOR_STORE_CONFIG['embedding_model'],
+                 database_name:str = MONGODB_DATABASE,
+                 quantization:Optional[str] = None,
+                 questions_path:Optional[str] = None,
+                 query_log_dir:Optional[str] = None,
+                 max_questions:int = 100,
+                 k:int = 10,
+                 candidates:Optional[List[int]] = None,
+                 ready_timeout:float = 1800,
+                 *args,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mongodb_conn_id = mongodb_conn_id
+        self.aws_conn_id = aws_conn_id
+        self.collection_name = collection_name
+        self.index_name = index_name
+        self.model_id = model_id
+        self.database_name = database_name
+        self.quantization = quantization
+        self.questions_path = questions_path
+        self.query_log_dir = query_log_dir
+        self.max_questions = max_questions
+        self.k = k
+        self.candidates = candidates
+        self.ready_timeout = ready_timeout
+
+    def execute(self, context):
+        questions = self._questions()
+        if not questions:
+            self.log.warning("No held-out questions found, skipping the index recall report")
+            return None
+
+        hook = MongoHook(self.mongodb_conn_id)
+        collection = hook.get_conn()[self.database_name][self.collection_name]
+        self._wait_until_ready(collection)
+
+        bedrock_client = self._bedrock_client()
+        vectors = [vector for vector in (self._generate_embedding(bedrock_client, q) for q in questions) if vector]
+        report = index_recall_report(
+            lambda vector, limit, num_candidates, exact: self._search(collection, vector, limit, num_candidates, exact),
+            vectors, k=self.k, candidates=self.candidates, quantization=self.quantization
+        )
+        self.log.info(f"Vector index recall: {report}")
+
+        report_dir = PIPELINE_METRICS_CONFIG['report_dir']
+        if report_dir:
+            run_dir = os.path.join(report_dir, self.dag_id, context['run_id'].replace(':', '_'))
+            os.makedirs(run_dir, exist_ok=True)
+            with open(os.path.join(run_dir, f"{self.task_id}.json"), 'w') as f:
+                json.dump(report, f, indent=2)
+        return report
+
+    def _questions(self) -> List[str]:
+        questions = []
+        if self.questions_path and os.path.exists(self.questions_path):
+            with open(self.questions_path, 'r', encoding='utf-8') as f:
+                questions.extend(line.strip() for line in f if line.strip())
+        if self.query_log_dir and os.path.isdir(self.query_log_dir):
+            from answer_warming import frequent_questions, read_query_log
+            entries = read_query_log(self.query_log_dir, since=time.time() - 30 * 86400)
+            questions.extend(item['question'] for item in frequent_questions(entries, top_n=self.max_questions, min_count=1))
+        return list(dict.fromkeys(questions))[:self.max_questions]
+
+    def _wait_until_ready(self, collection):
+        """Wait for a just created or updated index to finish building"""
+        deadline = time.monotonic() + self.ready_timeout
+        while True:
+            indexes = list(collection.list_search_indexes(self.index_name))
+            if indexes and indexes[0].get('queryable') and indexes[0].get('status') == 'READY':
+                return
+            if time.monotonic() > deadline:
+                raise AirflowException(f"Vector index {self.index_name} was not ready after {self.ready_timeout}s")
+            time.sleep(15)
+
+    def _search(self, collection, vector: List[float], limit: int, num_candidates: int, exact: bool) -> List:
+        stage = {
+            'index': self.index_name,
+            'path': 'embedding',
+            'queryVector': vector,
+            'limit': limit
+        }
+        if exact:
+            stage['exact'] = True
+        else:
+            stage['numCandidates'] = num_candidates
+        return [doc['_id'] for doc in collection.aggregate([{'$vectorSearch': stage}, {'$project': {'_id': 1}}])]
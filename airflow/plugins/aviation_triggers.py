@@ -0,0 +1,105 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from airflow.triggers.base import BaseTrigger, TriggerEvent
+
+
+class SnowflakeQueryTrigger(BaseTrigger):
+    """
+    Polls Snowflake for the status of asynchronously submitted queries and
+    fires once all of them have finished or one has failed.
+    """
+
+    def __init__(self, snowflake_conn_id: str, query_ids: List[str], poll_interval: float = 5.0):
+        super().__init__()
+        self.snowflake_conn_id = snowflake_conn_id
+        self.query_ids = query_ids
+        self.poll_interval = poll_interval
+
+    def serialize(self) -> Tuple[str, Dict[str, Any]]:
+        return (
+            'aviation_triggers.SnowflakeQueryTrigger',
+            {
+                'snowflake_conn_id': self.snowflake_conn_id,
+                'query_ids': self.query_ids,
+                'poll_interval': self.poll_interval
+            }
+        )
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        pending = list(self.query_ids)
+        while True:
+            try:
+                # The connector is blocking, keep it off the triggerer's event loop
+                pending = await asyncio.to_thread(self._still_running, pending)
+            except Exception as e:
+                yield TriggerEvent({'status': 'error', 'message': str(e), 'query_ids': self.query_ids})
+                return
+
+            if not pending:
+                yield TriggerEvent({'status': 'success', 'query_ids': self.query_ids})
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _still_running(self, query_ids: List[str]) -> List[str]:
+        """Return the queries that have not finished yet, raising if any failed"""
+        from airflow.providers.snowflake.hooks.snowflake import SnowflakeHook
+
+        conn = SnowflakeHook(snowflake_conn_id=self.snowflake_conn_id).get_conn()
+        try:
+            return [
+                query_id for query_id in query_ids
+                if conn.is_still_running(conn.get_query_status_throw_if_error(query_id))
+            ]
+        finally:
+            conn.close()
+
+
+class BedrockBatchInferenceTrigger(BaseTrigger):
+    """Polls a Bedrock batch inference (model invocation) job until it reaches a final state"""
+
+    SUCCESS_STATES = ('Completed', 'PartiallyCompleted')
+    FAILURE_STATES = ('Failed', 'Stopped', 'Expired')
+
+    def __init__(self, aws_conn_id: str, job_arn: str, poll_interval: float = 60.0):
+        super().__init__()
+        self.aws_conn_id = aws_conn_id
+        self.job_arn = job_arn
+        self.poll_interval = poll_interval
+
+    def serialize(self) -> Tuple[str, Dict[str, Any]]:
+        return (
+            'aviation_triggers.BedrockBatchInferenceTrigger',
+            {
+                'aws_conn_id': self.aws_conn_id,
+                'job_arn': self.job_arn,
+                'poll_interval': self.poll_interval
+            }
+        )
+
+    async def run(self) -> AsyncIterator[TriggerEvent]:
+        while True:
+            try:
+                job = await asyncio.to_thread(self._get_job)
+            except Exception as e:
+                yield TriggerEvent({'status': 'error', 'message': str(e), 'job_arn': self.job_arn})
+                return
+
+            state = job['status']
+            if state in self.SUCCESS_STATES:
+                yield TriggerEvent({'status': 'success', 'job_arn': self.job_arn, 'job_status': state})
+                return
+            if state in self.FAILURE_STATES:
+                yield TriggerEvent({
+                    'status': 'error',
+                    'message': job.get('message', f"Bedrock batch job ended in state {state}"),
+                    'job_arn': self.job_arn
+                })
+                return
+            await asyncio.sleep(self.poll_interval)
+
+    def _get_job(self) -> Dict:
+        from airflow.providers.amazon.aws.hooks.base_aws import AwsBaseHook
+
+        client = AwsBaseHook(self.aws_conn_id, client_type='bedrock').get_conn()
+        return client.get_model_invocation_job(jobIdentifier=self.job_arn)
@@ -0,0 +1,73 @@
+import heapq
+import logging
+import os
+from typing import Dict, List, Tuple
+
+DOCUMENT_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+log = logging.getLogger(__name__)
+
+
+def list_document_files(source_paths: List[str]) -> List[Tuple[str, int]]:
+    """(file path, size in bytes) for every supported document in the source directories"""
+    files = []
+    for path in source_paths:
+        if os.path.isfile(path):
+            candidates = [path]
+        elif os.path.isdir(path):
+            candidates = [os.path.join(path, filename) for filename in sorted(os.listdir(path))]
+        else:
+            continue
+        for file_path in candidates:
+            if file_path.endswith(DOCUMENT_EXTENSIONS) and os.path.isfile(file_path):
+                files.append((file_path, os.path.getsize(file_path)))
+    return files
+
+
+def plan_document_shards(source_paths: List[str], max_shards: int = 16) -> List[List[str]]:
+    """
+    Partition the documents under source_paths into at most max_shards lists
+    of file paths with roughly equal total bytes (largest file first into the
+    lightest shard).
+    """
+    files = sorted(list_document_files(source_paths), key=lambda item: item[1], reverse=True)
+    if not files:
+        return []
+
+    shard_count = min(max_shards, len(files))
+    heap = [(0, index) for index in range(shard_count)]
+    shards = [[] for _ in range(shard_count)]
+    for file_path, size in files:
+        shard_bytes, index = heapq.heappop(heap)
+        shards[index].append(file_path)
+        heapq.heappush(heap, (shard_bytes + size, index))
+
+    log.info(
+        f"Planned {shard_count} shards for {len(files)} files "
+        f"({sum(size for _, size in files)} bytes), shard sizes: {sorted(size for size, _ in heap)}"
+    )
+    return shards
+
+
+def prepare_chunk_shards(source_paths: List[str], output_path: str, max_shards: int = 16) -> List[List[str]]:
+    """Clear the previous run's chunk files and plan the shards for this run"""
+    if os.path.isdir(output_path):
+        for filename in os.listdir(output_path):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(output_path, filename))
+    return plan_document_shards(source_paths, max_shards)
+
+
+def merge_shard_manifests(manifests: List[Dict]) -> Dict:
+    """Reduce the per-shard manifests returned by mapped tasks into run totals"""
+    merged = {'shards': 0, 'files': 0, 'bytes': 0, 'documents': 0, 'chunks': 0, 'failed_files': []}
+    for manifest in manifests:
+        if not manifest:
+            continue
+        merged['shards'] += 1
+        for key in ('files', 'bytes', 'documents', 'chunks'):
+            merged[key] += manifest.get(key, 0)
+        merged['failed_files'].extend(manifest.get('failed_files', []))
+
+    log.info(f"Merged shard manifests: {merged}")
+    return merged
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from typing import Dict, List, Optional
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding store backed by a local SQLite file.
+
+    Entries are keyed by sha256(model_id, text) so an unchanged chunk embedded
+    with the same model is never sent to Bedrock twice.
+    """
+
+    def __init__(self, db_path: str, max_size_bytes: Optional[int] = None):
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model_id TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used_at)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(text: str, model_id: str) -> str:
+        """Hash of model id and text, used as the cache key"""
+        digest = hashlib.sha256()
+        digest.update((model_id or '').encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, text: str, model_id: str) -> Optional[List[float]]:
+        """Return the cached embedding for text, or None on a miss"""
+        key = self.make_key(text, model_id)
+        row = self.conn.execute(
+            "SELECT vector FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.conn.execute(
+            "UPDATE embeddings SET last_used_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return array('f', row[0]).tolist()
+
+    def contains(self, text: str, model_id: str) -> bool:
+        """Whether text has a cached embedding, without decoding it; a hit counts as a use for eviction"""
+        key = self.make_key(text, model_id)
+        cursor = self.conn.execute(
+            "UPDATE embeddings SET last_used_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return cursor.rowcount > 0
+
+    def put(self, text: str, model_id: str, embedding: List[float]):
+        """Store an embedding as packed float32"""
+        key = self.make_key(text, model_id)
+        blob = array('f', embedding).tobytes()
+        now = time.time()
+        self.conn.execute(
+            """
+            INSERT OR REPLACE INTO embeddings
+                (key, model_id, vector, size_bytes, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (key, model_id, blob, len(blob), now, now)
+        )
+
+    def size_bytes(self) -> int:
+        """Total size of the stored vectors"""
+        row = self.conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM embeddings").fetchone()
+        return row[0]
+
+    def compact(self, max_size_bytes: Optional[int] = None) -> int:
+        """Evict least recently used entries until the store fits max_size_bytes"""
+        limit = max_size_bytes if max_size_bytes is not None else self.max_size_bytes
+        self.conn.commit()
+        if not limit:
+            return 0
+
+        excess = self.size_bytes() - limit
+        if excess <= 0:
+            return 0
+
+        evicted = 0
+        freed = 0
+        rows = self.conn.execute(
+            "SELECT key, size_bytes FROM embeddings ORDER BY last_used_at ASC"
+        ).fetchall()
+        stale_keys = []
+        for key, size in rows:
+            if freed >= excess:
+                break
+            stale_keys.append((key,))
+            freed += size
+            evicted += 1
+
+        self.conn.executemany("DELETE FROM embeddings WHERE key = ?", stale_keys)
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+        return evicted
+
+    def stats(self) -> Dict:
+        """Hit-rate and size report for the current run"""
+        lookups = self.hits + self.misses
+        entries = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': self.size_bytes()
+        }
+
+    def close(self, compact: bool = True):
+        """Commit pending writes, enforce the size cap unless compact is False, and close the database"""
+        if compact:
+            self.compact()
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,53 @@
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Atlas vector index quantization: int8 per dimension, or one bit per dimension
+QUANTIZATION_MODES = ('scalar', 'binary')
+
+
+def bytes_per_vector(dimensions: int) -> Dict[str, int]:
+    """Index storage per vector for each representation"""
+    return {
+        'float32': dimensions * 4,
+        'scalar': dimensions,
+        'binary': (dimensions + 7) // 8
+    }
+
+
+def recall_at_k(approximate: Sequence, exact: Sequence) -> float:
+    """Share of the exact top-k ids that the approximate search also returned"""
+    if not exact:
+        return 1.0
+    return len(set(approximate) & set(exact)) / len(exact)
+
+
+def index_recall_report(search: Callable[..., List], queries: List[List[float]], k: int = 10,
+                        candidates: Optional[List[int]] = None, quantization: Optional[str] = None) -> Dict:
+    """
+    Recall@k of the deployed vector index against exact search.
+
+    search(vector, limit, num_candidates, exact) returns result ids: with
+    exact=True the index does an exhaustive search over the full-fidelity
+    vectors (Atlas ENN), otherwise its approximate search over the quantized
+    graph with num_candidates. queries should be held out from the corpus,
+    e.g. real user questions: corpus vectors used as queries find themselves
+    and inflate recall.
+    """
+    candidates = candidates or [10 * k, 20 * k, 50 * k]
+    dimensions = len(queries[0]) if queries else 0
+    totals = {n_candidates: 0.0 for n_candidates in candidates}
+    for vector in queries:
+        exact = search(vector, limit=k, num_candidates=k, exact=True)
+        for n_candidates in candidates:
+            approximate = search(vector, limit=k, num_candidates=n_candidates, exact=False)
+            totals[n_candidates] += recall_at_k(approximate, exact)
+
+    return {
+        'quantization': quantization or 'none',
+        'queries': len(queries),
+        'k': k,
+        'bytes_per_vector': bytes_per_vector(dimensions),
+        'recall': {
+            n_candidates: round(total / len(queries), 4) if queries else None
+            for n_candidates, total in totals.items()
+        }
+    }
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+MANIFEST_FILE = 'manifest.json'
+METADATA_SCHEMA = pa.schema([
+    ('chunk_id', pa.string()),
+    ('content_hash', pa.string()),
+    ('content', pa.string()),
+    ('metadata', pa.string())
+])
+
+
+def content_hash(text: str) -> str:
+    """sha256 of chunk text"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_chunk_id(source: str, text: str) -> str:
+    """Stable chunk id derived from the source document and the chunk text"""
+    digest = hashlib.sha256()
+    digest.update(source.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_manifest(path: str) -> Optional[Dict]:
+    """Read the shard manifest in path, or None if nothing has been written yet"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r') as f:
+        return json.load(f)
+
+
+def clear_shards(path: str):
+    """Remove a previous run's shards and manifest"""
+    manifest = load_manifest(path)
+    if not manifest:
+        return
+    for shard in manifest['shards']:
+        # Shards written by older versions may also list quantized code files
+        for key in ('vectors', 'metadata', 'scalar', 'scalar_scale', 'binary'):
+            if key not in shard:
+                continue
+            shard_file = os.path.join(path, shard[key])
+            if os.path.exists(shard_file):
+                os.remove(shard_file)
+    os.remove(os.path.join(path, MANIFEST_FILE))
+
+
+class EmbeddingShardWriter:
+    """
+    Writes embeddings as row-aligned shards: a float32 .npy matrix plus a
+    Parquet metadata file per shard, listed in manifest.json.
+
+    Opening a writer on a directory that already has a manifest appends new
+    shards after the existing ones.
+    """
+
+    def __init__(self, output_path: str, shard_size: int = 10000):
+        self.output_path = output_path
+        self.shard_size = shard_size
+        os.makedirs(output_path, exist_ok=True)
+
+        self.manifest = load_manifest(output_path) or {
+            'format': 'npy+parquet',
+            'dtype': 'float32',
+            'dimensions': None,
+            'total_rows': 0,
+            'shards': []
+        }
+        self._vectors = []
+        self._rows = []
+
+    def add(self, chunk_id: str, content: str, metadata: Dict, embedding: List[float]):
+        """Buffer one embedding, flushing a shard when it is full"""
+        if self.manifest['dimensions'] is None:
+            self.manifest['dimensions'] = len(embedding)
+        elif len(embedding) != self.manifest['dimensions']:
+            raise ValueError(
+                f"Embedding for {chunk_id} has {len(embedding)} dimensions, "
+                f"expected {self.manifest['dimensions']}"
+            )
+
+        self._vectors.append(embedding)
+        self._rows.append({
+            'chunk_id': chunk_id,
+            'content_hash': content_hash(content),
+            'content': content,
+            'metadata': json.dumps(metadata, default=str)
+        })
+
+        if len(self._rows) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows as a new shard and update the manifest"""
+        if not self._rows:
+            return
+
+        shard_index = len(self.manifest['shards'])
+        vectors_file = f"shard_{shard_index:05d}.npy"
+        metadata_file = f"shard_{shard_index:05d}.parquet"
+
+        vectors = np.asarray(self._vectors, dtype=np.float32)
+        self._write_atomic(vectors_file, lambda f: np.save(f, vectors))
+        table = pa.Table.from_pylist(self._rows, schema=METADATA_SCHEMA)
+        self._write_atomic(metadata_file, lambda f: pq.write_table(table, f, compression='zstd'))
+
+        self.manifest['shards'].append({
+            'vectors': vectors_file,
+            'metadata': metadata_file,
+            'rows': len(self._rows)
+        })
+        self.manifest['total_rows'] += len(self._rows)
+        self._write_atomic(MANIFEST_FILE, lambda f: f.write(json.dumps(self.manifest, indent=2).encode('utf-8')))
+
+        self._vectors = []
+        self._rows = []
+
+    def close(self) -> Dict:
+        """Flush the last partial shard and return the manifest"""
+        self.flush()
+        return self.manifest
+
+    def _write_atomic(self, filename: str, write):
+        """Write to a temporary file and rename it so readers never see partial shards"""
+        final_path = os.path.join(self.output_path, filename)
+        tmp_path = final_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, final_path)
+
+
+def read_shard(path: str, shard: Dict) -> Tuple[np.ndarray, pa.Table]:
+    """Memory-map one shard's vectors and metadata without copying them"""
+    vectors = np.load(os.path.join(path, shard['vectors']), mmap_mode='r')
+    metadata = pq.read_table(os.path.join(path, shard['metadata']), memory_map=True)
+    return vectors, metadata
+
+
+def iter_shards(path: str) -> Iterator[Tuple[np.ndarray, pa.Table]]:
+    """Yield (vectors, metadata) for every shard listed in the manifest"""
+    manifest = load_manifest(path)
+    if not manifest:
+        return
+    for shard in manifest['shards']:
+        yield read_shard(path, shard)
@@ -0,0 +1,178 @@
+import bisect
+import hashlib
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+# Bump when extraction output changes so stale cached pages are not reused
+CACHE_VERSION = 1
+
+log = logging.getLogger(__name__)
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """sha256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pdf_page_count(path: str) -> int:
+    with open(path, 'rb') as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """(1-based page number, text) for pages [start, stop), with a reader of its own so ranges can run in parallel"""
+    with open(path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return [(index + 1, reader.pages[index].extract_text() or '') for index in range(start, stop)]
+
+
+class PdfPageExtractor:
+    """
+    Streams the text of a PDF one page at a time as (page number, text).
+
+    The reader works on an open file handle, so the PDF is never loaded as a
+    whole. Files with more than pages_per_task pages are split into page
+    ranges extracted by up to workers processes, at most 2 * workers ranges
+    ahead of the consumer. With cache_dir set, extracted pages are written to
+    <cache_dir>/<sha256 of file>.v<version>.jsonl and later runs on an
+    unchanged file stream from there.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, workers: int = 1, pages_per_task: int = 100):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def iter_pages(self, path: str) -> Iterator[Tuple[int, str]]:
+        cache_path = self._cache_path(path) if self.cache_dir else None
+        if cache_path and os.path.exists(cache_path):
+            yield from self._read_cache(cache_path)
+            return
+
+        pages = self._extract(path)
+        if not cache_path:
+            yield from pages
+            return
+
+        # Only a fully extracted file is published to the cache
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+                for page_number, text in pages:
+                    cache_file.write(json.dumps({'page': page_number, 'text': text}) + '\n')
+                    yield page_number, text
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _extract(self, path: str) -> Iterator[Tuple[int, str]]:
+        count = pdf_page_count(path)
+        if self.workers > 1 and count > self.pages_per_task:
+            yield from self._extract_parallel(path, count)
+            return
+
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for index, page in enumerate(reader.pages):
+                yield index + 1, page.extract_text() or ''
+
+    def _extract_parallel(self, path: str, count: int) -> Iterator[Tuple[int, str]]:
+        """Extract page ranges in worker processes, yielding pages in order"""
+        ranges = iter([
+            (start, min(start + self.pages_per_task, count))
+            for start in range(0, count, self.pages_per_task)
+        ])
+        log.info(f"Extracting {count} pages of {path} with {self.workers} workers")
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for _ in range(self.workers * 2):
+                page_range = next(ranges, None)
+                if page_range:
+                    pending.append(executor.submit(extract_page_range, path, *page_range))
+            while pending:
+                pages = pending.popleft().result()
+                page_range = next(ranges, None)
+                if page_range:
+                    pending.append(executor.submit(extract_page_range, path, *page_range))
+                yield from pages
+
+    def _cache_path(self, path: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_hash(path)}.v{CACHE_VERSION}.jsonl")
+
+    def _read_cache(self, cache_path: str) -> Iterator[Tuple[int, str]]:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                page = json.loads(line)
+                yield page['page'], page['text']
+
+
+def chunk_pages(pages: Iterable[Tuple[Optional[int], str]],
+                split_text: Callable[[str], List[str]]) -> Iterator[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    Incrementally chunk a stream of (page number, text) pages, yielding
+    (chunk text, first page, last page).
+
+    Only the text after the last complete chunk is carried over to the next
+    page, so memory is bounded by the chunk and page size, not the document.
+    """
+    buffer = ''
+    # (offset in buffer, page number) where each page's text starts
+    starts = []
+
+    def page_at(offset: int) -> Optional[int]:
+        return starts[max(bisect.bisect_right([start for start, _ in starts], offset) - 1, 0)][1]
+
+    def locate(chunks: List[str]) -> List[int]:
+        # Each chunk starts after the previous one and ends beyond it. Taking the
+        # earliest such match never places a chunk after its real position, so
+        # repetitive text can at worst be carried over twice, never dropped.
+        offsets = []
+        cursor = 0
+        end = 0
+        for chunk in chunks:
+            offset = buffer.find(chunk, max(cursor, end - len(chunk) + 1))
+            offset = cursor if offset < 0 else offset
+            offsets.append(offset)
+            cursor = offset + 1
+            end = offset + len(chunk)
+        return offsets
+
+    for page_number, text in pages:
+        if not text.strip():
+            continue
+        if buffer:
+            buffer += '\n'
+        starts.append((len(buffer), page_number))
+        buffer += text
+
+        chunks = split_text(buffer)
+        if len(chunks) < 2:
+            continue
+        offsets = locate(chunks)
+        for chunk, offset in zip(chunks[:-1], offsets[:-1]):
+            yield chunk, page_at(offset), page_at(offset + len(chunk) - 1)
+
+        # The last chunk may continue on the next page, so it is re-split with it
+        carry = offsets[-1]
+        first_page = page_at(carry)
+        buffer = buffer[carry:]
+        starts = [(0, first_page)] + [(start - carry, page) for start, page in starts if start > carry]
+
+    if buffer:
+        chunks = split_text(buffer)
+        for chunk, offset in zip(chunks, locate(chunks)):
+            yield chunk, page_at(offset), page_at(offset + len(chunk) - 1)
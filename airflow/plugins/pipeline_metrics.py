@@ -0,0 +1,192 @@
+import json
+import logging
+import math
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+class StageMetrics:
+    """
+    Throughput instrumentation for one task (stage) of a pipeline run.
+
+    Operators count items and bytes as they process them, time per-item work
+    with measure(), and count events such as throttles. publish() pushes the
+    numbers to Airflow's configured metrics backend (StatsD or OpenTelemetry),
+    writes a JSON run report and an OpenMetrics text file, and pushes the
+    report to XCom under 'run_report'.
+    """
+
+    def __init__(self, dag_id: str, task_id: str, run_id: Optional[str] = None,
+                 map_index: int = -1, try_number: int = 1):
+        self.dag_id = dag_id
+        self.task_id = task_id
+        self.run_id = run_id
+        self.map_index = map_index
+        self.try_number = try_number
+        self.items = 0
+        self.bytes = 0
+        self.latencies = []
+        self.counters = {'retries': max(try_number - 1, 0), 'throttles': 0, 'errors': 0}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_context(cls, context: Dict, task_id: Optional[str] = None) -> 'StageMetrics':
+        """Build metrics for the task instance in an Airflow context"""
+        ti = context.get('ti')
+        if ti is None:
+            return cls(dag_id='local', task_id=task_id or 'local')
+        return cls(
+            dag_id=ti.dag_id,
+            task_id=task_id or ti.task_id,
+            run_id=ti.run_id,
+            map_index=ti.map_index,
+            try_number=ti.try_number
+        )
+
+    def add(self, items: int = 1, bytes: int = 0, latency: Optional[float] = None):
+        """Count processed items and bytes, with an optional per-item latency in seconds"""
+        with self._lock:
+            self.items += items
+            self.bytes += bytes
+            if latency is not None:
+                self.latencies.append(latency)
+
+    @contextmanager
+    def measure(self, items: int = 1, bytes: int = 0):
+        """Time a unit of work and count it when it completes"""
+        start = time.monotonic()
+        yield
+        self.add(items=items, bytes=bytes, latency=time.monotonic() - start)
+
+    def count(self, name: str, value: int = 1):
+        """Increment an event counter such as throttles, errors or cache_hits"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> Dict:
+        wall = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+        return {
+            'dag_id': self.dag_id,
+            'task_id': self.task_id,
+            'run_id': self.run_id,
+            'map_index': self.map_index,
+            'try_number': self.try_number,
+            'wall_time_s': round(wall, 3),
+            'items': self.items,
+            'bytes': self.bytes,
+            'items_per_sec': round(self.items / wall, 2) if wall > 0 else 0.0,
+            'bytes_per_sec': round(self.bytes / wall, 2) if wall > 0 else 0.0,
+            'latency_s': {
+                **{f"p{pct}": percentile(latencies, pct) for pct in PERCENTILES},
+                'max': latencies[-1] if latencies else None,
+                'count': len(latencies),
+                'sum': sum(latencies)
+            },
+            'peak_rss_mb': peak_rss_mb(),
+            'counters': dict(self.counters)
+        }
+
+    def publish(self, context: Dict, report_dir: Optional[str] = None) -> Dict:
+        """Emit metrics, write the run report files and push the report to XCom"""
+        report = self.report()
+        self._emit_stats(report)
+
+        if report_dir:
+            try:
+                self._write_reports(report, report_dir)
+            except OSError as e:
+                log.warning(f"Could not write run report to {report_dir}: {e}")
+
+        ti = context.get('ti')
+        if ti is not None:
+            ti.xcom_push(key='run_report', value=report)
+        log.info(f"Run report for {self.task_id}: {json.dumps(report)}")
+        return report
+
+    def _emit_stats(self, report: Dict):
+        try:
+            from airflow.stats import Stats
+        except ImportError:
+            return
+
+        prefix = f"aviation.{self.dag_id}.{self.task_id}"
+        Stats.incr(f"{prefix}.items", report['items'])
+        Stats.incr(f"{prefix}.bytes", report['bytes'])
+        Stats.gauge(f"{prefix}.items_per_sec", report['items_per_sec'])
+        Stats.gauge(f"{prefix}.bytes_per_sec", report['bytes_per_sec'])
+        Stats.gauge(f"{prefix}.peak_rss_mb", report['peak_rss_mb'])
+        Stats.timing(f"{prefix}.wall_time", report['wall_time_s'] * 1000)
+        for name, value in report['latency_s'].items():
+            if name.startswith('p') and value is not None:
+                Stats.gauge(f"{prefix}.latency_{name}_ms", value * 1000)
+        for name, value in report['counters'].items():
+            Stats.incr(f"{prefix}.{name}", value)
+
+    def _write_reports(self, report: Dict, report_dir: str):
+        run_dir = os.path.join(report_dir, self.dag_id, (self.run_id or 'local').replace(':', '_'))
+        os.makedirs(run_dir, exist_ok=True)
+        name = self.task_id if self.map_index < 0 else f"{self.task_id}.{self.map_index}"
+
+        with open(os.path.join(run_dir, f"{name}.json"), 'w') as f:
+            json.dump(report, f, indent=2)
+        with open(os.path.join(run_dir, f"{name}.prom"), 'w') as f:
+            f.write(to_openmetrics(report))
+
+
+def to_openmetrics(report: Dict) -> str:
+    """Render a run report in the OpenMetrics text format (for a textfile collector)"""
+    labels = f'dag_id="{report["dag_id"]}",task_id="{report["task_id"]}",map_index="{report["map_index"]}"'
+    samples = [
+        ('aviation_stage_items', 'counter', report['items']),
+        ('aviation_stage_bytes', 'counter', report['bytes']),
+        ('aviation_stage_items_per_second', 'gauge', report['items_per_sec']),
+        ('aviation_stage_bytes_per_second', 'gauge', report['bytes_per_sec']),
+        ('aviation_stage_wall_time_seconds', 'gauge', report['wall_time_s']),
+        ('aviation_stage_peak_rss_megabytes', 'gauge', report['peak_rss_mb'])
+    ]
+    lines = []
+    for name, metric_type, value in samples:
+        lines.append(f"# TYPE {name} {metric_type}")
+        # OpenMetrics counter samples carry the _total suffix
+        sample_name = f"{name}_total" if metric_type == 'counter' else name
+        lines.append(f"{sample_name}{{{labels}}} {value}")
+
+    latency = report['latency_s']
+    lines.append("# TYPE aviation_stage_latency_seconds summary")
+    for name, value in latency.items():
+        if name.startswith('p') and value is not None:
+            lines.append(f'aviation_stage_latency_seconds{{{labels},quantile="{int(name[1:]) / 100}"}} {value}')
+    lines.append(f"aviation_stage_latency_seconds_count{{{labels}}} {latency['count']}")
+    lines.append(f"aviation_stage_latency_seconds_sum{{{labels}}} {latency['sum']}")
+
+    lines.append("# TYPE aviation_stage_events counter")
+    for name, value in report['counters'].items():
+        lines.append(f'aviation_stage_events_total{{{labels},event="{name}"}} {value}')
+    lines.append("# EOF")
+    return '\n'.join(lines) + '\n'
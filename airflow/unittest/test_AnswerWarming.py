@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import time
+from unittest.mock import MagicMock, patch
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from answer_store import answer_key
+from answer_warming import frequent_questions, read_query_log, warm_answers
+
+def entry(question, context_type='general', **fields):
+    return dict({'question': question, 'context_type': context_type, 'status': 'ok', 'route': 'hybrid'}, **fields)
+
+class TestAnswerWarming(unittest.TestCase):
+    def test_answer_key_ignores_case_spacing_and_punctuation(self):
+        self.assertEqual(
+            answer_key('What is  the MEL?', 'maintenance', 'b1'),
+            answer_key('what is the mel', 'maintenance', 'b1')
+        )
+        self.assertNotEqual(answer_key('what is the mel', 'maintenance', 'b1'),
+                            answer_key('what is the mel', 'maintenance', 'b2'))
+
+    def test_frequent_questions_counts_only_cacheable_queries(self):
+        entries = (
+            [entry('What is the MEL?')] * 3 + [entry('what is the mel')] +
+            [entry('Lithium battery limits?', 'cargo')] * 2 +
+            [entry('Status of AA123?', route='structured:status')] * 5 +
+            [entry('Contact <email> about ULD')] * 5 +
+            [entry('Filtered question', filters={'aircraft_type': 'B777'})] * 5 +
+            [entry('Failing question', status='error')] * 5 +
+            [entry('Asked once')]
+        )
+        questions = frequent_questions(entries, top_n=10, min_count=2)
+
+        self.assertEqual(questions, [
+            {'question': 'What is the MEL?', 'context_type': 'general', 'count': 4},
+            {'question': 'Lithium battery limits?', 'context_type': 'cargo', 'count': 2}
+        ])
+
+    def test_read_query_log_skips_old_and_partial_lines(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            now = time.time()
+            with open(os.path.join(log_dir, 'queries.jsonl'), 'w') as f:
+                f.write(json.dumps(entry('old', ts=now - 100)) + '\n')
+                f.write(json.dumps(entry('new', ts=now)) + '\n')
+                f.write('{"question": "trunc')
+            entries = read_query_log(log_dir, since=now - 10)
+        self.assertEqual([e['question'] for e in entries], ['new'])
+
+    def test_warm_answers_stores_rag_answers_only(self):
+        store = MagicMock()
+        responses = {
+            'good': {'answer': 'Use the MEL.', 'retrieval': 'hybrid'},
+            'broken': {'answer': 'Error: timeout', 'source_documents': []}
+        }
+        questions = [{'question': q, 'context_type': 'general', 'count': 3} for q in ('good', 'broken')]
+        with patch('answer_warming.fetch_answer', side_effect=lambda url, q, c, t: responses[q]):
+            counts = warm_answers(store, 'b1', questions, 'http://backend', rate_per_second=0)
+
+        self.assertEqual(counts, {'stored': 1, 'skipped': 1, 'failed': 0})
+        store.put.assert_called_once_with('good', 'general', 'b1', responses['good'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
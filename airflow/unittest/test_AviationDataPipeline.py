@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+import jinja2
+
+# Include DAG, custom operator and config paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'dags')))
+
+import aviation_data_pipeline as pipeline
+
+SOURCE = {
+    'table': 'flights',
+    'staging_table': 'staging.flights_raw',
+    'watermark_column': 'ingested_at',
+    'merge_keys': ['flight_number', 'scheduled_departure'],
+    'columns': ['flight_number', 'scheduled_departure', 'status']
+}
+
+def statements(sql):
+    return [' '.join(statement.split()) for statement in sql.split(';') if statement.strip()]
+
+class TestIncrementalMergeSql(unittest.TestCase):
+    def test_merge_is_bounded_by_the_watermarks_and_keyed_on_merge_keys(self):
+        sql = statements(pipeline.incremental_merge_sql(SOURCE))
+
+        self.assertEqual([statement.split()[0] for statement in sql], ['SET', 'SET', 'BEGIN', 'MERGE', 'MERGE', 'COMMIT'])
+        self.assertIn("source_table = 'staging.flights_raw'", sql[0])
+        self.assertIn("WHERE ingested_at > $low_wm AND ingested_at <= $high_wm", sql[3])
+        self.assertIn("PARTITION BY flight_number, scheduled_departure ORDER BY ingested_at DESC", sql[3])
+        self.assertIn("ON t.flight_number = s.flight_number AND t.scheduled_departure = s.scheduled_departure", sql[3])
+        # Keys are matched on, never updated
+        self.assertIn("UPDATE SET status = s.status, loaded_at = CURRENT_TIMESTAMP()", sql[3])
+        self.assertIn("MERGE INTO etl_watermarks", sql[4])
+
+    def test_load_tasks_declare_their_statement_count(self):
+        self.assertEqual(pipeline.statement_count(pipeline.FLIGHTS_MERGE_SQL), 6)
+        self.assertEqual(pipeline.statement_count(pipeline.CARGO_MERGE_SQL), 6)
+        for task_id, sql in (('extract_flight_data', pipeline.FLIGHTS_MERGE_SQL),
+                             ('extract_cargo_data', pipeline.CARGO_MERGE_SQL)):
+            with self.subTest(task_id=task_id):
+                task = pipeline.dag.get_task(task_id)
+                self.assertEqual(task.sql, sql)
+                self.assertEqual(task.statement_count, len(statements(sql)))
+
+class TestDailyReportSql(unittest.TestCase):
+    def render(self, full_rebuild):
+        return statements(jinja2.Template(pipeline.DAILY_REPORT_SQL).render(
+            params={'report_full_rebuild': full_rebuild, 'report_retention_days': 7}
+        ))
+
+    def test_incremental_run_merges_only_changed_flights(self):
+        sql = self.render(full_rebuild=False)
+
+        self.assertEqual([statement.split()[0] for statement in sql],
+                         ['SET', 'SET', 'CREATE', 'BEGIN', 'MERGE', 'DELETE', 'MERGE', 'COMMIT'])
+        self.assertIn("loaded_at > $low_wm AND loaded_at <= $high_wm", sql[4])
+        self.assertIn("ON r.flight_number = s.flight_number AND r.scheduled_departure = s.scheduled_departure", sql[4])
+        self.assertIn("DATEADD(day, -7, CURRENT_DATE())", sql[5])
+        self.assertIn("'daily_operations_report' AS source_table", sql[6])
+
+    def test_full_rebuild_swaps_in_a_new_table(self):
+        sql = self.render(full_rebuild=True)
+
+        self.assertEqual([statement.split()[0] for statement in sql],
+                         ['SET', 'SET', 'CREATE', 'CREATE', 'ALTER', 'DROP', 'MERGE'])
+        self.assertNotIn("$low_wm AND loaded_at", sql[2])
+        self.assertIn("SWAP WITH daily_operations_report_rebuild", sql[4])
+
+if __name__ == '__main__':
+    unittest.main()
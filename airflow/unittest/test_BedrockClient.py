@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import io
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from bedrock_client import AdaptiveLimiter, BedrockClient, DeadlineExceeded
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'InvokeModel')
+
+def response(payload):
+    return {'body': io.BytesIO(json.dumps(payload).encode())}
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_additive_increase_and_multiplicative_decrease(self):
+        limiter = AdaptiveLimiter(initial=4, maximum=8, cooldown=0)
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(latency=0.1)
+        self.assertAlmostEqual(limiter.limit, 5.0, delta=0.1)
+
+        limiter.acquire()
+        limiter.release(throttled=True)
+        self.assertAlmostEqual(limiter.limit, 2.5, delta=0.1)
+
+    def test_acquire_times_out_at_deadline(self):
+        limiter = AdaptiveLimiter(initial=1)
+        limiter.acquire()
+        with self.assertRaises(DeadlineExceeded):
+            limiter.acquire(deadline=time.monotonic() + 0.05)
+
+class TestBedrockClient(unittest.TestCase):
+    def test_retries_throttles_and_reports_events(self):
+        runtime = MagicMock()
+        runtime.invoke_model.side_effect = [client_error('ThrottlingException'), response({'embedding': [1.0]})]
+        events = []
+        client = BedrockClient(runtime, base_delay=0.001, on_event=events.append)
+
+        result = client.invoke_model(modelId='titan', body='{}')
+        self.assertEqual(json.loads(result['body'].read()), {'embedding': [1.0]})
+        self.assertEqual(runtime.invoke_model.call_count, 2)
+        self.assertEqual(events, ['throttles', 'retries'])
+        self.assertEqual(client.limiter.in_flight, 0)
+
+    def test_validation_errors_are_not_retried(self):
+        runtime = MagicMock()
+        runtime.invoke_model.side_effect = client_error('ValidationException')
+        client = BedrockClient(runtime, base_delay=0.001)
+
+        with self.assertRaises(ClientError):
+            client.invoke_model(modelId='titan', body='{}')
+        self.assertEqual(runtime.invoke_model.call_count, 1)
+
+    def test_slow_idempotent_call_is_hedged(self):
+        calls = []
+        first_call = threading.Event()
+
+        def invoke_model(**request):
+            calls.append(request)
+            if not first_call.is_set():
+                first_call.set()
+                time.sleep(0.5)
+                return response({'embedding': [0.0]})
+            return response({'embedding': [1.0]})
+
+        runtime = MagicMock()
+        runtime.invoke_model.side_effect = invoke_model
+        client = BedrockClient(runtime, hedge_models=['titan'], hedge_percentile=50, hedge_min_samples=1)
+        client._latencies.append(0.01)
+
+        result = client.invoke_model(modelId='titan', body='{}')
+        self.assertEqual(json.loads(result['body'].read()), {'embedding': [1.0]})
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(client.stats()['hedge_wins'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from airflow.models.dag import DAG
+
+# Include custom operator and config paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
+
+from aviation_operators import DataQualityCheckOperator, compile_check_queries
+
+DEFAULT_DATE = datetime(2025, 1, 1)
+
+CHECKS = [
+    {'check_sql': "SELECT COUNT(*) FROM flights WHERE flight_number IS NULL", 'expected_result': 0},
+    {'check_sql': "SELECT COUNT(*) FROM cargo_manifests WHERE weight_kg <= 0;", 'expected_result': 0},
+    {'check_sql': "select count(*) from FLIGHTS where scheduled_arrival < scheduled_departure", 'expected_result': 0},
+    {'check_sql': "SELECT MAX(ingested_at) > DATEADD(day, -1, CURRENT_TIMESTAMP()) FROM flights", 'expected_result': True}
+]
+
+class TestCompileCheckQueries(unittest.TestCase):
+    def test_count_checks_fold_into_one_query_per_table(self):
+        queries = compile_check_queries([check['check_sql'] for check in CHECKS])
+
+        self.assertEqual(queries, [
+            (CHECKS[3]['check_sql'], [3]),
+            ("SELECT\n    COUNT_IF(flight_number IS NULL) AS check_0,\n"
+             "    COUNT_IF(scheduled_arrival < scheduled_departure) AS check_2\nFROM flights", [0, 2]),
+            ("SELECT\n    COUNT_IF(weight_kg <= 0) AS check_1\nFROM cargo_manifests", [1])
+        ])
+
+class TestDataQualityCheckOperator(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dag = DAG(dag_id='test_dag', schedule=None, start_date=DEFAULT_DATE)
+
+    def _execute(self, mode, rows):
+        operator = DataQualityCheckOperator(
+            task_id=f"quality_{mode}", table_name='flights', checks=CHECKS, mode=mode, dag=self.dag
+        )
+        hook = MagicMock()
+        hook.return_value.get_first.side_effect = lambda sql: rows[sql.split()[1]]
+        with patch('airflow.providers.snowflake.hooks.snowflake.SnowflakeHook', hook):
+            return operator.execute(context={}), hook.return_value.get_first
+
+    def test_single_scan_reports_each_check_in_order(self):
+        rows = {'COUNT_IF(flight_number': (0, 0), 'COUNT_IF(weight_kg': (0,), 'MAX(ingested_at)': (True,)}
+        result, get_first = self._execute('single_scan', rows)
+
+        self.assertEqual(get_first.call_count, 3)
+        self.assertEqual([check['index'] for check in result['checks']], [0, 1, 2, 3])
+        self.assertTrue(all(check['passed'] for check in result['checks']))
+        self.assertEqual(result['checks'][0]['query'], result['checks'][2]['query'])
+
+    def test_failed_checks_raise_in_both_modes(self):
+        single_scan_rows = {'COUNT_IF(flight_number': (0, 3), 'COUNT_IF(weight_kg': (0,), 'MAX(ingested_at)': (True,)}
+        serial_rows = {'COUNT(*)': (0,), 'count(*)': (3,), 'MAX(ingested_at)': (True,)}
+        for mode, rows in (('single_scan', single_scan_rows), ('serial', serial_rows)):
+            with self.subTest(mode=mode):
+                with self.assertRaisesRegex(ValueError, 'scheduled_arrival < scheduled_departure'):
+                    self._execute(mode, rows)
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DataQualityCheckOperator(task_id='quality', table_name='flights', checks=CHECKS, mode='parallel',
+                                     dag=self.dag)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+import sys
+import os
+import re
+
+# Include custom operator and config paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
+
+from aviation_operators import batch_job_name
+
+# Bedrock CreateModelInvocationJob jobName constraint
+JOB_NAME_PATTERN = re.compile(r'[a-zA-Z0-9](-*[a-zA-Z0-9\+\-\.])*')
+
+class TestBatchJobName(unittest.TestCase):
+    def test_short_names_keep_dag_task_and_run(self):
+        name = batch_job_name('vector_store_processor', 'generate_embeddings', '20240101T000000')
+        self.assertEqual(name, 'vector-store-processor-generate-embeddings-20240101T000000')
+        self.assertTrue(JOB_NAME_PATTERN.fullmatch(name))
+
+    def test_long_names_are_truncated_and_stay_distinct(self):
+        task_ids = ['generate_embeddings_for_every_aviation_document_shard_a',
+                    'generate_embeddings_for_every_aviation_document_shard_b']
+        names = [batch_job_name('_vector_store_processor', task_id, '20240101T000000') for task_id in task_ids]
+
+        for name in names:
+            self.assertLessEqual(len(name), 63)
+            self.assertTrue(JOB_NAME_PATTERN.fullmatch(name))
+            self.assertTrue(name.endswith('-20240101T000000'))
+        self.assertNotEqual(names[0], names[1])
+
+if __name__ == '__main__':
+    unittest.main()
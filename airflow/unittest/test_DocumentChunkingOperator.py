@@ -1,21 +1,26 @@
 import unittest
+import importlib.util
 import sys
 import os
+import json
+import tempfile
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from datetime import datetime
 
 from airflow.models.dag import DAG
-from airflow.models import TaskInstance
 
-# Include custom operator path
+# Include custom operator and config paths
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
 
 from aviation_operators import (
     DocumentChunkingOperator,
     VectorEmbeddingOperator,
-    MongoDBIndexOperator
+    MongoDBIndexOperator,
+    UpdateVectorStoreOperator
 )
+from test_PageExtraction import write_pdf
 
 DEFAULT_DATE = datetime(2025, 1, 1)
 
@@ -23,17 +28,94 @@ class TestDocumentChunkingOperator(unittest.TestCase):
     def setUp(self):
         super().setUp()
         self.dag = DAG(dag_id='test_dag', start_date=DEFAULT_DATE)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.tmp_dir.name, 'docs')
+        self.output_path = os.path.join(self.tmp_dir.name, 'chunks')
+        os.makedirs(self.source_path)
+        with open(os.path.join(self.source_path, 'cargo_loading_guide.txt'), 'w') as f:
+            f.write("Lithium batteries are Class 9 dangerous goods. " * 40)
+        with open(os.path.join(self.source_path, 'notes.csv'), 'w') as f:
+            f.write("not,a,document")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
 
     def test_my_custom_operator_execute(self):
-        operator = DocumentChunkingOperator(task_id='my_task', my_param='test_value', dag=self.dag)
+        operator = DocumentChunkingOperator(
+            task_id='my_task',
+            message='test',
+            source_paths=[self.source_path],
+            chunk_size=500,
+            chunk_overlap=50,
+            output_path=self.output_path,
+            dag=self.dag
+        )
+
+        result = operator.execute(context={})
+
+        chunk_files = sorted(os.listdir(self.output_path))
+        self.assertEqual(result['files'], 1)
+        self.assertEqual(result['documents'], 1)
+        self.assertEqual(result['chunks'], len(chunk_files))
+        self.assertGreater(len(chunk_files), 1)
+
+        with open(os.path.join(self.output_path, chunk_files[0])) as f:
+            chunk = json.load(f)
+        self.assertEqual(f"{chunk['chunk_id']}.json", chunk_files[0])
+        self.assertEqual(chunk['filename'], 'cargo_loading_guide.txt')
+        self.assertEqual(chunk['metadata']['category'], 'cargo')
+        self.assertLessEqual(len(chunk['content']), 500)
+
+        # Re-running over the same input rewrites the same chunk ids
+        operator.execute(context={})
+        self.assertEqual(sorted(os.listdir(self.output_path)), chunk_files)
+
+    def test_delta_sync_produces_the_chunking_operator_ids(self):
+        pdf_path = os.path.join(self.source_path, 'cargo_manual.pdf')
+        write_pdf(pdf_path, ["Pallet net inspection before loading " * 8, "", "ULD tie-down limits " * 12])
+        cache_dir = os.path.join(self.tmp_dir.name, 'pages')
+
+        with patch.dict('aviation_operators.PDF_EXTRACTION_CONFIG', {'cache_dir': cache_dir, 'workers': 1}):
+            DocumentChunkingOperator(
+                task_id='chunk', message='test', source_paths=[pdf_path],
+                chunk_size=200, chunk_overlap=20, output_path=self.output_path, dag=self.dag
+            ).execute(context={})
+
+            processed_documents = MagicMock()
+            processed_documents.aggregate.return_value = [{'doc': {
+                'filename': 'cargo_manual.pdf', 'file_path': pdf_path, 'content': 'unused',
+                'processed_at': '2025-01-01T00:00:00', 'metadata': {'category': 'cargo'}
+            }}]
+            operator = UpdateVectorStoreOperator(
+                task_id='sync', message='test', mongodb_conn_id='mongo', aws_conn_id='aws',
+                collection_name='docs', chunk_size=200, chunk_overlap=20, dag=self.dag
+            )
+            desired = operator._desired_chunks(processed_documents)
+
+        chunk_ids = {filename[:-len('.json')] for filename in os.listdir(self.output_path)}
+        self.assertGreater(len(chunk_ids), 1)
+        self.assertEqual(set(desired), chunk_ids)
+        for chunk_id in chunk_ids:
+            with open(os.path.join(self.output_path, f"{chunk_id}.json")) as f:
+                chunk = json.load(f)
+            self.assertEqual(desired[chunk_id]['record']['page_start'], chunk['page_start'])
+            self.assertEqual(desired[chunk_id]['record']['page_end'], chunk['page_end'])
 
-        # Create a TaskInstance to simulate execution context
-        ti = TaskInstance(task=operator, execution_date=DEFAULT_DATE)
+    def test_every_assigned_category_is_searchable_by_the_backend(self):
+        # The backend's context_type pre-filter must cover every category assigned here
+        path = os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'app', 'search_filters.py')
+        spec = importlib.util.spec_from_file_location('backend_search_filters', path)
+        search_filters = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(search_filters)
 
-        # Call the execute method and assert the expected behavior
-        result = operator.execute(context=ti.get_template_context())
-        self.assertEqual(result, 'expected_output')
+        reachable = {category for categories in search_filters.CONTEXT_CATEGORIES.values() for category in categories}
+        for filename in ("iata_dgr_regulations.pdf", "engine_maintenance_manual.pdf", "uld_loading_guide.docx",
+                         "cargo_loading_procedure.txt", "safety_bulletin.txt", "fleet_overview.md"):
+            with self.subTest(filename=filename):
+                category = DocumentChunkingOperator._categorize_document(None, filename)
+                self.assertEqual(category, search_filters.categorize(filename))
+                self.assertIn(category, reachable)
 
 
-if __name__=="main":
-    unittest.main()
\ No newline at end of file
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from document_sharding import merge_shard_manifests, plan_document_shards
+
+class TestDocumentSharding(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for i, size in enumerate([100, 90, 50, 40, 30, 5, 5]):
+            with open(os.path.join(self.tmp_dir.name, f"manual_{i}.txt"), 'w') as f:
+                f.write('x' * size)
+        with open(os.path.join(self.tmp_dir.name, 'flights.csv'), 'w') as f:
+            f.write('ignored')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_shards_are_balanced_by_bytes(self):
+        shards = plan_document_shards([self.tmp_dir.name, '/does/not/exist'], max_shards=3)
+
+        shard_bytes = sorted(sum(os.path.getsize(path) for path in shard) for shard in shards)
+        self.assertEqual(shard_bytes, [100, 100, 120])
+        self.assertEqual(sum(len(shard) for shard in shards), 7)
+
+    def test_shard_count_never_exceeds_file_count(self):
+        self.assertEqual(len(plan_document_shards([self.tmp_dir.name], max_shards=50)), 7)
+        self.assertEqual(plan_document_shards(['/does/not/exist']), [])
+
+    def test_merge_shard_manifests(self):
+        merged = merge_shard_manifests([
+            {'files': 2, 'bytes': 10, 'chunks': 3, 'failed_files': ['a.pdf']},
+            None,
+            {'files': 1, 'bytes': 5, 'documents': 1}
+        ])
+        self.assertEqual(merged['shards'], 2)
+        self.assertEqual(merged['files'], 3)
+        self.assertEqual(merged['bytes'], 15)
+        self.assertEqual(merged['failed_files'], ['a.pdf'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from embedding_cache import EmbeddingCache
+
+MODEL_ID = 'amazon.titan-embed-text-v1'
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(os.path.join(self.tmp_dir.name, 'embeddings.sqlite'))
+
+    def tearDown(self):
+        self.cache.conn.close()
+        self.tmp_dir.cleanup()
+
+    def test_get_put_round_trip(self):
+        self.assertIsNone(self.cache.get('Class 9 lithium batteries', MODEL_ID))
+
+        self.cache.put('Class 9 lithium batteries', MODEL_ID, [0.5, -0.25, 1.0])
+        self.assertEqual(self.cache.get('Class 9 lithium batteries', MODEL_ID), [0.5, -0.25, 1.0])
+
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    def test_key_includes_model_id(self):
+        self.cache.put('deicing fluid', MODEL_ID, [1.0, 2.0])
+        self.assertIsNone(self.cache.get('deicing fluid', 'amazon.titan-embed-text-v2:0'))
+
+    def test_compact_evicts_least_recently_used(self):
+        for i in range(4):
+            self.cache.put(f"chunk {i}", MODEL_ID, [float(i)] * 4)
+        self.cache.get('chunk 0', MODEL_ID)
+
+        # Each vector is 16 bytes, keep room for two of them
+        evicted = self.cache.compact(max_size_bytes=32)
+
+        self.assertEqual(evicted, 2)
+        self.assertIsNotNone(self.cache.get('chunk 0', MODEL_ID))
+        self.assertIsNone(self.cache.get('chunk 1', MODEL_ID))
+        self.assertLessEqual(self.cache.size_bytes(), 32)
+
+    def test_contains_marks_entries_used_and_close_keeps_it(self):
+        db_path = os.path.join(self.tmp_dir.name, 'embeddings.sqlite')
+        for i in range(4):
+            self.cache.put(f"chunk {i}", MODEL_ID, [float(i)] * 4)
+        self.cache.close()
+
+        scan = EmbeddingCache(db_path)
+        self.assertTrue(scan.contains('chunk 0', MODEL_ID))
+        self.assertFalse(scan.contains('chunk 9', MODEL_ID))
+        scan.close(compact=False)
+
+        # The refreshed last_used_at was committed, so chunk 0 survives the next compaction
+        self.cache = EmbeddingCache(db_path)
+        self.assertEqual(self.cache.compact(max_size_bytes=16), 3)
+        self.assertIsNotNone(self.cache.get('chunk 0', MODEL_ID))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from embedding_quantization import index_recall_report
+from embedding_shards import EmbeddingShardWriter, clear_shards, iter_shards
+
+class TestEmbeddingShards(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vectors = np.random.default_rng(7).normal(size=(250, 64)).astype(np.float32)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, rows):
+        writer = EmbeddingShardWriter(self.tmp_dir.name, shard_size=100)
+        for i in rows:
+            writer.add(f"chunk-{i}", f"text {i}", {'metadata': {'category': 'cargo'}}, self.vectors[i].tolist())
+        return writer.close()
+
+    def test_shards_are_row_aligned_and_appendable(self):
+        self._write(range(0, 150))
+        manifest = self._write(range(150, 250))
+
+        self.assertEqual(manifest['total_rows'], 250)
+        self.assertEqual([shard['rows'] for shard in manifest['shards']], [100, 50, 100])
+
+        offset = 0
+        for vectors, metadata in iter_shards(self.tmp_dir.name):
+            self.assertIsInstance(vectors, np.memmap)
+            np.testing.assert_array_equal(vectors, self.vectors[offset:offset + len(vectors)])
+            self.assertEqual(metadata.column('chunk_id')[0].as_py(), f"chunk-{offset}")
+            offset += len(vectors)
+
+        clear_shards(self.tmp_dir.name)
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+class TestIndexRecallReport(unittest.TestCase):
+    def test_recall_against_exact_search(self):
+        corpus = np.random.default_rng(7).normal(size=(200, 16)).astype(np.float32)
+        queries = np.random.default_rng(8).normal(size=(5, 16)).astype(np.float32)
+        calls = []
+
+        def search(vector, limit, num_candidates, exact):
+            calls.append((num_candidates, exact))
+            ranked = list(np.argsort(-(corpus @ np.asarray(vector)))[:limit])
+            # An approximate search with few candidates misses the last of the true top results
+            return ranked if exact or num_candidates >= 100 else ranked[:-1] + [-1]
+
+        report = index_recall_report(search, queries.tolist(), k=4, candidates=[40, 100], quantization='scalar')
+
+        self.assertEqual(report['recall'], {40: 0.75, 100: 1.0})
+        self.assertEqual(report['bytes_per_vector'], {'float32': 64, 'scalar': 16, 'binary': 2})
+        self.assertEqual((report['queries'], report['quantization']), (5, 'scalar'))
+        self.assertEqual(calls[:3], [(4, True), (40, False), (100, False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
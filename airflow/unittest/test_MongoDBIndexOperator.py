@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import tempfile
+
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from airflow.models.dag import DAG
+
+# Include custom operator and config paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
+
+from aviation_operators import MongoDBIndexOperator
+from embedding_shards import EmbeddingShardWriter
+
+DEFAULT_DATE = datetime(2025, 1, 1)
+
+class TestMongoDBIndexOperator(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dag = DAG(dag_id='test_dag', schedule=None, start_date=DEFAULT_DATE)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.embeddings_path = os.path.join(self.tmp_dir.name, 'embeddings')
+        writer = EmbeddingShardWriter(self.embeddings_path, shard_size=2)
+        for i in range(5):
+            record = {'filename': 'mel.pdf', 'file_path': '/docs/mel.pdf', 'metadata': {'category': 'maintenance'}}
+            writer.add(f"chunk-{i}", f"text {i}", record, [float(i), 1.0])
+        writer.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _execute(self, collection, task_id='store'):
+        operator = MongoDBIndexOperator(
+            task_id=task_id, message='test', embeddings_path=self.embeddings_path,
+            mongodb_conn_id='mongo', database_name='aviation', collection_name='docs',
+            index_name='vector_index', batch_size=3, max_workers=2, dag=self.dag
+        )
+        hook = MagicMock()
+        hook.return_value.get_conn.return_value = {'aviation': {'docs': collection}}
+        with patch('aviation_operators.MongoHook', hook), \
+                patch.dict('aviation_operators.PIPELINE_METRICS_CONFIG', {'report_dir': None}):
+            return operator.execute(context={'ts': '2025-01-01T00:00:00+00:00'})
+
+    def test_upserts_every_row_keyed_by_chunk_id(self):
+        collection = MagicMock()
+        collection.bulk_write.return_value = MagicMock(upserted_count=3, modified_count=0)
+
+        written = self._execute(collection)
+
+        self.assertEqual(written, 5)
+        batches = [call.args[0] for call in collection.bulk_write.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [3, 2])
+        for call in collection.bulk_write.call_args_list:
+            self.assertEqual(call.kwargs, {'ordered': False})
+
+        operations = [operation for batch in batches for operation in batch]
+        self.assertEqual([op._filter for op in operations], [{'_id': f"chunk-{i}"} for i in range(5)])
+        self.assertTrue(all(op._upsert for op in operations))
+        document = operations[1]._doc['$set']
+        self.assertEqual(document['text'], 'text 1')
+        self.assertEqual(document['embedding'], [1.0, 1.0])
+        self.assertEqual(document['metadata']['category'], 'maintenance')
+        self.assertEqual(document['metadata']['file_path'], '/docs/mel.pdf')
+        self.assertEqual(document['indexed_at'], '2025-01-01T00:00:00+00:00')
+
+    def test_rerun_writes_the_same_ids(self):
+        first, second = MagicMock(), MagicMock()
+        for collection in (first, second):
+            collection.bulk_write.return_value = MagicMock(upserted_count=0, modified_count=0)
+        self._execute(first)
+        self._execute(second, task_id='store_again')
+
+        def ids(collection):
+            return [op._filter['_id'] for call in collection.bulk_write.call_args_list for op in call.args[0]]
+        self.assertEqual(ids(first), ids(second))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from page_extraction import PdfPageExtractor, chunk_pages
+
+def write_pdf(path, page_texts):
+    """Minimal uncompressed PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode('latin-1')
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    body += ''.join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(body)
+
+class TestPageExtraction(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.tmp_dir.name, 'maintenance_manual.pdf')
+        write_pdf(self.pdf_path, [f"Task card {page} torque values" for page in range(1, 6)])
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_pages_streams_numbered_pages_and_caches_them(self):
+        cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        extractor = PdfPageExtractor(cache_dir=cache_dir)
+
+        pages = list(extractor.iter_pages(self.pdf_path))
+        self.assertEqual([number for number, _ in pages], [1, 2, 3, 4, 5])
+        self.assertIn('Task card 3', pages[2][1])
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        # A second pass is served from the cache
+        extractor._extract = lambda path: self.fail("should read from the cache")
+        self.assertEqual(list(extractor.iter_pages(self.pdf_path)), pages)
+
+    def test_parallel_page_ranges_keep_page_order(self):
+        extractor = PdfPageExtractor(workers=2, pages_per_task=2)
+        pages = list(extractor.iter_pages(self.pdf_path))
+        self.assertEqual([number for number, _ in pages], [1, 2, 3, 4, 5])
+
+    def test_chunk_pages_records_page_provenance(self):
+        def split_text(text):
+            return [text[i:i + 10] for i in range(0, len(text), 10)]
+
+        pages = [(1, 'abcdefghijklmno'), (2, 'pqrs'), (3, ''), (4, 'tuvwxyz01234')]
+        chunks = list(chunk_pages(iter(pages), split_text))
+
+        self.assertEqual(''.join(text for text, _, _ in chunks), 'abcdefghijklmno\npqrs\ntuvwxyz01234')
+        self.assertEqual(chunks[0], ('abcdefghij', 1, 1))
+        self.assertEqual(chunks[1], ('klmno\npqrs', 1, 2))
+        self.assertEqual(chunks[-1], ('234', 4, 4))
+
+if __name__ == '__main__':
+    unittest.main()
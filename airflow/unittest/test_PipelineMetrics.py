@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+from unittest.mock import MagicMock
+
+# Include custom operator path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+
+from pipeline_metrics import StageMetrics, percentile, to_openmetrics
+
+class TestPipelineMetrics(unittest.TestCase):
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50.0)
+        self.assertEqual(percentile(values, 99), 99.0)
+        self.assertIsNone(percentile([], 50))
+
+    def test_report_counts_items_bytes_and_events(self):
+        metrics = StageMetrics('aviation_data_pipeline', 'chunk_documents', try_number=2)
+        for size in (10, 20, 30):
+            with metrics.measure(bytes=size):
+                pass
+        metrics.count('throttles', 2)
+
+        report = metrics.report()
+        self.assertEqual(report['items'], 3)
+        self.assertEqual(report['bytes'], 60)
+        self.assertEqual(report['latency_s']['count'], 3)
+        self.assertEqual(report['counters']['retries'], 1)
+        self.assertEqual(report['counters']['throttles'], 2)
+        self.assertGreater(report['peak_rss_mb'], 0)
+
+    def test_publish_writes_reports_and_pushes_xcom(self):
+        ti = MagicMock(dag_id='vector_store_processor', task_id='store_embeddings',
+                       run_id='manual__2024-01-01T00:00:00', map_index=-1, try_number=1)
+        metrics = StageMetrics.from_context({'ti': ti})
+        metrics.add(items=5, bytes=100, latency=0.5)
+
+        with tempfile.TemporaryDirectory() as report_dir:
+            report = metrics.publish({'ti': ti}, report_dir)
+            run_dir = os.path.join(report_dir, 'vector_store_processor', 'manual__2024-01-01T00_00_00')
+            with open(os.path.join(run_dir, 'store_embeddings.json')) as f:
+                self.assertEqual(json.load(f)['items'], 5)
+            with open(os.path.join(run_dir, 'store_embeddings.prom')) as f:
+                self.assertTrue(f.read().endswith('# EOF\n'))
+
+        ti.xcom_push.assert_called_once_with(key='run_report', value=report)
+
+    def test_openmetrics_counter_and_summary_samples(self):
+        metrics = StageMetrics('vector_store_processor', 'store_embeddings')
+        metrics.add(items=5, bytes=100, latency=0.5)
+        metrics.add(items=1, bytes=20, latency=1.5)
+
+        lines = to_openmetrics(metrics.report()).splitlines()
+        labels = 'dag_id="vector_store_processor",task_id="store_embeddings",map_index="-1"'
+        self.assertIn('# TYPE aviation_stage_items counter', lines)
+        self.assertIn(f'aviation_stage_items_total{{{labels}}} 6', lines)
+        self.assertIn(f'aviation_stage_bytes_total{{{labels}}} 120', lines)
+        self.assertIn('# TYPE aviation_stage_latency_seconds summary', lines)
+        self.assertIn(f'aviation_stage_latency_seconds_count{{{labels}}} 2', lines)
+        self.assertIn(f'aviation_stage_latency_seconds_sum{{{labels}}} 2.0', lines)
+        self.assertTrue(any(line.startswith('aviation_stage_latency_seconds{') and 'quantile="0.5"' in line
+                            for line in lines))
+        self.assertEqual(lines[-1], '# EOF')
+
+if __name__ == '__main__':
+    unittest.main()
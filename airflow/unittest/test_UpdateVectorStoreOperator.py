@@ -0,0 +1,98 @@
+import unittest
+import sys
+import os
+import tempfile
+
+from unittest.mock import MagicMock, patch
+from datetime import datetime
+
+from airflow.models.dag import DAG
+
+# Include custom operator and config paths
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'plugins')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'config')))
+
+from aviation_operators import UpdateVectorStoreOperator
+from embedding_shards import make_chunk_id
+
+DEFAULT_DATE = datetime(2025, 1, 1)
+
+class TestUpdateVectorStoreOperator(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dag = DAG(dag_id='test_dag', schedule=None, start_date=DEFAULT_DATE)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _document(self, filename, text):
+        """Write a one-chunk source document and return its processed_documents entry"""
+        file_path = os.path.join(self.tmp_dir.name, filename)
+        if text is not None:
+            with open(file_path, 'w') as f:
+                f.write(text)
+        return {'doc': {'filename': filename, 'file_path': file_path, 'processed_at': '2025-01-01T00:00:00',
+                        'metadata': {'category': 'general'}}}
+
+    def test_delta_sync_embeds_new_chunks_and_deletes_stale_ones(self):
+        unchanged = self._document('mel.txt', "Minimum equipment list for the fleet.")
+        edited = self._document('loading.txt', "Load heavy ULDs on the main deck first.")
+        failing = self._document('dgr.txt', "Lithium batteries are Class 9.")
+        removed = self._document('retired.txt', None)
+        paths = {name: entry['doc']['file_path'] for name, entry in
+                 (('mel', unchanged), ('loading', edited), ('dgr', failing), ('retired', removed))}
+
+        existing = {
+            make_chunk_id(paths['mel'], "Minimum equipment list for the fleet."): paths['mel'],
+            make_chunk_id(paths['loading'], "Load light ULDs first."): paths['loading'],
+            make_chunk_id(paths['dgr'], "Lithium batteries are Class 8."): paths['dgr'],
+            make_chunk_id(paths['retired'], "Retired procedure."): paths['retired']
+        }
+        processed_documents = MagicMock()
+        processed_documents.aggregate.return_value = [unchanged, edited, failing, removed]
+        collection = MagicMock()
+        collection.find.return_value = [
+            {'_id': chunk_id, 'metadata': {'file_path': path}} for chunk_id, path in existing.items()
+        ]
+        collection.delete_many.side_effect = lambda query: MagicMock(deleted_count=len(query['_id']['$in']))
+        hook = MagicMock()
+        hook.return_value.get_conn.return_value = {
+            'aviation': {'processed_documents': processed_documents, 'docs': collection}
+        }
+
+        operator = UpdateVectorStoreOperator(
+            task_id='sync', message='test', mongodb_conn_id='mongo', aws_conn_id='aws',
+            collection_name='docs', database_name='aviation', dag=self.dag
+        )
+        embed = lambda client, text, cache: None if 'Lithium' in text else [0.1, 0.2]
+        with patch('aviation_operators.MongoHook', hook), \
+                patch.dict('aviation_operators.PIPELINE_METRICS_CONFIG', {'report_dir': None}), \
+                patch.object(operator, '_bedrock_client'), \
+                patch.object(operator, '_get_embedding', side_effect=embed) as get_embedding:
+            summary = operator.execute(context={'ts': '2025-01-02T00:00:00+00:00'})
+
+        # Only the chunks whose text changed are embedded
+        self.assertEqual(sorted(call.args[1] for call in get_embedding.call_args_list),
+                         ["Lithium batteries are Class 9.", "Load heavy ULDs on the main deck first."])
+        upserted = [op._filter['_id'] for call in collection.bulk_write.call_args_list for op in call.args[0]]
+        self.assertEqual(upserted, [make_chunk_id(paths['loading'], "Load heavy ULDs on the main deck first.")])
+
+        # The replaced chunk and the removed document go; dgr.txt keeps its old chunk until it embeds
+        deleted = {chunk_id for call in collection.delete_many.call_args_list for chunk_id in call.args[0]['_id']['$in']}
+        self.assertEqual(deleted, {
+            make_chunk_id(paths['loading'], "Load light ULDs first."),
+            make_chunk_id(paths['retired'], "Retired procedure.")
+        })
+        self.assertEqual(summary, {
+            'sources': 3,
+            'sources_removed': 1,
+            'chunks_total': 3,
+            'chunks_unchanged': 1,
+            'chunks_added': 1,
+            'chunks_failed': 1,
+            'chunks_deleted': 2
+        })
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,259 @@
+"""
+Bedrock runtime client wrapper shared by the backend and the Airflow
+operators. backend/app/bedrock_client.py and airflow/plugins/bedrock_client.py
+are identical copies, since each is deployed without the other; change both.
+"""
+import io
+import logging
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Optional
+
+from botocore.config import Config
+from botocore.exceptions import ClientError, ConnectionError, ReadTimeoutError
+
+THROTTLING_ERROR_CODES = ('ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException')
+RETRYABLE_ERROR_CODES = THROTTLING_ERROR_CODES + (
+    'ServiceUnavailableException', 'InternalServerException', 'ModelNotReadyException', 'ModelTimeoutException'
+)
+
+log = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """The call could not complete (or get a concurrency slot) before its deadline"""
+
+
+def client_config(max_pool_connections: int = 50, connect_timeout: float = 2.0,
+                  read_timeout: float = 60.0) -> Config:
+    """
+    botocore Config for the runtime client: a connection pool sized for the
+    limiter's maximum and botocore's own retries disabled, since BedrockClient
+    retries with its own deadlines.
+    """
+    return Config(
+        max_pool_connections=max_pool_connections,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries={'max_attempts': 1, 'mode': 'standard'},
+        tcp_keepalive=True
+    )
+
+
+def error_code(error: Exception) -> Optional[str]:
+    return getattr(error, 'response', {}).get('Error', {}).get('Code')
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: every successful call raises the limit by
+    1 / limit (about +1 per round of calls), a throttle halves it and a call
+    slower than latency_target shrinks it by 10%. Decreases happen at most
+    once per cooldown seconds, so one burst of throttles counts once.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+                 latency_target: Optional[float] = None, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline: Optional[float] = None):
+        """Wait for a slot, until the monotonic deadline"""
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise DeadlineExceeded(f"No Bedrock concurrency slot within deadline (limit {int(self.limit)})")
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: Optional[float] = None, throttled: bool = False):
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self._decrease(0.5)
+            elif latency is not None and self.latency_target and latency > self.latency_target:
+                self._decrease(0.9)
+            elif latency is not None:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def _decrease(self, factor: float):
+        now = time.monotonic()
+        if now - self._decreased_at >= self.cooldown:
+            self.limit = max(self.minimum, self.limit * factor)
+            self._decreased_at = now
+
+
+class BedrockClient:
+    """
+    Drop-in wrapper around a bedrock-runtime client's invoke_model.
+
+    Every attempt holds an AdaptiveLimiter slot. Throttles, 5xx and
+    connection errors are retried with full-jitter exponential backoff
+    until max_attempts or the call's deadline. With hedge_percentile set,
+    calls to hedge_models (idempotent ones such as embeddings) that are
+    still running after that percentile of recent latencies get a second,
+    identical request if the limiter has a free slot, and the first
+    response wins.
+
+    Responses keep the boto3 shape; the body is read inside the wrapper and
+    returned as a file-like object, so callers still use body.read().
+    on_event, if given, is called with 'retries', 'throttles' or 'hedges';
+    on_call with (model id, request body, response, wall time) after every
+    successful call.
+    """
+
+    def __init__(self, client, limiter: Optional[AdaptiveLimiter] = None, max_attempts: int = 4,
+                 base_delay: float = 0.2, max_delay: float = 5.0, deadline: float = 30.0,
+                 hedge_models: Iterable[str] = (), hedge_percentile: Optional[float] = None,
+                 hedge_min_samples: int = 20, on_event: Optional[Callable[[str], None]] = None,
+                 on_call: Optional[Callable[[str, object, Dict, float], None]] = None):
+        self.client = client
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.hedge_models = set(hedge_models)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.on_event = on_event
+        self.on_call = on_call
+        self._latencies = deque(maxlen=500)
+        self._counts: Dict[str, int] = {'calls': 0, 'retries': 0, 'throttles': 0, 'hedges': 0, 'hedge_wins': 0}
+        self._lock = threading.Lock()
+        self._hedge_pool = ThreadPoolExecutor(max_workers=max(2, self.limiter.maximum)) if hedge_percentile else None
+
+    def invoke_model(self, modelId: str, body, deadline: Optional[float] = None,
+                     hedge: Optional[bool] = None, **kwargs) -> Dict:
+        """invoke_model with limiting, retries and optional hedging; deadline in seconds from now"""
+        start = time.monotonic()
+        expires = start + (deadline or self.deadline)
+        self._count('calls')
+        hedge = modelId in self.hedge_models if hedge is None else hedge
+        delay = self._hedge_delay() if hedge else None
+        if delay is None:
+            response = self._call_with_retries(expires, modelId=modelId, body=body, **kwargs)
+        else:
+            response = self._hedged(delay, expires, modelId=modelId, body=body, **kwargs)
+        if self.on_call:
+            # On the caller's thread, so per-request context (contextvars) is visible
+            self.on_call(modelId, body, response, time.monotonic() - start)
+        return response
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+        return {
+            **counts,
+            'concurrency_limit': int(self.limiter.limit),
+            'in_flight': self.limiter.in_flight,
+            'latency_p50_s': self._percentile(latencies, 50),
+            'latency_p99_s': self._percentile(latencies, 99)
+        }
+
+    def __getattr__(self, name):
+        # Everything except invoke_model goes straight to the wrapped client
+        return getattr(self.client, name)
+
+    def _call_with_retries(self, expires: float, **request) -> Dict:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._attempt(expires, **request)
+            except (ClientError, ConnectionError, ReadTimeoutError) as e:
+                retryable = isinstance(e, (ConnectionError, ReadTimeoutError)) or error_code(e) in RETRYABLE_ERROR_CODES
+                backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+                if not retryable or attempt >= self.max_attempts or time.monotonic() + backoff >= expires:
+                    raise
+                self._count('retries')
+                log.warning(f"Bedrock call failed ({error_code(e) or type(e).__name__}), "
+                            f"retry {attempt}/{self.max_attempts - 1} in {backoff:.2f}s")
+                time.sleep(backoff)
+
+    def _attempt(self, expires: float, **request) -> Dict:
+        self.limiter.acquire(expires)
+        return self._send(**request)
+
+    def _send(self, **request) -> Dict:
+        """One request on an already acquired limiter slot, which it releases"""
+        start = time.monotonic()
+        try:
+            response = self.client.invoke_model(**request)
+            response['body'] = io.BytesIO(response['body'].read())
+        except ClientError as e:
+            throttled = error_code(e) in THROTTLING_ERROR_CODES
+            if throttled:
+                self._count('throttles')
+            self.limiter.release(throttled=throttled)
+            raise
+        except Exception:
+            self.limiter.release()
+            raise
+        latency = time.monotonic() - start
+        self.limiter.release(latency=latency)
+        with self._lock:
+            self._latencies.append(latency)
+        return response
+
+    def _hedged(self, delay: float, expires: float, **request) -> Dict:
+        primary = self._hedge_pool.submit(self._call_with_retries, expires, **request)
+        done, _ = wait([primary], timeout=min(delay, max(expires - time.monotonic(), 0)))
+        if done or not self.limiter.try_acquire():
+            return primary.result()
+
+        self._count('hedges')
+        backup = self._hedge_pool.submit(self._send, **request)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, timeout=max(expires - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded("Bedrock call and its hedge both exceeded the deadline")
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count('hedge_wins')
+                    return future.result()
+        # Both failed: surface the primary's error, which went through the retries
+        return primary.result()
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge_percentile:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            return self._percentile(sorted(self._latencies), self.hedge_percentile)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+        if self.on_event and name in ('retries', 'throttles', 'hedges'):
+            self.on_event(name)
+
+    @staticmethod
+    def _percentile(values, p: float) -> Optional[float]:
+        """Nearest-rank percentile of sorted values"""
+        if not values:
+            return None
+        return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
@@ -178,6 +178,51 @@ class DataAPI:
             print(f"Error fetching cargo manifest: {e}")
             return self.get_sample_cargo_by_flight(flight_number)
     
+    def get_waybill(self, waybill_number: str) -> Optional[Dict]:
+        """Get a single cargo manifest entry by waybill number"""
+        if not self.conn:
+            return self.get_sample_waybill(waybill_number)
+            
+        query = """
+        SELECT 
+            flight_number,
+            waybill_number,
+            shipper_name,
+            consignee_name,
+            cargo_description,
+            weight_kg,
+            volume_cubic_m,
+            special_handling,
+            hazardous_material,
+            hazmat_class
+        FROM cargo_manifests
+        WHERE waybill_number = %s
+        LIMIT 1
+        """
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, (waybill_number,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            return {
+                "flight_number": row[0],
+                "waybill_number": row[1],
+                "shipper_name": row[2],
+                "consignee_name": row[3],
+                "cargo_description": row[4],
+                "weight_kg": float(row[5]) if row[5] else 0,
+                "volume_cubic_m": float(row[6]) if row[6] else None,
+                "special_handling": row[7],
+                "hazardous_material": bool(row[8]),
+                "hazmat_class": row[9]
+            }
+        except Exception as e:
+            print(f"Error fetching waybill: {e}")
+            return self.get_sample_waybill(waybill_number)
+    
     def get_sample_flight_data(self) -> List[Dict]:
         """Return sample flight data for fallback"""
         return [
@@ -206,10 +251,36 @@ class DataAPI:
                 "status": "ARRIVED",
                 "aircraft_type": "Airbus A380",
                 "distance_km": 5490
+            },
+            {
+                "flight_number": "FX5101",
+                "airline_code": "FDX",
+                "departure_airport": "MEM",
+                "arrival_airport": "ANC",
+                "scheduled_departure": "2024-01-15T23:00:00",
+                "scheduled_arrival": "2024-01-16T04:30:00",
+                "actual_departure": "2024-01-15T23:10:00",
+                "actual_arrival": "2024-01-16T04:40:00",
+                "status": "ARRIVED",
+                "aircraft_type": "Boeing 767F",
+                "distance_km": 4440
+            },
+            {
+                "flight_number": "5Y800",
+                "airline_code": "GTI",
+                "departure_airport": "ANC",
+                "arrival_airport": "PVG",
+                "scheduled_departure": "2024-01-16T06:00:00",
+                "scheduled_arrival": "2024-01-16T16:30:00",
+                "actual_departure": None,
+                "actual_arrival": None,
+                "status": "SCHEDULED",
+                "aircraft_type": "Boeing 747-400F",
+                "distance_km": 5550
             }
         ]
     
-    def get_sample_cargo_data() -> List[Dict]:
+    def get_sample_cargo_data(self) -> List[Dict]:
         """Return sample cargo data for fallback"""
         return [
             {
@@ -313,6 +384,18 @@ class DataAPI:
 
     def get_sample_cargo_by_flight(self, flight_number: str) -> Dict:
         """Return sample cargo data for a specific flight"""
+        items = [
+            {key: value for key, value in item.items() if key not in ("flight_number", "created_at")}
+            for item in self.get_sample_cargo_data() if item["flight_number"] == flight_number
+        ]
+        if items:
+            return {
+                "flight_number": flight_number,
+                "cargo_items": items,
+                "total_weight_kg": sum(item["weight_kg"] for item in items),
+                "item_count": len(items)
+            }
+
         sample_data = {
             "flight_number": flight_number,
             "cargo_items": [
@@ -330,4 +413,11 @@ class DataAPI:
             "total_weight_kg": 1000.0,
             "item_count": 1
         }
-        return sample_data
\ No newline at end of file
+        return sample_data
+
+    def get_sample_waybill(self, waybill_number: str) -> Optional[Dict]:
+        """Return the sample cargo entry for a waybill, if any"""
+        return next(
+            (item for item in self.get_sample_cargo_data() if item["waybill_number"] == waybill_number),
+            None
+        )
@@ -0,0 +1,185 @@
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain.schema import Document
+
+from lexical_index import BM25Index, extract_identifiers, reciprocal_rank_fusion, tokenize
+from search_filters import FILTER_FIELDS, to_mql
+from vector_search import Rescorer, VectorSearch
+
+# Queries with an identifier and at most this many other terms are answered from the inverted index
+FAST_PATH_MAX_TERMS = 3
+
+
+class HybridRetriever:
+    """
+    BM25 over a locally built inverted index fused with vector search by
+    reciprocal rank fusion.
+
+    Queries that are essentially an exact identifier ("UN3480", "Class 9",
+    a waybill or aircraft type) are answered from the inverted index alone,
+    without an embedding call. The index is built from the collection on
+    first use and rebuilt in the background every refresh_seconds.
+
+    Vector search goes through vector_search, which projects only the text
+    and result fields. With two_stage the vector side runs in two stages:
+    a wide first pass over num_candidates returns only ids and scores, the
+    top rescore_candidates are rescored locally from their stored vectors,
+    recency and category (see Rescorer), and text is fetched only for the
+    final k. num_candidates and rescore_candidates trade recall for latency.
+    """
+
+    def __init__(self, collection, vector_search: VectorSearch, embeddings,
+                 candidates: int = 20, refresh_seconds: int = 300, two_stage: bool = False,
+                 num_candidates: int = 200, rescore_candidates: int = 10,
+                 rescorer: Optional[Rescorer] = None):
+        self.collection = collection
+        self.vector_search = vector_search
+        self.embeddings = embeddings
+        self.text_key = vector_search.text_key
+        self.candidates = candidates
+        self.refresh_seconds = refresh_seconds
+        self.two_stage = two_stage
+        self.num_candidates = num_candidates
+        self.rescore_candidates = rescore_candidates
+        self.rescorer = rescorer or Rescorer()
+        self._index: Optional[BM25Index] = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def retrieve(self, question: str, k: int = 3, conditions: Optional[Dict[str, List]] = None,
+                 min_results: Optional[int] = None) -> Tuple[List[Document], str]:
+        """
+        Top k documents and the retrieval mode used ('identifier' or 'hybrid').
+
+        conditions ({"metadata.<field>": [values]}) are applied before ranking,
+        to the vector search as a pre-filter and to the inverted index. When
+        fewer than min_results (default k) documents pass them, the rest are
+        filled from an unfiltered search and the mode gets an '+unfiltered' suffix.
+        """
+        # Categories asked for still boost rescoring in the unfiltered fallback
+        categories = (conditions or {}).get("metadata.category")
+        # The query is embedded at most once, and not at all on the identifier fast path
+        embedded = {}
+        docs, mode = self._retrieve(question, k, conditions, categories, embedded)
+        if conditions and len(docs) < (min_results or k):
+            seen = {self._doc_key(doc) for doc in docs}
+            fallback, fallback_mode = self._retrieve(question, k, None, categories, embedded)
+            mode = (mode if docs else fallback_mode) + "+unfiltered"
+            docs += [doc for doc in fallback if self._doc_key(doc) not in seen][:k - len(docs)]
+        return docs, mode
+
+    def _retrieve(self, question: str, k: int, conditions: Optional[Dict[str, List]],
+                  categories: Optional[List[str]], embedded: Dict) -> Tuple[List[Document], str]:
+        index = self.index()
+        allowed = index.where(conditions) if conditions else None
+        if allowed is not None and not allowed:
+            return [], "hybrid"
+
+        docs = self._identifier_search(index, question, k, allowed)
+        if docs:
+            return docs, "identifier"
+
+        if "vector" not in embedded:
+            embedded["vector"] = self.embeddings.embed_query(question)
+        vector = embedded["vector"]
+        if self.two_stage:
+            vector_docs = {}
+            vector_ids = {str(doc_id): doc_id for doc_id in self._two_stage_ranking(vector, conditions, categories)}
+        else:
+            vector_hits = self.vector_search.search(
+                vector, limit=self.candidates, num_candidates=self.num_candidates,
+                pre_filter=to_mql(conditions or {})
+            )
+            vector_docs = {str(doc["_id"]): self._document(doc) for doc in vector_hits}
+            vector_ids = {}
+        lexical_ids = {str(doc_id): doc_id for doc_id, _ in index.search(question, k=self.candidates, within=allowed)}
+        raw_ids = {**vector_ids, **lexical_ids}
+
+        fused = reciprocal_rank_fusion([list(vector_docs or vector_ids), list(lexical_ids)])[:k]
+        # Hits without text (lexical ones, and every hit of a two-stage search) are fetched for the final k only
+        fetched = self._fetch([raw_ids[doc_id] for doc_id, _ in fused if doc_id not in vector_docs])
+        docs = [vector_docs.get(doc_id) or fetched.get(doc_id) for doc_id, _ in fused]
+        return [doc for doc in docs if doc is not None], "hybrid"
+
+    def _two_stage_ranking(self, vector: List[float], conditions: Optional[Dict[str, List]],
+                           categories: Optional[List[str]]) -> List:
+        """Vector ranking of ids: ids-only first pass, then the head rescored from stored vectors"""
+        hits = self.vector_search.candidates(
+            vector, limit=self.candidates, num_candidates=self.num_candidates,
+            pre_filter=to_mql(conditions or {})
+        )
+        head = [doc_id for doc_id, _ in hits[:self.rescore_candidates]]
+        stored = self.vector_search.vectors(head, ["metadata.category", "metadata.processed_at"])
+        rescored = self.rescorer.rescore(vector, stored, path=self.vector_search.path, categories=categories)
+        return [doc_id for doc_id, _ in rescored] + [doc_id for doc_id, _ in hits[self.rescore_candidates:]]
+
+    def index(self) -> BM25Index:
+        """The current index, built on first use and refreshed in the background when stale"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._rebuild()
+        elif time.monotonic() - self._built_at > self.refresh_seconds and not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._rebuild, daemon=True).start()
+        return self._index
+
+    def _rebuild(self):
+        try:
+            start = time.monotonic()
+            cursor = self.collection.find({}, {self.text_key: 1, "metadata": 1})
+            index = BM25Index().build(
+                (doc["_id"], doc.get(self.text_key, ""), self._filter_fields(doc)) for doc in cursor
+            )
+            self._index = index
+            self._built_at = time.monotonic()
+            print(f"Built lexical index over {len(index)} chunks in {self._built_at - start:.1f}s")
+        finally:
+            self._refreshing = False
+
+    def _identifier_search(self, index: BM25Index, question: str, k: int,
+                           allowed: Optional[Set[int]] = None) -> List[Document]:
+        identifiers = extract_identifiers(question)
+        if not identifiers:
+            return []
+        other_terms = [
+            token for token in tokenize(question)
+            if not any(token in identifier for identifier in identifiers)
+        ]
+        if len(other_terms) > FAST_PATH_MAX_TERMS:
+            return []
+
+        matched = index.matching(identifiers)
+        if allowed is not None:
+            matched &= allowed
+        if not matched:
+            return []
+        ranked = [doc_id for doc_id, _ in index.search(question, k=k, within=matched)]
+        fetched = self._fetch(ranked)
+        return [fetched[str(doc_id)] for doc_id in ranked if str(doc_id) in fetched]
+
+    def _fetch(self, doc_ids: List) -> Dict[str, Document]:
+        """Load documents by _id (text and result fields only), keyed by str(_id)"""
+        if not doc_ids:
+            return {}
+        cursor = self.collection.find({"_id": {"$in": doc_ids}}, self.vector_search.projection())
+        return {str(doc["_id"]): self._document(doc) for doc in cursor}
+
+    def _document(self, doc: Dict) -> Document:
+        """Stored metadata fields are returned flat, next to _id and the search score"""
+        text = doc.pop(self.text_key, "")
+        metadata = dict(doc.pop("metadata", None) or {})
+        metadata.update(doc, _id=str(doc["_id"]))
+        return Document(page_content=text, metadata=metadata)
+
+    @staticmethod
+    def _filter_fields(doc: Dict) -> Dict:
+        metadata = doc.get("metadata") or {}
+        return {f"metadata.{field}": metadata.get(field) for field in FILTER_FIELDS}
+
+    @staticmethod
+    def _doc_key(doc: Document) -> str:
+        return str(doc.metadata.get("_id"))
@@ -0,0 +1,118 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+# Exact identifiers users search for, indexed as single tokens
+IDENTIFIER_PATTERNS = [
+    re.compile(r"\bclass\s+\d(?:\.\d)?[a-z]?\b"),              # hazmat class: "Class 9", "Class 2.1"
+    re.compile(r"\bun\s?\d{4}\b"),                              # UN number: "UN3480", "UN 1993"
+    re.compile(r"\b(?:a3\d{2}|b?7[0-8]7)(?:-\d{3}[a-z]{0,2})?\b"),  # aircraft type: "A320", "777-300ER"
+    re.compile(r"\b(?=[a-z0-9]*\d)(?=[a-z0-9]*[a-z])[a-z0-9]{4,}\b")  # flight, waybill, registration
+]
+STOPWORDS = {
+    'a', 'an', 'and', 'any', 'are', 'about', 'at', 'be', 'by', 'do', 'does', 'for', 'from', 'how', 'in',
+    'is', 'it', 'me', 'of', 'on', 'or', 'show', 'tell', 'the', 'this', 'to', 'what', 'when', 'where',
+    'which', 'who', 'why', 'with'
+}
+
+
+def extract_identifiers(text: str) -> List[str]:
+    """Normalized identifier tokens in text, e.g. "Class 9" -> "class9", "UN 3480" -> "un3480" """
+    text = text.lower()
+    identifiers = []
+    for pattern in IDENTIFIER_PATTERNS:
+        for match in pattern.finditer(text):
+            identifier = re.sub(r"\s+", "", match.group())
+            if identifier not in identifiers:
+                identifiers.append(identifier)
+    return identifiers
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words without stopwords, plus the identifier tokens"""
+    words = [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+    return words + extract_identifiers(text)
+
+
+class BM25Index:
+    """In-memory inverted index over chunk text with Okapi BM25 scoring"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = []
+        self.doc_lengths = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # field -> value -> positions, for metadata filters
+        self.facets: Dict[str, Dict[object, Set[int]]] = {}
+        self.avg_length = 0.0
+
+    def build(self, documents: Iterable[Tuple[object, str, Dict]]) -> 'BM25Index':
+        """Index (doc id, text, filterable fields) triples"""
+        for doc_id, text, fields in documents:
+            tokens = tokenize(text)
+            position = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self.doc_lengths.append(len(tokens))
+            for token, count in Counter(tokens).items():
+                self.postings.setdefault(token, {})[position] = count
+            for field, value in fields.items():
+                # Like a Mongo filter, an array field matches any of its elements
+                for item in (value if isinstance(value, list) else [value]):
+                    if item is not None:
+                        self.facets.setdefault(field, {}).setdefault(item, set()).add(position)
+        self.avg_length = sum(self.doc_lengths) / len(self.doc_lengths) if self.doc_lengths else 0.0
+        return self
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def matching(self, tokens: Iterable[str]) -> Set[int]:
+        """Positions of the documents containing every token"""
+        matched = None
+        for token in tokens:
+            positions = set(self.postings.get(token, ()))
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                return set()
+        return matched or set()
+
+    def where(self, conditions: Dict[str, List]) -> Set[int]:
+        """Positions of the documents whose fields take one of the allowed values, for every field"""
+        matched = None
+        for field, values in conditions.items():
+            facet = self.facets.get(field, {})
+            positions = set().union(*(facet.get(value, ()) for value in values))
+            matched = positions if matched is None else matched & positions
+            if not matched:
+                return set()
+        return matched if matched is not None else set(range(len(self.doc_ids)))
+
+    def search(self, query: str, k: int = 10, within: Optional[Set[int]] = None) -> List[Tuple[object, float]]:
+        """Top k (doc id, score), optionally restricted to the given positions"""
+        n_docs = len(self.doc_ids)
+        scores: Dict[int, float] = {}
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for position, tf in postings.items():
+                if within is not None and position not in within:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[position] / self.avg_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(self.doc_ids[position], score) for position, score in top]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: each id scores sum(1 / (k + rank)) over the lists it appears in"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -1,8 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from typing import Any, Dict, Optional
 from rag_service import RAGService
 from data_api import DataAPI
+from query_router import QueryRouter
+from query_log import QueryLog
+from answer_store import AnswerStore
 from dotenv import load_dotenv
 import os
 import uvicorn
@@ -30,10 +34,21 @@ app.add_middleware(
 # Initialize services
 rag_service = RAGService()
 data_api = DataAPI()
+query_router = QueryRouter(data_api)
+# Opt-in with QUERY_LOG_DIR; feeds scripts/replay_queries.py
+query_log = QueryLog.from_env()
+# Answers precomputed by the Airflow answer_warming DAG for the current vector-store build
+answer_store = AnswerStore.from_database(rag_service.db, int(os.getenv("ANSWER_STORE_REFRESH_SECONDS", "60")))
 
 class QueryRequest(BaseModel):
     question: str
     context_type: str = "general"
+    # e.g. {"aircraft_type": "B777-300ER", "version": ["2024", "2025"]}
+    filters: Optional[Dict[str, Any]] = None
+    # Add this request's Bedrock calls, tokens and timings to the response
+    include_usage: bool = False
+    # False always computes a fresh answer (the warming DAG sets this)
+    use_answer_cache: bool = True
 
 class TestRequest(BaseModel):
     test_message: str = "Test connection"
@@ -44,14 +59,45 @@ async def root():
 
 @app.post("/query")
 async def query_rag(request: QueryRequest):
+    usage = None
+    status = "ok"
     try:
-        response = rag_service.query(
-            question=request.question,
-            context_type=request.context_type
-        )
+        with rag_service.usage.track("query", request.context_type) as usage:
+            response = None
+            if request.use_answer_cache and not request.filters:
+                response = answer_store.get(request.question, request.context_type)
+                usage.cache = "hit" if response else "miss"
+            # Flight, waybill and cargo lookups are answered from Snowflake without retrieval or a model call
+            if not response:
+                response = query_router.route(request.question)
+            if not response:
+                response = rag_service.query(
+                    question=request.question,
+                    context_type=request.context_type,
+                    filters=request.filters
+                )
+            usage.route = response.get("retrieval")
+        if request.include_usage:
+            response["usage"] = usage.summary()
         return response
+    except ValueError as e:
+        status = "invalid"
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        status = "error"
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Warming requests are not logged, or they would keep their own questions frequent
+        if query_log and usage and request.use_answer_cache:
+            query_log.record({
+                "question": request.question,
+                "context_type": request.context_type,
+                "filters": request.filters,
+                "status": status,
+                "route": usage.route,
+                "cache": usage.cache,
+                "latency_s": round(usage.wall_s, 4)
+            })
 
 @app.get("/flights")
 async def get_flights(flight_number: str = None, date: str = None):
@@ -85,7 +131,8 @@ async def get_cargo_by_flight(flight_number: str):
 async def test_bedrock():
     """Test Bedrock connection"""
     try:
-        test_result = rag_service.test_connection()
+        with rag_service.usage.track("test-bedrock"):
+            test_result = rag_service.test_connection()
         if test_result.get("success"):
             return {"status": "success", "result": test_result.get("result")}
         else:
@@ -95,5 +142,25 @@ async def test_bedrock():
         # str(e)
         raise HTTPException(status_code=500, detail="ERROR: Some error reported to bedrock connection.")
 
+@app.on_event("shutdown")
+def flush_query_log():
+    if query_log:
+        query_log.close()
+
+@app.get("/admin/generation")
+async def generation_stats():
+    """Per model tier call counts, escalations, tokens and latency percentiles"""
+    return rag_service.generator.summary()
+
+@app.get("/admin/usage")
+async def usage_stats():
+    """Rolling token and latency statistics per endpoint, context type, model and prompt size"""
+    return rag_service.usage.stats()
+
+@app.get("/admin/answer-store")
+async def answer_store_stats():
+    """Published vector-store build and precomputed answer hit rate"""
+    return answer_store.stats()
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
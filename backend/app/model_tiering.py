@@ -0,0 +1,150 @@
+import json
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# Words that signal analysis rather than a definition or lookup
+REASONING_TERMS = re.compile(
+    r"\b(compare|comparison|versus|vs|analy[sz]e|analysis|calculate|estimate|evaluate|plan|trade-?offs?|"
+    r"optimi[sz]e|recommend|scenario|step[- ]by[- ]step|impact|differences?|why|justify|prioriti[sz]e)\b"
+)
+# Fast-tier answers containing these are escalated
+UNSURE_ANSWER = re.compile(
+    r"\b(i (?:don't|do not|cannot|can't) (?:know|determine|answer)|not enough (?:information|context)|"
+    r"unable to (?:determine|answer)|i'm not sure|i am not sure)\b"
+)
+MIN_ANSWER_CHARS = 20
+
+
+class ModelTier:
+    def __init__(self, name: str, model_id: str, max_tokens: int):
+        self.name = name
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+
+
+def complexity(question: str, context: str = "") -> int:
+    """Rough local score of how much reasoning a question needs; 0 is a simple factual question"""
+    text = question.lower()
+    score = 0
+    words = len(text.split())
+    score += (words > 25) + (words > 50)
+    score += min(len(set(REASONING_TERMS.findall(text))), 2)
+    score += text.count("?") > 1
+    score += len(re.findall(r"\d+(?:\.\d+)?", text)) >= 3
+    score += len(context) > 6000
+    return score
+
+
+class TierStats:
+    """Rolling per-tier latency and token counts"""
+
+    def __init__(self, window: int = 1000):
+        # escalations: calls this tier received because a fast answer failed validation
+        self.calls = 0
+        self.escalations = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, usage: Dict, escalated: bool = False):
+        with self._lock:
+            self.calls += 1
+            self.escalations += escalated
+            self.input_tokens += usage.get("input_tokens", 0)
+            self.output_tokens += usage.get("output_tokens", 0)
+            self.latencies.append(latency)
+
+    def summary(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            calls = self.calls
+            summary = {
+                "calls": calls,
+                "escalations": self.escalations,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens
+            }
+        summary["avg_output_tokens"] = round(summary["output_tokens"] / calls, 1) if calls else None
+        for p in (50, 95, 99):
+            summary[f"latency_p{p}_s"] = (
+                round(latencies[max(math.ceil(p / 100 * len(latencies)) - 1, 0)], 3) if latencies else None
+            )
+        return summary
+
+
+class TieredGenerator:
+    """
+    Sends each prompt to the fast tier unless the question's complexity
+    reaches the threshold, and escalates a fast answer to the reasoning tier
+    when it fails validation: truncated at max_tokens, too short, or unsure.
+    Without a fast tier every call uses the reasoning tier.
+    """
+
+    def __init__(self, bedrock_client, reasoning: ModelTier, fast: Optional[ModelTier] = None,
+                 threshold: int = 2, temperature: float = 0.1):
+        self.bedrock_client = bedrock_client
+        self.reasoning = reasoning
+        self.fast = fast
+        self.threshold = threshold
+        self.temperature = temperature
+        self.stats = {tier.name: TierStats() for tier in (fast, reasoning) if tier}
+
+    def choose(self, question: str, context: str = "") -> ModelTier:
+        if self.fast is None or complexity(question, context) >= self.threshold:
+            return self.reasoning
+        return self.fast
+
+    def generate(self, prompt: str, question: str, context: str = "") -> Dict:
+        """{"answer", "tier", "model_id", "escalated", "usage", "latency_s"} for the prompt"""
+        tier = self.choose(question, context)
+        result = self._invoke(tier, prompt)
+        if tier is self.fast and not self._valid(result):
+            first = result
+            result = self._invoke(self.reasoning, prompt, escalated=True)
+            result["latency_s"] += first["latency_s"]
+            result["usage"] = {
+                key: result["usage"].get(key, 0) + first["usage"].get(key, 0)
+                for key in set(result["usage"]) | set(first["usage"])
+            }
+        return result
+
+    def summary(self) -> Dict[str, Dict]:
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def _invoke(self, tier: ModelTier, prompt: str, escalated: bool = False) -> Dict:
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": tier.max_tokens,
+            "temperature": self.temperature,
+            "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+        }
+        start = time.monotonic()
+        response = self.bedrock_client.invoke_model(modelId=tier.model_id, body=json.dumps(body))
+        response_body = json.loads(response["body"].read())
+        latency = time.monotonic() - start
+
+        usage = response_body.get("usage", {})
+        self.stats[tier.name].record(latency, usage, escalated)
+        return {
+            "answer": "".join(block.get("text", "") for block in response_body.get("content", [])),
+            "stop_reason": response_body.get("stop_reason"),
+            "tier": tier.name,
+            "model_id": tier.model_id,
+            "escalated": escalated,
+            "usage": usage,
+            "latency_s": latency
+        }
+
+    @staticmethod
+    def _valid(result: Dict) -> bool:
+        answer = result["answer"].strip()
+        return (
+            result["stop_reason"] != "max_tokens"
+            and len(answer) >= MIN_ANSWER_CHARS
+            and not UNSURE_ANSWER.search(answer.lower())
+        )
@@ -0,0 +1,34 @@
+import os
+import threading
+from typing import Optional
+
+from pymongo import MongoClient
+
+_client: Optional[MongoClient] = None
+_lock = threading.Lock()
+
+
+def get_client() -> MongoClient:
+    """
+    The process-wide MongoClient. MongoClient is thread-safe and pools its
+    own connections, so every service shares this one instead of opening
+    its own pool. Pool and timeout settings come from the environment.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = MongoClient(
+                    os.getenv("MONGODB_URI"),
+                    appname="aviation-backend",
+                    maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+                    minPoolSize=int(os.getenv("MONGODB_MIN_POOL_SIZE", "5")),
+                    maxIdleTimeMS=int(os.getenv("MONGODB_MAX_IDLE_MS", "300000")),
+                    waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+                    connectTimeoutMS=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000")),
+                    serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+                    socketTimeoutMS=int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "10000")),
+                    compressors=os.getenv("MONGODB_COMPRESSORS", "zstd,snappy,zlib"),
+                    retryReads=True
+                )
+    return _client
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional
+
+# PII redacted from logged questions; flight numbers, waybills and UN numbers are kept
+PII_PATTERNS = [
+    (re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.-]+\b"), "<email>"),
+    (re.compile(r"\b(?:\d[ -]?){13,19}\b"), "<card>"),
+    (re.compile(r"(?<![\w-])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)[\s.-]?)?\d{3,4}[\s.-]\d{3,4}(?:[\s.-]\d{3,4})?(?![\w-])"),
+     "<phone>"),
+    # Passport numbers; a carrier prefix with 8 or more digits is a waybill (query_router.WAYBILL_PATTERN)
+    (re.compile(r"\b(?![A-Z\d]{2}\d{8})[A-Z]{1,2}\d{6,9}\b"), "<document_id>"),
+    (re.compile(r"\b(?:\d{1,3}\.){3}\d{1,3}\b"), "<ip>")
+]
+
+
+def redact(text: str) -> str:
+    for pattern, replacement in PII_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class QueryLog:
+    """
+    Opt-in sampled log of /query traffic for replay (scripts/replay_queries.py).
+
+    record() only samples and appends to a bounded in-memory ring buffer,
+    so the request path never touches the disk; when the buffer is full the
+    oldest entries are dropped and counted. A background thread redacts
+    and flushes the buffer every flush_interval seconds to
+    <log_dir>/queries.jsonl, rotated at max_bytes with `backups` old files.
+    """
+
+    def __init__(self, log_dir: str, sample_rate: float = 1.0, capacity: int = 10000,
+                 flush_interval: float = 2.0, max_bytes: int = 50 * 1024 * 1024, backups: int = 10):
+        os.makedirs(log_dir, exist_ok=True)
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._buffer = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+        handler = RotatingFileHandler(
+            os.path.join(log_dir, "queries.jsonl"), maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger = logging.getLogger(f"query_log.{log_dir}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(handler)
+
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="query-log-flush", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls) -> Optional["QueryLog"]:
+        """A QueryLog when QUERY_LOG_DIR is set, else None"""
+        log_dir = os.getenv("QUERY_LOG_DIR")
+        if not log_dir:
+            return None
+        return cls(
+            log_dir,
+            sample_rate=float(os.getenv("QUERY_LOG_SAMPLE_RATE", "1.0")),
+            capacity=int(os.getenv("QUERY_LOG_BUFFER", "10000")),
+            max_bytes=int(os.getenv("QUERY_LOG_MAX_MB", "50")) * 1024 * 1024,
+            backups=int(os.getenv("QUERY_LOG_BACKUPS", "10"))
+        )
+
+    def record(self, entry: Dict):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        entry.setdefault("ts", time.time())
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(entry)
+
+    def flush(self):
+        with self._lock:
+            entries = list(self._buffer)
+            self._buffer.clear()
+        for entry in entries:
+            entry["question"] = redact(entry.get("question", ""))
+            self._logger.info(json.dumps(entry, default=str))
+
+    def close(self):
+        self._stopped.set()
+        self._thread.join()
+        self.flush()
+        for handler in self._logger.handlers:
+            handler.close()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Query log flush failed: {e}")
@@ -0,0 +1,194 @@
+import re
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+# Airline designator (two letters, or a letter and a digit) followed by the flight or waybill serial
+FLIGHT_PATTERN = re.compile(r"\b((?:[A-Z]{2}|[A-Z]\d|\d[A-Z])\d{1,4})\b", re.IGNORECASE)
+WAYBILL_PATTERN = re.compile(r"\b((?:[A-Z]{2}|[A-Z]\d|\d[A-Z])\d{8,11})\b", re.IGNORECASE)
+# Tokens shaped like a flight number that are not one: UN numbers, aircraft types
+# (A220/A3xx, B7x7, Q400, E1xx, MD11, DC10, AN124, IL76), ULD types, CO2/NO2/SO2, years
+NOT_A_FLIGHT = re.compile(
+    r"^(?:UN\d{4}|A[23]\d{2}|B?7[0-8]7|Q[1-4]00|E1[4-9]\d|MD\d{2}|DC\d{1,2}|AN\d{2,3}|IL\d{2}|"
+    r"LD\d{1,2}|[CNS]O2|[A-Z]{2}20\d{2})$",
+    re.IGNORECASE
+)
+DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+
+# Intent -> keywords, checked in order; the first intent with a keyword in the question wins
+INTENTS = [
+    ("hazmat", ["hazmat", "hazardous", "dangerous goods", "dangerous", "lithium", "un number"]),
+    ("cargo_weight", ["weight", "weigh", "heavy", "how much cargo", "kg", "tonnes"]),
+    ("cargo", ["cargo", "manifest", "shipment", "shipments", "freight", "items", "waybills"]),
+    ("status", ["status", "delayed", "delay", "late", "on time", "depart", "arrive", "arrival",
+                "departure", "landed", "cancelled", "where is", "when"])
+]
+# Questions asking for reasoning or policy go to the LLM even when they mention a flight
+OPEN_ENDED = ["why", "explain", "should", "could", "regulation", "procedure", "requirement",
+              "allowed", "can i", "how do", "how to", "what if"]
+
+
+class QueryRouter:
+    """
+    Answers lookup questions ("status of UA901", "total cargo weight on
+    5Y800", "any hazmat on BA117", "waybill FX7894561230") straight from
+    DataAPI with templated answers, without retrieval or a model call.
+
+    route returns None for anything else, which is then sent to RAGService,
+    including lookups that find no such flight or waybill: the token was
+    probably not an identifier.
+    """
+
+    def __init__(self, data_api):
+        self.data_api = data_api
+
+    def route(self, question: str) -> Optional[Dict[str, Any]]:
+        start = time.perf_counter()
+        text = question.lower()
+        if any(marker in text for marker in OPEN_ENDED):
+            return None
+
+        waybill = self._match(WAYBILL_PATTERN, question)
+        if waybill:
+            return self._waybill(question, waybill, start)
+
+        flight_number = self._flight_number(question)
+        if not flight_number:
+            return None
+        intent = next((name for name, keywords in INTENTS if any(k in text for k in keywords)), None)
+        if intent is None:
+            return None
+
+        flights = self._flights(flight_number, self._date(question) if intent == "status" else None)
+        if not flights:
+            return None
+
+        if intent == "status":
+            answer, data = self._status(flight_number, flights)
+        else:
+            manifest = self.data_api.get_cargo_manifest(flight_number)
+            answer = getattr(self, f"_{intent}")(flight_number, manifest)
+            data = manifest
+        return self._response(question, intent, answer, data, start)
+
+    def _flights(self, flight_number: str, flight_date: Optional[str]) -> List[Dict]:
+        return [
+            flight for flight in self.data_api.get_flight_data(flight_number, flight_date)
+            if flight["flight_number"].upper() == flight_number
+        ]
+
+    def _status(self, flight_number: str, flights: List[Dict]):
+        flight = self._current(flights)
+        departure = flight["actual_departure"] or flight["scheduled_departure"]
+        arrival = flight["actual_arrival"] or flight["scheduled_arrival"]
+        answer = (
+            f"Flight {flight_number} ({flight['departure_airport']} → {flight['arrival_airport']}, "
+            f"{flight['aircraft_type']}) is {flight['status']}. "
+            f"Departure {self._time(departure)}, arrival {self._time(arrival)}"
+        )
+        delay = self._delay_minutes(flight["scheduled_departure"], flight["actual_departure"])
+        if delay and delay > 0:
+            answer += f", departed {delay} minutes late"
+        return answer + ".", flight
+
+    def _cargo_weight(self, flight_number: str, manifest: Dict) -> str:
+        if not manifest["item_count"]:
+            return f"No cargo is manifested on {flight_number}."
+        return (
+            f"Flight {flight_number} carries {manifest['total_weight_kg']:,.1f} kg of cargo "
+            f"across {self._waybills(manifest['item_count'])}."
+        )
+
+    def _cargo(self, flight_number: str, manifest: Dict) -> str:
+        if not manifest["item_count"]:
+            return f"No cargo is manifested on {flight_number}."
+        lines = [
+            f"- {item['waybill_number']}: {item['cargo_description']} ({item['weight_kg']:,.1f} kg"
+            + (f", {item['special_handling']}" if item.get("special_handling") else "") + ")"
+            for item in manifest["cargo_items"][:10]
+        ]
+        more = manifest["item_count"] - len(lines)
+        if more > 0:
+            lines.append(f"- ... and {more} more")
+        return (
+            f"Flight {flight_number} has {self._waybills(manifest['item_count'])}, "
+            f"{manifest['total_weight_kg']:,.1f} kg in total:\n" + "\n".join(lines)
+        )
+
+    def _hazmat(self, flight_number: str, manifest: Dict) -> str:
+        hazmat = [item for item in manifest["cargo_items"] if item.get("hazardous_material")]
+        if not hazmat:
+            return f"No hazardous materials are manifested on {flight_number}."
+        lines = [
+            f"- {item['waybill_number']}: {item['cargo_description']} "
+            f"({item.get('hazmat_class') or 'class not recorded'}, {item['weight_kg']:,.1f} kg)"
+            for item in hazmat
+        ]
+        shipments = "shipment" if len(hazmat) == 1 else "shipments"
+        return f"Flight {flight_number} carries {len(hazmat)} hazmat {shipments}:\n" + "\n".join(lines)
+
+    def _waybill(self, question: str, waybill: str, start: float) -> Optional[Dict[str, Any]]:
+        item = self.data_api.get_waybill(waybill)
+        if not item:
+            return None
+        answer = (
+            f"Waybill {waybill} on flight {item['flight_number']}: {item['cargo_description']}, "
+            f"{item['weight_kg']:,.1f} kg, from {item['shipper_name']} to {item['consignee_name']}"
+        )
+        if item.get("hazardous_material"):
+            answer += f". Hazardous material ({item.get('hazmat_class') or 'class not recorded'})"
+        elif item.get("special_handling"):
+            answer += f". Handling: {item['special_handling']}"
+        return self._response(question, "waybill", answer.rstrip(".") + ".", item, start)
+
+    @staticmethod
+    def _response(question: str, intent: str, answer: str, data: Any, start: float) -> Dict[str, Any]:
+        """Same shape as RAGService.query, with the looked-up record under "data" """
+        return {
+            "answer": answer,
+            "source_documents": [],
+            "question": question,
+            "retrieval": f"structured:{intent}",
+            "data": data,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+
+    @staticmethod
+    def _waybills(count: int) -> str:
+        return f"{count} waybill" if count == 1 else f"{count} waybills"
+
+    @staticmethod
+    def _match(pattern, question: str) -> Optional[str]:
+        match = pattern.search(question)
+        return match.group(1).upper() if match else None
+
+    @staticmethod
+    def _flight_number(question: str) -> Optional[str]:
+        for match in FLIGHT_PATTERN.finditer(question):
+            if not NOT_A_FLIGHT.match(match.group(1)):
+                return match.group(1).upper()
+        return None
+
+    @staticmethod
+    def _date(question: str) -> Optional[str]:
+        if "today" in question.lower():
+            return date.today().isoformat()
+        match = DATE_PATTERN.search(question)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _current(flights: List[Dict]) -> Dict:
+        """The latest departure that is not in the future, else the earliest one"""
+        now = datetime.now().isoformat()
+        departed = [f for f in flights if f["scheduled_departure"] and f["scheduled_departure"] <= now]
+        return departed[-1] if departed else flights[0]
+
+    @staticmethod
+    def _time(value: Optional[str]) -> str:
+        return value.replace("T", " ")[:16] if value else "not recorded"
+
+    @staticmethod
+    def _delay_minutes(scheduled: Optional[str], actual: Optional[str]) -> Optional[int]:
+        if not scheduled or not actual:
+            return None
+        return int((datetime.fromisoformat(actual) - datetime.fromisoformat(scheduled)).total_seconds() // 60)
@@ -1,13 +1,20 @@
 import os
 import boto3
-from pymongo import MongoClient
 from langchain_aws.embeddings import BedrockEmbeddings
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain.schema import Document
 from dotenv import load_dotenv
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
+
+from hybrid_retriever import HybridRetriever
+from search_filters import build_conditions
+from vector_search import RESULT_FIELDS, VectorSearch
+from mongo_pool import get_client
+from bedrock_client import AdaptiveLimiter, BedrockClient, client_config
+from model_tiering import ModelTier, TieredGenerator
+from usage_accounting import UsageTracker
 load_dotenv()
 
 # TODO: logging and metrics collection
@@ -18,14 +25,46 @@ class RAGService:
         self.setup_vector_store()
     
     def setup_clients(self):
-        self.bedrock_runtime = boto3.client(
+        runtime = boto3.client(
             'bedrock-runtime',
             region_name=os.getenv('AWS_REGION'),
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+            config=client_config(
+                max_pool_connections=int(os.getenv('BEDROCK_MAX_POOL_CONNECTIONS', '50')),
+                connect_timeout=float(os.getenv('BEDROCK_CONNECT_TIMEOUT', '2')),
+                read_timeout=float(os.getenv('BEDROCK_READ_TIMEOUT', '60'))
+            )
+        )
+        # Token and latency accounting for every Bedrock call, per request
+        self.usage = UsageTracker(embedding_models=[os.getenv('TEXT_EMBEDDING_MODEL')])
+        # Adaptive concurrency, jittered retries with deadlines, and hedged embedding calls
+        latency_target = os.getenv('BEDROCK_LATENCY_TARGET_SECONDS')
+        hedge_percentile = os.getenv('BEDROCK_HEDGE_PERCENTILE')
+        self.bedrock_runtime = BedrockClient(
+            runtime,
+            limiter=AdaptiveLimiter(
+                initial=int(os.getenv('BEDROCK_INITIAL_CONCURRENCY', '4')),
+                maximum=int(os.getenv('BEDROCK_MAX_CONCURRENCY', '32')),
+                latency_target=float(latency_target) if latency_target else None
+            ),
+            max_attempts=int(os.getenv('BEDROCK_MAX_ATTEMPTS', '4')),
+            deadline=float(os.getenv('BEDROCK_DEADLINE_SECONDS', '30')),
+            hedge_models=[os.getenv('TEXT_EMBEDDING_MODEL')],
+            hedge_percentile=float(hedge_percentile) if hedge_percentile else None,
+            on_call=self.usage.record_call
+        )
+        # Fast model for simple questions, escalating to the reasoning model when its answer fails validation
+        fast_model = os.getenv('FAST_MODEL')
+        self.generator = TieredGenerator(
+            self.bedrock_runtime,
+            reasoning=ModelTier('reasoning', os.getenv('REASONING_MODEL'),
+                                int(os.getenv('REASONING_MAX_TOKENS', '1000'))),
+            fast=ModelTier('fast', fast_model, int(os.getenv('FAST_MAX_TOKENS', '400'))) if fast_model else None,
+            threshold=int(os.getenv('REASONING_COMPLEXITY_THRESHOLD', '2'))
         )
         
-        self.mongo_client = MongoClient(os.getenv('MONGODB_URI'))
+        self.mongo_client = get_client()
         self.db = self.mongo_client['aviation_db']
         self.collection = self.db['aviation_docs']
     
@@ -42,13 +81,31 @@ class RAGService:
             text_key="text"
         )
         
-        self.retriever = self.vector_store.as_retriever(
-            search_type="similarity",
-            search_kwargs={"k": 3}
+        # Retrieval builds its own $vectorSearch pipelines, projecting only text, the
+        # result fields and the score; the LangChain store is kept for writes
+        fields = os.getenv("VECTOR_SEARCH_FIELDS")
+        self.vector_search = VectorSearch(
+            self.collection, "aviation_vector_index", text_key="text",
+            fields=fields.split(",") if fields else RESULT_FIELDS
+        )
+        # VECTOR_SEARCH_MODE=two_stage: ids-only first pass, local rescoring, text for the final k only
+        self.hybrid_retriever = HybridRetriever(
+            collection=self.collection,
+            vector_search=self.vector_search,
+            embeddings=self.embeddings,
+            candidates=int(os.getenv("VECTOR_SEARCH_LIMIT", "20")),
+            refresh_seconds=int(os.getenv("LEXICAL_INDEX_REFRESH_SECONDS", "300")),
+            two_stage=os.getenv("VECTOR_SEARCH_MODE", "single") == "two_stage",
+            num_candidates=int(os.getenv("VECTOR_NUM_CANDIDATES", "200")),
+            rescore_candidates=int(os.getenv("VECTOR_RESCORE_CANDIDATES", "10"))
         )
     
     def ask_claude(self, question: str, context: str = "") -> str:
         """Simple method to ask Claude a question with context"""
+        return self.generate_answer(question, context)["answer"]
+
+    def generate_answer(self, question: str, context: str = "") -> Dict[str, Any]:
+        """Answer with the model tier used, its token usage and latency"""
         try:
             # prompt
             if context:
@@ -59,46 +116,31 @@ Answer:"""
             else:
                 prompt = f"Question: {question}\n\nAnswer:"
             
-            messages = [
-                {
-                    "role": "user",
-                    "content": [{"type": "text", "text": prompt}]
-                }
-            ]
-            
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 500,
-                "temperature": 0.1,
-                "messages": messages
-            }
-            
-            response = self.bedrock_runtime.invoke_model(
-                modelId=os.getenv("REASONING_MODEL"),
-                body=json.dumps(body)
-            )
-            
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text']
+            return self.generator.generate(prompt, question, context)
             
         except Exception as e:
-            return f"Error: {str(e)}"
+            return {"answer": f"Error: {str(e)}", "tier": None, "usage": {}}
     
-    def query(self, question: str, context_type: str = "general") -> Dict[str, Any]:
-        """Main query method"""
+    def query(self, question: str, context_type: str = "general",
+              filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Main query method; context_type and filters restrict the documents searched"""
+        conditions = build_conditions(context_type, filters)
         try:
-            docs = self.retriever.invoke(question)
-            answer = self.ask_claude(question, context_type)
+            docs, retrieval = self.hybrid_retriever.retrieve(question, k=3, conditions=conditions)
+            context = "\n\n".join(doc.page_content for doc in docs)
+            generation = self.generate_answer(question, context)
             
             return {
-                "answer": answer,
+                "answer": generation["answer"],
                 "source_documents": [
                     {
                         "content": doc.page_content,
                         "metadata": doc.metadata
                     } for doc in docs
                 ],
-                "question": question
+                "question": question,
+                "retrieval": retrieval,
+                "model_tier": generation["tier"]
             }
             
         except Exception as e:
@@ -108,11 +150,13 @@ Answer:"""
                 "question": question
             }
     
-    def add_documents(self, documents: List[Dict]):
-        """Add documents to the vector store"""
-        docs = [Document(page_content=doc["text"], metadata=doc["metadata"]) 
+    def add_documents(self, documents: List[Dict], ids: Optional[List[str]] = None) -> List[str]:
+        """Add documents to the vector store; re-adding the same ids replaces them"""
+        # Metadata is stored under "metadata", as the Airflow pipeline does, so the
+        # vector index filter fields (metadata.category, ...) apply to both
+        docs = [Document(page_content=doc["text"], metadata={"metadata": doc["metadata"]})
                 for doc in documents]
-        self.vector_store.add_documents(docs)
+        return self.vector_store.add_documents(docs, ids=ids)
 
     def test_connection(self) -> Dict[str, Any]:
         """Test Bedrock connection directly"""
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+
+# Categories categorize() and the Airflow document operators assign from file names
+DOCUMENT_CATEGORIES = ("regulations", "maintenance", "cargo", "safety", "general")
+# Categories of the built-in sample documents in scripts/setup_vectors.py
+SAMPLE_CATEGORIES = ("dangerous_goods", "loading", "operations", "security", "safety")
+# Safety and uncategorized documents can answer any kind of question, so every context keeps them
+SHARED_CATEGORIES = ["safety", "general"]
+# Document categories searched for each QueryRequest.context_type ("general" searches everything)
+CONTEXT_CATEGORIES = {
+    "cargo": ["cargo", "loading", "dangerous_goods", "security", "operations"] + SHARED_CATEGORIES,
+    "maintenance": ["maintenance", "operations"] + SHARED_CATEGORIES,
+    "regulations": ["regulations", "dangerous_goods", "security"] + SHARED_CATEGORIES
+}
+# Explicit filters accepted by /query; each one must be a filter field of the vector index
+FILTER_FIELDS = ("category", "aircraft_type", "version", "doc_type", "source")
+
+
+def categorize(filename: str) -> str:
+    """Category from filename keywords, as the Airflow document operators assign it"""
+    filename = filename.lower()
+    if 'regulation' in filename or 'iata' in filename:
+        return 'regulations'
+    elif 'maintenance' in filename or 'procedure' in filename:
+        return 'maintenance'
+    elif 'cargo' in filename or 'loading' in filename:
+        return 'cargo'
+    elif 'safety' in filename:
+        return 'safety'
+    return 'general'
+
+
+def build_conditions(context_type: str = "general", filters: Optional[Dict[str, Any]] = None) -> Dict[str, List]:
+    """
+    Conditions as {"metadata.<field>": [allowed values]} for a context type and
+    explicit filters; empty when nothing narrows the search.
+    """
+    conditions = {}
+    if context_type in CONTEXT_CATEGORIES:
+        conditions["metadata.category"] = list(CONTEXT_CATEGORIES[context_type])
+
+    for field, value in (filters or {}).items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unsupported filter '{field}', expected one of {', '.join(FILTER_FIELDS)}")
+        values = value if isinstance(value, list) else [value]
+        path = f"metadata.{field}"
+        # An explicit category narrows the context type's categories rather than widening them
+        if path in conditions:
+            values = [v for v in values if v in conditions[path]] or values
+        conditions[path] = values
+    return conditions
+
+
+def to_mql(conditions: Dict[str, List]) -> Optional[Dict]:
+    """Conditions as a $vectorSearch / find filter"""
+    if not conditions:
+        return None
+    clauses = [
+        {path: {"$in": values}} if len(values) > 1 else {path: {"$eq": values[0]}}
+        for path, values in conditions.items()
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
@@ -0,0 +1,178 @@
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Bedrock reports token counts and model latency in response headers for every model
+INPUT_TOKENS_HEADER = "x-amzn-bedrock-input-token-count"
+OUTPUT_TOKENS_HEADER = "x-amzn-bedrock-output-token-count"
+LATENCY_HEADER = "x-amzn-bedrock-invocation-latency"
+# Upper bounds (input tokens) of the prompt-size buckets generation latency is reported by
+PROMPT_BUCKETS = (500, 1000, 2000, 4000, 8000)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("request_usage", default=None)
+
+
+def _percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[max(math.ceil(p / 100 * len(values)) - 1, 0)], 4)
+
+
+class RequestUsage:
+    """Bedrock calls made while serving one request"""
+
+    def __init__(self, endpoint: str, context_type: Optional[str] = None):
+        self.endpoint = endpoint
+        self.context_type = context_type
+        self.calls: List[Dict] = []
+        self.started = time.monotonic()
+        self.wall_s: Optional[float] = None
+        # How the request was answered (retrieval mode or structured route) and answer-cache status
+        self.route: Optional[str] = None
+        self.cache: Optional[str] = None
+
+    def add(self, call: Dict):
+        self.calls.append(call)
+
+    def summary(self) -> Dict:
+        generation = [call for call in self.calls if call["kind"] == "generation"]
+        embedding = [call for call in self.calls if call["kind"] == "embedding"]
+        return {
+            "endpoint": self.endpoint,
+            "context_type": self.context_type,
+            "wall_s": round(self.wall_s if self.wall_s is not None else time.monotonic() - self.started, 4),
+            "route": self.route,
+            "cache": self.cache,
+            "llm_calls": len(generation),
+            "embedding_calls": len(embedding),
+            "input_tokens": sum(call["input_tokens"] for call in generation),
+            "output_tokens": sum(call["output_tokens"] for call in generation),
+            "embedding_tokens": sum(call["input_tokens"] for call in embedding),
+            "llm_wall_s": round(sum(call["wall_s"] for call in generation), 4),
+            "embedding_wall_s": round(sum(call["wall_s"] for call in embedding), 4),
+            "calls": self.calls
+        }
+
+
+class UsageTracker:
+    """
+    Per-request token and latency accounting for Bedrock calls.
+
+    record_call is BedrockClient's on_call hook: each call is attributed to
+    the request opened by track() in the same context. Finished requests go
+    into a rolling window that stats() aggregates per endpoint, per
+    context_type, per model and by prompt size.
+    """
+
+    def __init__(self, embedding_models: List[str] = (), window: int = 2000):
+        self.embedding_models = set(embedding_models)
+        self._requests = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, endpoint: str, context_type: Optional[str] = None) -> Iterator[RequestUsage]:
+        usage = RequestUsage(endpoint, context_type)
+        token = _current.set(usage)
+        try:
+            yield usage
+        finally:
+            _current.reset(token)
+            usage.wall_s = time.monotonic() - usage.started
+            with self._lock:
+                self._requests.append(usage.summary())
+
+    def record_call(self, model_id: str, body, response: Dict, wall_s: float):
+        usage = _current.get()
+        if usage is None:
+            return
+        headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+        usage.add({
+            "kind": "embedding" if model_id in self.embedding_models else "generation",
+            "model_id": model_id,
+            "prompt_chars": len(body) if isinstance(body, (str, bytes)) else None,
+            "input_tokens": int(headers.get(INPUT_TOKENS_HEADER, 0)),
+            "output_tokens": int(headers.get(OUTPUT_TOKENS_HEADER, 0)),
+            "model_latency_ms": int(headers[LATENCY_HEADER]) if LATENCY_HEADER in headers else None,
+            "wall_s": round(wall_s, 4)
+        })
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = list(self._requests)
+        calls = [call for request in requests for call in request["calls"]]
+        return {
+            "window_requests": len(requests),
+            "by_endpoint": self._group(requests, "endpoint"),
+            "by_context_type": self._group(
+                [request for request in requests if request["context_type"]], "context_type"
+            ),
+            "by_model": self._by_model(calls),
+            "generation_by_prompt_tokens": self._by_prompt_size(
+                [call for call in calls if call["kind"] == "generation"]
+            )
+        }
+
+    @staticmethod
+    def _group(requests: List[Dict], key: str) -> Dict[str, Dict]:
+        groups: Dict[str, List[Dict]] = {}
+        for request in requests:
+            groups.setdefault(request[key], []).append(request)
+        return {
+            name: {
+                "requests": len(group),
+                "cache_hits": sum(1 for request in group if request["cache"] == "hit"),
+                "input_tokens": sum(request["input_tokens"] for request in group),
+                "output_tokens": sum(request["output_tokens"] for request in group),
+                "embedding_tokens": sum(request["embedding_tokens"] for request in group),
+                "avg_input_tokens": round(sum(request["input_tokens"] for request in group) / len(group), 1),
+                "avg_output_tokens": round(sum(request["output_tokens"] for request in group) / len(group), 1),
+                "latency_p50_s": _percentile([request["wall_s"] for request in group], 50),
+                "latency_p95_s": _percentile([request["wall_s"] for request in group], 95),
+                "llm_share_of_latency": round(
+                    sum(request["llm_wall_s"] for request in group) / max(sum(request["wall_s"] for request in group), 1e-9), 3
+                )
+            }
+            for name, group in groups.items()
+        }
+
+    @staticmethod
+    def _by_model(calls: List[Dict]) -> Dict[str, Dict]:
+        models: Dict[str, List[Dict]] = {}
+        for call in calls:
+            models.setdefault(call["model_id"], []).append(call)
+        return {
+            model_id: {
+                "calls": len(group),
+                "input_tokens": sum(call["input_tokens"] for call in group),
+                "output_tokens": sum(call["output_tokens"] for call in group),
+                "wall_p50_s": _percentile([call["wall_s"] for call in group], 50),
+                "wall_p95_s": _percentile([call["wall_s"] for call in group], 95)
+            }
+            for model_id, group in models.items()
+        }
+
+    @staticmethod
+    def _by_prompt_size(calls: List[Dict]) -> Dict[str, Dict]:
+        """Generation latency and output per input-token bucket, to see how time scales with prompt size"""
+        buckets: Dict[str, List[Dict]] = {}
+        for call in calls:
+            bound = next((bound for bound in PROMPT_BUCKETS if call["input_tokens"] < bound), None)
+            buckets.setdefault(f"<{bound}" if bound else f">={PROMPT_BUCKETS[-1]}", []).append(call)
+        return {
+            name: {
+                "calls": len(group),
+                "wall_p50_s": _percentile([call["wall_s"] for call in group], 50),
+                "avg_output_tokens": round(sum(call["output_tokens"] for call in group) / len(group), 1)
+            }
+            for name, group in buckets.items()
+        }
+
+
+def current_usage() -> Optional[RequestUsage]:
+    """The request being tracked in this context, if any"""
+    return _current.get()
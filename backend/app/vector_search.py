@@ -0,0 +1,112 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Metadata returned with each hit; everything else, the embedding included, stays in Atlas
+RESULT_FIELDS = [
+    "metadata.category", "metadata.source", "metadata.filename", "metadata.doc_type",
+    "metadata.aircraft_type", "metadata.version", "metadata.page_start", "metadata.page_end"
+]
+
+
+class VectorSearch:
+    """
+    $vectorSearch aggregations run directly against the collection, so each
+    caller decides which fields come back over the wire.
+    """
+
+    def __init__(self, collection, index_name: str, path: str = "embedding",
+                 text_key: str = "text", fields: Optional[List[str]] = None):
+        self.collection = collection
+        self.index_name = index_name
+        self.path = path
+        self.text_key = text_key
+        self.fields = fields or RESULT_FIELDS
+
+    def search(self, vector: List[float], limit: int, num_candidates: int,
+               pre_filter: Optional[Dict] = None) -> List[Dict]:
+        """The nearest limit documents with only text, the result fields and "score" """
+        pipeline = [
+            {"$vectorSearch": self._stage(vector, limit, num_candidates, pre_filter)},
+            {"$project": {**self.projection(), "score": {"$meta": "vectorSearchScore"}}}
+        ]
+        return list(self.collection.aggregate(pipeline))
+
+    def projection(self) -> Dict[str, int]:
+        """Projection of text and the result fields, for fetching documents by id"""
+        return {self.text_key: 1, **{field: 1 for field in self.fields}}
+
+    def candidates(self, vector: List[float], limit: int, num_candidates: int,
+                   pre_filter: Optional[Dict] = None) -> List[Tuple[object, float]]:
+        """(id, score) of the nearest limit documents, without text, metadata or embeddings"""
+        pipeline = [
+            {"$vectorSearch": self._stage(vector, limit, num_candidates, pre_filter)},
+            {"$project": {"_id": 1, "score": {"$meta": "vectorSearchScore"}}}
+        ]
+        return [(doc["_id"], doc["score"]) for doc in self.collection.aggregate(pipeline)]
+
+    def vectors(self, doc_ids: List, fields: List[str]) -> Dict[object, Dict]:
+        """Stored embeddings plus the given (dotted) fields for a handful of ids, keyed by _id"""
+        projection = {self.path: 1, **{field: 1 for field in fields}}
+        return {doc["_id"]: doc for doc in self.collection.find({"_id": {"$in": doc_ids}}, projection)}
+
+    def _stage(self, vector: List[float], limit: int, num_candidates: int, pre_filter: Optional[Dict]) -> Dict:
+        stage = {
+            "index": self.index_name,
+            "path": self.path,
+            "queryVector": vector,
+            "numCandidates": max(num_candidates, limit),
+            "limit": limit
+        }
+        if pre_filter:
+            stage["filter"] = pre_filter
+        return stage
+
+
+class Rescorer:
+    """
+    Second stage of two-stage retrieval: exact cosine similarity against the
+    stored full-precision vectors, plus small boosts for recent documents and
+    for documents in the categories the question is about.
+    """
+
+    def __init__(self, recency_weight: float = 0.05, category_weight: float = 0.05,
+                 half_life_days: float = 365.0):
+        self.recency_weight = recency_weight
+        self.category_weight = category_weight
+        self.half_life_days = half_life_days
+
+    def rescore(self, vector: List[float], docs: Dict[object, Dict], path: str = "embedding",
+                categories: Optional[List[str]] = None) -> List[Tuple[object, float]]:
+        """(id, score) for the docs that have an embedding, best first"""
+        doc_ids = [doc_id for doc_id, doc in docs.items() if doc.get(path)]
+        if not doc_ids:
+            return []
+        matrix = np.asarray([docs[doc_id][path] for doc_id in doc_ids], dtype=np.float32)
+        query = np.asarray(vector, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        similarity = matrix @ query / np.where(norms == 0, 1, norms)
+
+        now = datetime.now(timezone.utc)
+        scores = []
+        for doc_id, score in zip(doc_ids, similarity.tolist()):
+            metadata = docs[doc_id].get("metadata") or {}
+            score += self.recency_weight * self._recency(metadata.get("processed_at"), now)
+            if categories and metadata.get("category") in categories:
+                score += self.category_weight
+            scores.append((doc_id, score))
+        return sorted(scores, key=lambda item: item[1], reverse=True)
+
+    def _recency(self, processed_at, now: datetime) -> float:
+        """1.0 for a document processed now, halving every half_life_days; 0 when unknown"""
+        if not processed_at:
+            return 0.0
+        try:
+            processed = processed_at if isinstance(processed_at, datetime) else datetime.fromisoformat(processed_at)
+        except ValueError:
+            return 0.0
+        if processed.tzinfo is None:
+            processed = processed.replace(tzinfo=timezone.utc)
+        age_days = max((now - processed).total_seconds() / 86400, 0.0)
+        return 0.5 ** (age_days / self.half_life_days)
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from answer_store import AnswerStore, answer_key
+
+
+class FakeCollection:
+    """The find_one / replace_one / delete_many subset of a pymongo collection, keyed by _id"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def find_one(self, query, projection=None):
+        doc = self.docs.get(query["_id"])
+        return dict(doc, _id=query["_id"]) if doc else None
+
+    def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+
+    def delete_many(self, query):
+        stale = [key for key, doc in self.docs.items() if doc["build"] != query["build"]["$ne"]]
+        for key in stale:
+            del self.docs[key]
+        return MagicMock(deleted_count=len(stale))
+
+
+class TestAnswerStore(unittest.TestCase):
+    def setUp(self):
+        self.store = AnswerStore(FakeCollection(), FakeCollection(), refresh_seconds=0)
+
+    def test_answer_key_normalizes_the_question_and_scopes_build_and_context(self):
+        self.assertEqual(answer_key("What is  the MEL?", "maintenance", "b1"),
+                         answer_key("what is the mel", "maintenance", "b1"))
+        self.assertEqual(answer_key("What is the MEL?", None, "b1"), answer_key("What is the MEL?", "general", "b1"))
+        self.assertNotEqual(answer_key("What is the MEL?", "cargo", "b1"),
+                            answer_key("What is the MEL?", "maintenance", "b1"))
+        self.assertTrue(answer_key("What is the MEL?", "cargo", "b1").startswith("b1:cargo:"))
+
+    def test_answers_are_served_only_for_the_published_build(self):
+        response = {"answer": "Use the MEL.", "source_documents": [], "retrieval": "hybrid", "usage": {"tokens": 5}}
+        self.store.put("What is the MEL?", "general", "b1", response, count=3)
+        self.assertIsNone(self.store.get("What is the MEL?", "general"))
+
+        self.store.publish_build("b1")
+        hit = self.store.get("what is the mel", "general")
+        self.assertEqual(hit["answer"], "Use the MEL.")
+        self.assertEqual((hit["cache"], hit["build"]), ("hit", "b1"))
+        self.assertNotIn("usage", hit)
+
+        self.store.publish_build("b2")
+        self.assertIsNone(self.store.get("What is the MEL?", "general"))
+        self.assertEqual(self.store.stats(), {"build": "b2", "hits": 1, "misses": 2, "hit_rate": 0.333})
+
+    def test_prune_keeps_the_current_build(self):
+        self.store.put("What is the MEL?", "general", "b1", {"answer": "old"})
+        self.store.put("What is the MEL?", "general", "b2", {"answer": "new"})
+
+        self.assertEqual(self.store.prune("b2"), 1)
+        self.assertEqual([doc["build"] for doc in self.store.answers.docs.values()], ["b2"])
+
+    def test_store_errors_count_as_misses(self):
+        self.store.publish_build("b1")
+        self.store.answers = MagicMock()
+        self.store.answers.find_one.side_effect = ConnectionError("Atlas unreachable")
+
+        self.assertIsNone(self.store.get("What is the MEL?", "general"))
+        self.assertEqual(self.store.stats()["misses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from lexical_index import BM25Index, extract_identifiers, reciprocal_rank_fusion, tokenize
+
+DOCUMENTS = [
+    ("dgr", "Lithium batteries UN3480 are Class 9 dangerous goods", {"category": "dangerous_goods"}),
+    ("mel", "The minimum equipment list for the 777-300ER fleet", {"category": "maintenance"}),
+    ("uld", "ULD loading limits for the main deck and lower deck", {"category": ["loading", "cargo"]}),
+    ("dry_ice", "Dry ice UN1845 is Class 9 and limited per ULD", {"category": "dangerous_goods"})
+]
+
+class TestTokenize(unittest.TestCase):
+    def test_identifiers_are_normalized_single_tokens(self):
+        identifiers = extract_identifiers("Is UN 3480 Class 9 allowed on a 777-300ER?")
+        self.assertEqual(identifiers[:3], ["class9", "un3480", "777-300er"])
+
+    def test_stopwords_are_dropped(self):
+        self.assertEqual(tokenize("What is the ULD limit"), ["uld", "limit"])
+
+class TestBM25Index(unittest.TestCase):
+    def setUp(self):
+        self.index = BM25Index().build(DOCUMENTS)
+
+    def test_exact_identifier_ranks_its_document_first(self):
+        results = self.index.search("UN 3480 Class 9 rules", k=2)
+        self.assertEqual(results[0][0], "dgr")
+        self.assertEqual(len(results), 2)
+
+    def test_search_within_a_filtered_subset(self):
+        within = self.index.where({"category": ["dangerous_goods"]})
+        self.assertEqual([doc_id for doc_id, _ in self.index.search("ULD limits", within=within)], ["dry_ice"])
+
+    def test_where_and_matching(self):
+        # Array fields match any of their elements
+        self.assertEqual(self.index.where({"category": ["cargo"]}), {2})
+        self.assertEqual(self.index.where({}), {0, 1, 2, 3})
+        self.assertEqual(self.index.where({"category": ["safety"]}), set())
+        self.assertEqual(self.index.matching(["class9"]), {0, 3})
+        self.assertEqual(self.index.matching(["class9", "un1845"]), {3})
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    def test_documents_ranked_by_both_lists_come_first(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]], k=60)
+
+        self.assertEqual([doc_id for doc_id, _ in fused], ["b", "a", "d", "c"])
+        self.assertAlmostEqual(fused[0][1], 1 / 62 + 1 / 61)
+        self.assertAlmostEqual(fused[-1][1], 1 / 63)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import io
+import json
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from model_tiering import ModelTier, TieredGenerator, complexity
+
+FAST = ModelTier("fast", "fast-model", max_tokens=512)
+REASONING = ModelTier("reasoning", "reasoning-model", max_tokens=2048)
+
+
+class FakeBedrockClient:
+    """Answers each model id with the next of its canned (text, stop_reason) replies"""
+
+    def __init__(self, replies):
+        self.replies = {model_id: list(answers) for model_id, answers in replies.items()}
+        self.calls = []
+
+    def invoke_model(self, modelId, body):
+        self.calls.append(modelId)
+        text, stop_reason = self.replies[modelId].pop(0)
+        payload = {"content": [{"type": "text", "text": text}], "stop_reason": stop_reason,
+                   "usage": {"input_tokens": 100, "output_tokens": 10}}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+
+class TestComplexity(unittest.TestCase):
+    def test_lookups_score_low_and_analysis_scores_high(self):
+        self.assertEqual(complexity("What is the MEL?"), 0)
+        self.assertGreaterEqual(
+            complexity("Compare the impact of loading 3 ULDs versus 5 pallets on the 777 at 40 tonnes?"), 2
+        )
+
+
+class TestTieredGenerator(unittest.TestCase):
+    def generator(self, replies):
+        client = FakeBedrockClient(replies)
+        return TieredGenerator(client, REASONING, fast=FAST, threshold=2), client
+
+    def test_simple_question_stays_on_the_fast_tier(self):
+        generator, client = self.generator({"fast-model": [("The MEL lists inoperative items allowed.", "end_turn")]})
+
+        result = generator.generate("prompt", "What is the MEL?")
+
+        self.assertEqual(client.calls, ["fast-model"])
+        self.assertEqual((result["tier"], result["escalated"]), ("fast", False))
+
+    def test_complex_question_goes_straight_to_reasoning(self):
+        generator, client = self.generator({"reasoning-model": [("A detailed comparison of both options.", "end_turn")]})
+
+        generator.generate("prompt", "Compare and analyze the trade-offs of each loading plan")
+
+        self.assertEqual(client.calls, ["reasoning-model"])
+
+    def test_invalid_fast_answers_escalate(self):
+        for text, stop_reason in (("Too short", "end_turn"),
+                                  ("The answer runs past the token limit and is cut", "max_tokens"),
+                                  ("I don't know based on the provided documents.", "end_turn")):
+            with self.subTest(text=text):
+                generator, client = self.generator({
+                    "fast-model": [(text, stop_reason)],
+                    "reasoning-model": [("The reasoning tier's complete answer.", "end_turn")]
+                })
+
+                result = generator.generate("prompt", "What is the MEL?")
+
+                self.assertEqual(client.calls, ["fast-model", "reasoning-model"])
+                self.assertEqual((result["tier"], result["escalated"]), ("reasoning", True))
+                # Both calls are billed to the request
+                self.assertEqual(result["usage"], {"input_tokens": 200, "output_tokens": 20})
+                self.assertEqual(generator.summary()["reasoning"]["escalations"], 1)
+
+    def test_without_a_fast_tier_everything_uses_reasoning(self):
+        client = FakeBedrockClient({"reasoning-model": [("Minimum equipment list answer.", "end_turn")]})
+        generator = TieredGenerator(client, REASONING)
+
+        self.assertEqual(generator.generate("prompt", "What is the MEL?")["tier"], "reasoning")
+        self.assertEqual(list(generator.summary()), ["reasoning"])
+
+
+if __name__ == '__main__':
+    unittest.main()
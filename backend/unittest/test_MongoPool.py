@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+import mongo_pool
+
+class TestMongoPool(unittest.TestCase):
+    def setUp(self):
+        mongo_pool._client = None
+
+    def tearDown(self):
+        mongo_pool._client = None
+
+    def test_every_caller_shares_one_pooled_client(self):
+        clients = []
+        env = {"MONGODB_URI": "mongodb://atlas.example", "MONGODB_MAX_POOL_SIZE": "20"}
+        with patch.dict(os.environ, env), patch("mongo_pool.MongoClient") as mongo_client:
+            threads = [threading.Thread(target=lambda: clients.append(mongo_pool.get_client())) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mongo_client.assert_called_once()
+        self.assertEqual(mongo_client.call_args.args, ("mongodb://atlas.example",))
+        self.assertEqual(mongo_client.call_args.kwargs["maxPoolSize"], 20)
+        self.assertTrue(all(client is mongo_client.return_value for client in clients))
+
+if __name__ == '__main__':
+    unittest.main()
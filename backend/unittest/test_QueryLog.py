@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from query_log import QueryLog, redact
+
+class TestRedact(unittest.TestCase):
+    def test_pii_is_redacted(self):
+        self.assertEqual(redact("mail ops.lead@carrier.com"), "mail <email>")
+        self.assertEqual(redact("card 4111 1111 1111 1111"), "card <card>")
+        self.assertEqual(redact("call +1 555-123-4567"), "call <phone>")
+        self.assertEqual(redact("passport X1234567"), "passport <document_id>")
+        self.assertEqual(redact("passport AB1234567"), "passport <document_id>")
+        self.assertEqual(redact("from 10.0.12.7"), "from <ip>")
+
+    def test_aviation_identifiers_are_kept(self):
+        for text in ("where is waybill FX78945612", "waybill FX7894561230", "waybill 5Y20240115001",
+                     "status of UA901", "UN3480 lithium batteries", "departures on 2024-01-15"):
+            with self.subTest(text=text):
+                self.assertEqual(redact(text), text)
+
+class TestQueryLog(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_entries(self):
+        with open(os.path.join(self.tmp_dir.name, 'queries.jsonl')) as f:
+            return [json.loads(line) for line in f]
+
+    def test_flush_writes_redacted_entries(self):
+        query_log = QueryLog(self.tmp_dir.name, flush_interval=60)
+        query_log.record({"question": "email me at a@b.com about FX78945612", "status": "ok"})
+        query_log.close()
+
+        entries = self.read_entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]["question"], "email me at <email> about FX78945612")
+        self.assertIn("ts", entries[0])
+
+    def test_full_buffer_drops_oldest(self):
+        query_log = QueryLog(self.tmp_dir.name, capacity=2, flush_interval=60)
+        for index in range(3):
+            query_log.record({"question": f"question {index}"})
+        query_log.close()
+
+        self.assertEqual(query_log.dropped, 1)
+        self.assertEqual([entry["question"] for entry in self.read_entries()], ["question 1", "question 2"])
+
+if __name__ == '__main__':
+    unittest.main()
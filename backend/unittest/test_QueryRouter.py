@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from query_router import QueryRouter
+
+FLIGHTS = [
+    {
+        "flight_number": "UA901", "departure_airport": "JFK", "arrival_airport": "LHR",
+        "scheduled_departure": "2024-01-15T18:30:00", "scheduled_arrival": "2024-01-16T06:45:00",
+        "actual_departure": "2024-01-15T18:45:00", "actual_arrival": "2024-01-16T07:00:00",
+        "status": "ARRIVED", "aircraft_type": "Boeing 777-300ER"
+    },
+    {
+        "flight_number": "5Y800", "departure_airport": "ANC", "arrival_airport": "PVG",
+        "scheduled_departure": "2024-01-16T06:00:00", "scheduled_arrival": "2024-01-16T16:30:00",
+        "actual_departure": None, "actual_arrival": None,
+        "status": "SCHEDULED", "aircraft_type": "Boeing 747-400F"
+    }
+]
+CARGO = [
+    {"flight_number": "5Y800", "waybill_number": "5Y20240115001", "shipper_name": "AutoParts Manufacturing",
+     "consignee_name": "Shanghai Automotive Group", "cargo_description": "Automotive parts",
+     "weight_kg": 18500.0, "special_handling": "HEAVY", "hazardous_material": False},
+    {"flight_number": "5Y800", "waybill_number": "5Y20240115002", "shipper_name": "ChemTech Laboratories",
+     "consignee_name": "Shanghai Pharmaceutical", "cargo_description": "Laboratory chemicals",
+     "weight_kg": 850.25, "special_handling": "HAZMAT", "hazardous_material": True, "hazmat_class": "Class 3"}
+]
+
+
+class FakeDataAPI:
+    """DataAPI's sample-data behaviour: every flight is returned and unknown flights get a placeholder manifest"""
+
+    def get_flight_data(self, flight_number=None, date=None):
+        return FLIGHTS
+
+    def get_cargo_manifest(self, flight_number):
+        items = [item for item in CARGO if item["flight_number"] == flight_number] or [
+            {"waybill_number": f"{flight_number}-001", "cargo_description": "Sample cargo", "weight_kg": 1000.0}
+        ]
+        return {"flight_number": flight_number, "cargo_items": items,
+                "total_weight_kg": sum(item["weight_kg"] for item in items), "item_count": len(items)}
+
+    def get_waybill(self, waybill_number):
+        return next((item for item in CARGO if item["waybill_number"] == waybill_number), None)
+
+
+class TestQueryRouter(unittest.TestCase):
+    def setUp(self):
+        self.router = QueryRouter(FakeDataAPI())
+
+    def test_flight_status(self):
+        response = self.router.route("What is the status of UA901?")
+        self.assertEqual(response["retrieval"], "structured:status")
+        self.assertIn("Flight UA901 (JFK → LHR, Boeing 777-300ER) is ARRIVED", response["answer"])
+        self.assertIn("departed 15 minutes late", response["answer"])
+        self.assertEqual(response["source_documents"], [])
+
+    def test_cargo_weight_and_hazmat(self):
+        weight = self.router.route("Total cargo weight on 5Y800")
+        self.assertEqual(weight["retrieval"], "structured:cargo_weight")
+        self.assertIn("19,350.2 kg of cargo across 2 waybills", weight["answer"])
+
+        hazmat = self.router.route("Any hazmat on 5y800?")
+        self.assertEqual(hazmat["retrieval"], "structured:hazmat")
+        self.assertIn("1 hazmat shipment", hazmat["answer"])
+        self.assertIn("Class 3", hazmat["answer"])
+
+    def test_waybill_lookup(self):
+        response = self.router.route("Where is waybill 5Y20240115001")
+        self.assertEqual(response["retrieval"], "structured:waybill")
+        self.assertIn("on flight 5Y800", response["answer"])
+
+    def test_open_ended_questions_go_to_rag(self):
+        self.assertIsNone(self.router.route("Why is UA901 delayed?"))
+        self.assertIsNone(self.router.route("What are the regulations for lithium batteries?"))
+
+    def test_aircraft_types_and_other_tokens_are_not_flights(self):
+        for question in ("Is the Q400 delayed?", "E190 departure times", "MD11 cargo",
+                         "tell me about CO2 items", "A320 arrival performance", "AN124 freight capacity",
+                         "LD3 cargo containers"):
+            with self.subTest(question=question):
+                self.assertIsNone(self.router.route(question))
+
+    def test_unknown_flights_and_waybills_fall_through(self):
+        self.assertIsNone(self.router.route("Is XY123 delayed?"))
+        self.assertIsNone(self.router.route("Cargo on ZZ4411"))
+        self.assertIsNone(self.router.route("Where is waybill FX00000000"))
+
+
+if __name__ == '__main__':
+    unittest.main()
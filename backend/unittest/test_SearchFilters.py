@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from search_filters import (
+    CONTEXT_CATEGORIES, DOCUMENT_CATEGORIES, SAMPLE_CATEGORIES, build_conditions, categorize, to_mql
+)
+
+class TestBuildConditions(unittest.TestCase):
+    def test_general_context_without_filters_searches_everything(self):
+        self.assertEqual(build_conditions("general"), {})
+        self.assertIsNone(to_mql(build_conditions("general")))
+
+    def test_context_type_selects_its_categories(self):
+        conditions = build_conditions("maintenance")
+        categories = ["maintenance", "operations", "safety", "general"]
+        self.assertEqual(conditions, {"metadata.category": categories})
+        self.assertEqual(to_mql(conditions), {"metadata.category": {"$in": categories}})
+
+    def test_every_assigned_category_is_reachable_from_a_context_type(self):
+        filenames = ("iata_dgr_regulations.pdf", "engine_maintenance_manual.pdf", "uld_loading_guide.docx",
+                     "safety_bulletin.txt", "fleet_overview.md")
+        self.assertEqual({categorize(filename) for filename in filenames}, set(DOCUMENT_CATEGORIES))
+
+        reachable = {category for categories in CONTEXT_CATEGORIES.values() for category in categories}
+        for category in DOCUMENT_CATEGORIES + SAMPLE_CATEGORIES:
+            with self.subTest(category=category):
+                self.assertIn(category, reachable)
+        # Safety and uncategorized documents are searched in every context
+        for context_type in CONTEXT_CATEGORIES:
+            self.assertTrue({"safety", "general"} <= set(build_conditions(context_type)["metadata.category"]))
+
+    def test_explicit_filters_combine_with_the_context_type(self):
+        conditions = build_conditions("cargo", {"category": ["loading", "maintenance"], "aircraft_type": "B777"})
+
+        # A category filter narrows the context's categories
+        self.assertEqual(conditions, {"metadata.category": ["loading"], "metadata.aircraft_type": ["B777"]})
+        self.assertEqual(to_mql(conditions), {"$and": [
+            {"metadata.category": {"$eq": "loading"}},
+            {"metadata.aircraft_type": {"$eq": "B777"}}
+        ]})
+
+    def test_unknown_filter_fields_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported filter 'tail_number'"):
+            build_conditions("general", {"tail_number": "N123UA"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+import os
+import filecmp
+
+BACKEND_APP = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app'))
+AIRFLOW_PLUGINS = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'airflow', 'plugins'))
+
+class TestSharedModules(unittest.TestCase):
+    """Modules deployed both with the backend and as Airflow plugins must stay identical copies"""
+
+    def assertIdenticalCopies(self, filename):
+        backend_copy = os.path.join(BACKEND_APP, filename)
+        airflow_copy = os.path.join(AIRFLOW_PLUGINS, filename)
+        self.assertFalse(os.path.islink(airflow_copy), f"{airflow_copy} must be a real file")
+        self.assertTrue(filecmp.cmp(backend_copy, airflow_copy, shallow=False),
+                        f"backend/app/{filename} and airflow/plugins/{filename} differ; change both")
+
+    def test_bedrock_client_copies_are_identical(self):
+        self.assertIdenticalCopies('bedrock_client.py')
+
+    def test_answer_store_copies_are_identical(self):
+        # The answer_warming DAG and the backend must derive the same answer keys
+        self.assertIdenticalCopies('answer_store.py')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from usage_accounting import UsageTracker, current_usage
+
+def response(input_tokens, output_tokens, latency_ms=None):
+    headers = {
+        "x-amzn-bedrock-input-token-count": str(input_tokens),
+        "x-amzn-bedrock-output-token-count": str(output_tokens)
+    }
+    if latency_ms is not None:
+        headers["x-amzn-bedrock-invocation-latency"] = str(latency_ms)
+    return {"ResponseMetadata": {"HTTPHeaders": headers}}
+
+class TestUsageTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = UsageTracker(embedding_models=["titan-embed"])
+
+    def test_calls_are_attributed_to_the_tracked_request(self):
+        # Calls outside a tracked request are ignored
+        self.tracker.record_call("claude", "{}", response(999, 999), 1.0)
+
+        with self.tracker.track("/query", "cargo") as usage:
+            self.assertIs(current_usage(), usage)
+            self.tracker.record_call("titan-embed", "{}", response(12, 0), 0.05)
+            self.tracker.record_call("claude", "x" * 40, response(1500, 200, latency_ms=900), 1.0)
+            usage.route = "hybrid"
+        self.assertIsNone(current_usage())
+
+        summary = usage.summary()
+        self.assertEqual((summary["llm_calls"], summary["embedding_calls"]), (1, 1))
+        self.assertEqual((summary["input_tokens"], summary["output_tokens"]), (1500, 200))
+        self.assertEqual(summary["embedding_tokens"], 12)
+        self.assertEqual(summary["calls"][1]["model_latency_ms"], 900)
+        self.assertEqual(summary["calls"][1]["prompt_chars"], 40)
+
+    def test_stats_group_by_endpoint_context_model_and_prompt_size(self):
+        for context_type, input_tokens, cache in (("cargo", 800, None), ("cargo", 3000, "hit"), (None, 9000, None)):
+            with self.tracker.track("/query", context_type) as usage:
+                self.tracker.record_call("claude", "{}", response(input_tokens, 100), 0.5)
+                usage.cache = cache
+
+        stats = self.tracker.stats()
+
+        self.assertEqual(stats["window_requests"], 3)
+        self.assertEqual(stats["by_endpoint"]["/query"]["requests"], 3)
+        self.assertEqual(stats["by_endpoint"]["/query"]["cache_hits"], 1)
+        self.assertEqual(list(stats["by_context_type"]), ["cargo"])
+        self.assertEqual(stats["by_context_type"]["cargo"]["input_tokens"], 3800)
+        self.assertEqual(stats["by_model"]["claude"]["calls"], 3)
+        self.assertEqual(sorted(stats["generation_by_prompt_tokens"]), ["<1000", "<4000", ">=8000"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+# Include backend app path (modules import each other by name, as when main.py runs)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from vector_search import Rescorer, VectorSearch
+
+class TestVectorSearch(unittest.TestCase):
+    def setUp(self):
+        self.collection = MagicMock()
+        self.vector_search = VectorSearch(self.collection, "vector_index", fields=["metadata.category"])
+
+    def test_search_projects_text_fields_and_score(self):
+        self.collection.aggregate.return_value = iter([{"_id": "c1", "text": "MEL", "score": 0.9}])
+        pre_filter = {"metadata.category": {"$eq": "maintenance"}}
+
+        results = self.vector_search.search([0.1, 0.2], limit=5, num_candidates=100, pre_filter=pre_filter)
+
+        self.assertEqual(results, [{"_id": "c1", "text": "MEL", "score": 0.9}])
+        self.collection.aggregate.assert_called_once_with([
+            {"$vectorSearch": {"index": "vector_index", "path": "embedding", "queryVector": [0.1, 0.2],
+                               "numCandidates": 100, "limit": 5, "filter": pre_filter}},
+            {"$project": {"text": 1, "metadata.category": 1, "score": {"$meta": "vectorSearchScore"}}}
+        ])
+
+    def test_candidates_return_ids_only(self):
+        self.collection.aggregate.return_value = iter([{"_id": "c1", "score": 0.9}, {"_id": "c2", "score": 0.8}])
+
+        candidates = self.vector_search.candidates([0.1, 0.2], limit=50, num_candidates=20)
+
+        self.assertEqual(candidates, [("c1", 0.9), ("c2", 0.8)])
+        stage, projection = self.collection.aggregate.call_args.args[0]
+        # numCandidates is never below limit, and no filter is sent when there is none
+        self.assertEqual(stage["$vectorSearch"]["numCandidates"], 50)
+        self.assertNotIn("filter", stage["$vectorSearch"])
+        self.assertEqual(projection, {"$project": {"_id": 1, "score": {"$meta": "vectorSearchScore"}}})
+
+    def test_vectors_fetches_embeddings_by_id(self):
+        self.collection.find.return_value = [{"_id": "c1", "embedding": [1.0]}]
+
+        self.assertEqual(self.vector_search.vectors(["c1"], ["metadata.processed_at"]),
+                         {"c1": {"_id": "c1", "embedding": [1.0]}})
+        self.collection.find.assert_called_once_with(
+            {"_id": {"$in": ["c1"]}}, {"embedding": 1, "metadata.processed_at": 1}
+        )
+
+class TestRescorer(unittest.TestCase):
+    def test_exact_cosine_orders_candidates(self):
+        docs = {
+            "far": {"embedding": [0.0, 1.0]},
+            "near": {"embedding": [2.0, 0.1]},
+            "missing": {"metadata": {"category": "cargo"}}
+        }
+        ranked = Rescorer(recency_weight=0, category_weight=0).rescore([1.0, 0.0], docs)
+
+        self.assertEqual([doc_id for doc_id, _ in ranked], ["near", "far"])
+        self.assertAlmostEqual(ranked[1][1], 0.0)
+
+    def test_recent_and_on_topic_documents_win_ties(self):
+        now = datetime.now(timezone.utc)
+        docs = {
+            "old": {"embedding": [1.0, 0.0], "metadata": {"processed_at": (now - timedelta(days=730)).isoformat()}},
+            "new": {"embedding": [1.0, 0.0], "metadata": {"processed_at": now.isoformat()}},
+            "cargo": {"embedding": [1.0, 0.0], "metadata": {"category": "cargo", "processed_at": "not a date"}}
+        }
+        rescorer = Rescorer(recency_weight=0.04, category_weight=0.05, half_life_days=365)
+        scores = dict(rescorer.rescore([1.0, 0.0], docs, categories=["cargo"]))
+
+        self.assertAlmostEqual(scores["new"], 1.04, places=4)
+        self.assertAlmostEqual(scores["old"], 1.01, places=4)
+        self.assertAlmostEqual(scores["cargo"], 1.05, places=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,428 @@
+"""
+Seeded synthetic aviation data for performance testing.
+
+Writes flights, cargo manifests and maintenance records as Parquet part files
+(one per batch, columns matching scripts/snowflake-setup.sql) and
+regulation/procedure style documents as text files. Every batch and document
+draws from its own seeded generator, so the same seed and batch size always
+produce the same files, however the work is split.
+
+    python scripts/generate_synthetic_data.py --output data/synthetic \\
+        --flights 1000000 --cargo 3000000 --maintenance 200000 --documents 20000
+
+The document directory can be fed to scripts/setup_vectors.py or the Airflow
+document paths; --load-snowflake bulk loads the tables via load_sample_data.
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# (IATA code, latitude, longitude)
+AIRPORTS = [
+    ('JFK', 40.64, -73.78), ('LAX', 33.94, -118.41), ('ORD', 41.97, -87.91), ('DFW', 32.90, -97.04),
+    ('ATL', 33.64, -84.43), ('DEN', 39.86, -104.67), ('SFO', 37.62, -122.38), ('SEA', 47.45, -122.31),
+    ('MIA', 25.79, -80.29), ('BOS', 42.37, -71.01), ('IAH', 29.99, -95.34), ('YYZ', 43.68, -79.63),
+    ('MEX', 19.44, -99.07), ('GRU', -23.43, -46.47), ('LHR', 51.47, -0.45), ('CDG', 49.01, 2.55),
+    ('FRA', 50.03, 8.56), ('AMS', 52.31, 4.76), ('DXB', 25.25, 55.36), ('DOH', 25.27, 51.61),
+    ('SIN', 1.36, 103.99), ('HKG', 22.31, 113.91), ('NRT', 35.77, 140.39), ('ICN', 37.46, 126.44),
+    ('PVG', 31.14, 121.81), ('SYD', -33.94, 151.18), ('ANC', 61.17, -149.99), ('MEM', 35.04, -89.98)
+]
+# (IATA designator, ICAO code)
+AIRLINES = [
+    ('UA', 'UAL'), ('AA', 'AAL'), ('DL', 'DAL'), ('BA', 'BAW'), ('EK', 'UAE'),
+    ('SQ', 'SIA'), ('AF', 'AFR'), ('LH', 'DLH'), ('QR', 'QTR'), ('FX', 'FDX')
+]
+# (type, economy, business, first)
+SHORT_HAUL_AIRCRAFT = [
+    ('Airbus A320', 150, 12, 0), ('Boeing 737-800', 160, 16, 0),
+    ('Airbus A321', 185, 16, 0), ('Boeing 757-200', 180, 20, 0)
+]
+LONG_HAUL_AIRCRAFT = [
+    ('Boeing 787-9', 250, 30, 0), ('Airbus A350', 280, 45, 6), ('Boeing 777-300ER', 300, 50, 8),
+    ('Airbus A330-300', 260, 30, 0), ('Airbus A380', 400, 60, 10)
+]
+LONG_HAUL_KM = 4000
+CRUISE_KMH = 820
+
+# Share of dangerous goods shipments and, among them, the share of each class
+HAZMAT_RATE = 0.04
+HAZMAT_CLASSES = {
+    'Class 9': (0.38, 'Lithium-ion batteries UN3480'),
+    'Class 3': (0.20, 'Flammable liquid, n.o.s. (paint) UN1263'),
+    'Class 8': (0.10, 'Corrosive liquid, n.o.s. UN1760'),
+    'Class 2.2': (0.09, 'Compressed gas, non-flammable UN1956'),
+    'Class 6.1': (0.05, 'Toxic solid, organic UN2811'),
+    'Class 5.1': (0.04, 'Oxidizing solid, n.o.s. UN1479'),
+    'Class 1.4S': (0.04, 'Cartridges for tools, blank UN0323'),
+    'Class 4.1': (0.03, 'Flammable solid, organic UN1325'),
+    'Class 7': (0.03, 'Radioactive material, Type A package UN2915'),
+    'Class 2.1': (0.03, 'Aerosols, flammable UN1950'),
+    'Class 6.2': (0.01, 'Biological substance, Category B UN3373')
+}
+GENERAL_CARGO = [
+    ('Consumer electronics - smartphones and tablets', 'FRAGILE', 'Secure area'),
+    ('Automotive parts and components', 'HEAVY', None),
+    ('Fresh seafood and perishable foods', 'PERISHABLE', 'Cold storage 0-4C'),
+    ('Pharmaceuticals and vaccines', 'TEMPERATURE_CONTROLLED', 'Cold chain 2-8C'),
+    ('High-value electronics and components', 'HIGH_VALUE', 'Vault storage'),
+    ('Textiles and apparel', None, None),
+    ('Industrial machinery spares', 'HEAVY', None),
+    ('E-commerce parcels', None, None),
+    ('Cut flowers', 'PERISHABLE', 'Cool storage 2-8C'),
+    ('Live animals - tropical fish', 'LIVE_ANIMALS', 'Ventilated, climate controlled'),
+    ('Medical equipment and supplies', 'TEMPERATURE_CONTROLLED', 'Controlled room temperature'),
+    ('Printed matter and documents', None, None)
+]
+GENERAL_CARGO_WEIGHTS = [0.14, 0.10, 0.08, 0.07, 0.05, 0.12, 0.06, 0.20, 0.04, 0.01, 0.05, 0.08]
+COMPANY_PREFIXES = ['Global', 'Pacific', 'Northern', 'Atlas', 'Summit', 'Coastal', 'Continental', 'Apex', 'Meridian', 'Harbor']
+COMPANY_SECTORS = ['Electronics', 'Logistics', 'Pharma', 'Foods', 'Automotive', 'Chemicals', 'Textiles', 'Medical', 'Trading', 'Industries']
+COMPANY_SUFFIXES = ['Inc.', 'Ltd.', 'GmbH', 'Co.', 'LLC', 'S.A.', 'Pte Ltd']
+CITIES = ['New York', 'Los Angeles', 'Chicago', 'Frankfurt', 'London', 'Dubai', 'Singapore', 'Shanghai', 'Tokyo', 'Sao Paulo']
+
+# (maintenance type, share, interval in days, duration in days, description)
+MAINTENANCE_TYPES = [
+    ('Line Check', 0.45, 2, 1, 'Pre-flight and daily line maintenance inspection'),
+    ('A Check', 0.25, 90, 1, 'Routine maintenance and inspection'),
+    ('B Check', 0.10, 180, 2, 'Intermediate maintenance check'),
+    ('C Check', 0.05, 730, 21, 'Heavy maintenance check - structural inspection'),
+    ('Engine Inspection', 0.08, 365, 3, 'Borescope inspection of engine hot section'),
+    ('Landing Gear Overhaul', 0.02, 3650, 10, 'Landing gear removal and overhaul'),
+    ('Avionics Update', 0.05, 365, 1, 'Navigation database and avionics software update')
+]
+TECHNICIANS = ['John Anderson', 'Sarah Chen', 'Mike Rodriguez', 'Emily Watson', 'Robert Kim',
+               'Priya Patel', 'Lars Nilsson', 'Fatima Al-Sayed', 'Kenji Sato', 'Ana Souza']
+PARTS = [None, 'Brake assembly', 'Hydraulic filter', 'Fuel pump', 'Tyre set', 'Oil filter',
+         'Cabin pressure sensor', 'Pitot probe', 'Fan blade set', 'Avionics cooling fan']
+
+# Filename keywords match the categories assigned by the Airflow document operators
+DOCUMENT_KINDS = [
+    ('regulation', 'Dangerous Goods Regulation'),
+    ('maintenance_procedure', 'Maintenance Procedure'),
+    ('cargo_loading', 'Cargo Loading Instruction'),
+    ('safety_bulletin', 'Safety Bulletin')
+]
+DOCUMENT_SENTENCES = [
+    "Operators shall ensure that {hazmat} is packed in accordance with the applicable packing instruction before acceptance.",
+    "Packages containing {hazmat} must not exceed {limit} kg net quantity per package on passenger aircraft.",
+    "The pilot-in-command must be notified in writing of any {hazmat} loaded on the {aircraft}.",
+    "Before each flight the {aircraft} shall be inspected for fluid leaks, tyre wear and damage to the landing gear.",
+    "Torque all fasteners on the {component} to {limit} Nm and record the values in the technical log.",
+    "The {component} must be replaced after {interval} flight hours or at the next {check}, whichever comes first.",
+    "Unit load devices must be secured with restraint straps rated for at least {limit} kg before departure.",
+    "Heavy items above {limit} kg shall be loaded on the main deck positions nearest the wing box.",
+    "Temperature-controlled shipments must be kept between 2C and 8C throughout ground handling at {airport}.",
+    "Incidents involving {hazmat} at {airport} shall be reported to the competent authority within 72 hours.",
+    "Crews must complete recurrent training covering {hazmat} recognition every 24 months.",
+    "Deviations from this procedure on the {aircraft} require approval from the continuing airworthiness manager.",
+    "The {check} shall be completed within {interval} days of the previous check on each {aircraft}.",
+    "Ground staff at {airport} shall verify the weight and balance sheet against the final loading instruction."
+]
+DOCUMENT_COMPONENTS = ['main landing gear', 'engine fan blades', 'auxiliary power unit', 'cargo door seal',
+                       'fire suppression bottle', 'pitot-static system', 'brake assembly', 'flap actuator']
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between coordinate arrays"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+
+class SyntheticAviationData:
+    """Vectorized, seeded generators for each synthetic table and document set"""
+
+    TABLE_IDS = {'flights': 1, 'cargo_manifests': 2, 'aircraft_maintenance': 3, 'documents': 4}
+
+    def __init__(self, seed=42, start_date='2024-01-01', as_of_days=30, flights_per_day=5000):
+        if flights_per_day > len(AIRLINES) * 9000:
+            raise ValueError(f"At most {len(AIRLINES) * 9000} flights per day have distinct flight numbers")
+        self.seed = seed
+        self.start = np.datetime64(start_date, 's')
+        self.flights_per_day = flights_per_day
+        # Flights and maintenance before this point are completed, later ones scheduled
+        self.as_of = self.start + np.timedelta64(as_of_days, 'D')
+
+    def rng(self, table, batch_index):
+        """Independent generator per (table, batch) so batches can be produced in any order"""
+        return np.random.default_rng([self.seed, self.TABLE_IDS[table], batch_index])
+
+    def flight_numbers(self, index):
+        """Flight number and scheduled day offset for global flight indexes"""
+        index = np.asarray(index)
+        airline = index % len(AIRLINES)
+        number = 100 + (index % self.flights_per_day) // len(AIRLINES)
+        day = index // self.flights_per_day
+        codes = np.array([code for code, _ in AIRLINES])[airline]
+        return np.char.add(codes, number.astype(str)), airline, day
+
+    def flights(self, start, count, batch_index):
+        rng = self.rng('flights', batch_index)
+        index = np.arange(start, start + count)
+        flight_number, airline, day = self.flight_numbers(index)
+
+        dep = rng.integers(0, len(AIRPORTS), count)
+        arr = rng.integers(0, len(AIRPORTS) - 1, count)
+        arr = arr + (arr >= dep)  # never the departure airport
+        lat = np.array([a[1] for a in AIRPORTS])
+        lon = np.array([a[2] for a in AIRPORTS])
+        distance = haversine_km(lat[dep], lon[dep], lat[arr], lon[arr])
+
+        long_haul = distance > LONG_HAUL_KM
+        fleet = SHORT_HAUL_AIRCRAFT + LONG_HAUL_AIRCRAFT
+        aircraft = np.where(
+            long_haul,
+            len(SHORT_HAUL_AIRCRAFT) + rng.integers(0, len(LONG_HAUL_AIRCRAFT), count),
+            rng.integers(0, len(SHORT_HAUL_AIRCRAFT), count)
+        )
+        capacity = np.array([seats[1:] for seats in fleet])[aircraft]
+
+        departure_minute = rng.integers(5 * 60, 23 * 60 + 30, count)
+        scheduled_departure = self.start + (day * 1440 + departure_minute).astype('timedelta64[m]')
+        block_minutes = np.rint(distance / CRUISE_KMH * 60 + 30).astype(np.int64)
+        scheduled_arrival = scheduled_departure + block_minutes.astype('timedelta64[m]')
+
+        # Most flights leave within a few minutes; delays have a long exponential tail
+        delay = np.where(rng.random(count) < 0.65, rng.integers(0, 6, count), rng.exponential(35, count)).astype(np.int64)
+        completed = scheduled_departure < self.as_of
+        outcome = rng.random(count)
+        status = np.where(
+            completed,
+            np.where(outcome < 0.015, 'CANCELLED', np.where(outcome < 0.02, 'DIVERTED', 'ARRIVED')),
+            np.where(scheduled_departure < self.as_of + np.timedelta64(1, 'D'),
+                     np.where(delay > 15, 'DELAYED', 'SCHEDULED'), 'SCHEDULED')
+        )
+        flown = completed & (status != 'CANCELLED')
+        not_a_time = np.datetime64('NaT', 's')
+        actual_departure = np.where(flown, scheduled_departure + delay.astype('timedelta64[m]'), not_a_time)
+        drift = rng.normal(0, 8, count).astype(np.int64)
+        actual_arrival = np.where(flown, scheduled_arrival + (delay + drift).astype('timedelta64[m]'), not_a_time)
+
+        return pd.DataFrame({
+            'flight_number': flight_number,
+            'airline_code': np.array([icao for _, icao in AIRLINES])[airline],
+            'departure_airport': np.array([a[0] for a in AIRPORTS])[dep],
+            'arrival_airport': np.array([a[0] for a in AIRPORTS])[arr],
+            'scheduled_departure': scheduled_departure,
+            'scheduled_arrival': scheduled_arrival,
+            'actual_departure': actual_departure,
+            'actual_arrival': actual_arrival,
+            'status': status,
+            'aircraft_type': np.array([seats[0] for seats in fleet])[aircraft],
+            'distance_km': np.round(distance, 2),
+            'capacity_economy': capacity[:, 0],
+            'capacity_business': capacity[:, 1],
+            'capacity_first': capacity[:, 2]
+        })
+
+    def cargo_manifests(self, start, count, batch_index, flight_count):
+        rng = self.rng('cargo_manifests', batch_index)
+        flight_number, airline, _ = self.flight_numbers(rng.integers(0, max(flight_count, 1), count))
+        serial = np.char.zfill((np.arange(start, start + count) + 1).astype(str), 10)
+        waybill_number = np.char.add(np.array([code for code, _ in AIRLINES])[airline], serial)
+
+        hazardous = rng.random(count) < HAZMAT_RATE
+        classes = list(HAZMAT_CLASSES)
+        hazmat = rng.choice(len(classes), count, p=[HAZMAT_CLASSES[c][0] for c in classes])
+        general = rng.choice(len(GENERAL_CARGO), count, p=GENERAL_CARGO_WEIGHTS)
+
+        # Dangerous goods ship in small packages; general cargo is log-normal with a heavy tail
+        weight = np.where(
+            hazardous,
+            rng.lognormal(np.log(80), 0.9, count),
+            rng.lognormal(np.log(250), 1.3, count)
+        ).clip(0.5, 25000)
+        density = rng.uniform(120, 450, count)
+
+        def company_names(size):
+            return np.char.add(np.char.add(np.char.add(
+                np.array(COMPANY_PREFIXES)[rng.integers(0, len(COMPANY_PREFIXES), size)], ' '),
+                np.char.add(np.array(COMPANY_SECTORS)[rng.integers(0, len(COMPANY_SECTORS), size)], ' ')),
+                np.array(COMPANY_SUFFIXES)[rng.integers(0, len(COMPANY_SUFFIXES), size)])
+
+        return pd.DataFrame({
+            'flight_number': flight_number,
+            'waybill_number': waybill_number,
+            'shipper_name': company_names(count),
+            'shipper_address': np.array(CITIES)[rng.integers(0, len(CITIES), count)],
+            'consignee_name': company_names(count),
+            'consignee_address': np.array(CITIES)[rng.integers(0, len(CITIES), count)],
+            'cargo_description': np.where(
+                hazardous,
+                np.array([HAZMAT_CLASSES[c][1] for c in classes])[hazmat],
+                np.array([c[0] for c in GENERAL_CARGO])[general]
+            ),
+            'weight_kg': np.round(weight, 2),
+            'volume_cubic_m': np.round(weight / density, 3),
+            'special_handling': np.where(
+                hazardous, 'DANGEROUS_GOODS', np.array([c[1] for c in GENERAL_CARGO], dtype=object)[general]
+            ),
+            'hazardous_material': hazardous,
+            'hazmat_class': np.where(hazardous, np.array(classes, dtype=object)[hazmat], None),
+            'storage_requirements': np.where(
+                hazardous, 'Segregated DG storage', np.array([c[2] for c in GENERAL_CARGO], dtype=object)[general]
+            )
+        })
+
+    def aircraft_maintenance(self, start, count, batch_index, fleet_size):
+        rng = self.rng('aircraft_maintenance', batch_index)
+        fleet = SHORT_HAUL_AIRCRAFT + LONG_HAUL_AIRCRAFT
+        aircraft = rng.integers(0, max(fleet_size, 1), count)
+        registration = np.char.add('N', np.char.zfill((aircraft % 99999 + 1).astype(str), 5))
+
+        kind = rng.choice(len(MAINTENANCE_TYPES), count, p=[t[1] for t in MAINTENANCE_TYPES])
+        interval = np.array([t[2] for t in MAINTENANCE_TYPES])[kind]
+        duration = np.array([t[3] for t in MAINTENANCE_TYPES])[kind]
+
+        start_day = self.start.astype('datetime64[D]')
+        as_of_day = self.as_of.astype('datetime64[D]')
+        scheduled = start_day + rng.integers(-180, 180, count).astype('timedelta64[D]')
+        finished = scheduled + duration.astype('timedelta64[D]')
+        status = np.where(finished < as_of_day, 'COMPLETED', np.where(scheduled <= as_of_day, 'IN_PROGRESS', 'SCHEDULED'))
+        completed_date = np.where(status == 'COMPLETED', finished, np.datetime64('NaT', 'D'))
+
+        return pd.DataFrame({
+            'aircraft_registration': registration,
+            'aircraft_type': np.array([t[0] for t in fleet])[aircraft % len(fleet)],
+            'maintenance_type': np.array([t[0] for t in MAINTENANCE_TYPES])[kind],
+            'maintenance_description': np.array([t[4] for t in MAINTENANCE_TYPES])[kind],
+            'scheduled_date': scheduled,
+            'completed_date': completed_date,
+            'status': status,
+            'technician': np.array(TECHNICIANS)[rng.integers(0, len(TECHNICIANS), count)],
+            'parts_used': np.array(PARTS, dtype=object)[rng.integers(0, len(PARTS), count)],
+            'next_due_date': scheduled + interval.astype('timedelta64[D]')
+        })
+
+    def document(self, index):
+        """(filename, text) of one regulation/procedure style document"""
+        rng = self.rng('documents', index)
+        prefix, title = DOCUMENT_KINDS[index % len(DOCUMENT_KINDS)]
+        fleet = SHORT_HAUL_AIRCRAFT + LONG_HAUL_AIRCRAFT
+        effective = self.start + np.timedelta64(int(rng.integers(-720, 0)), 'D')
+
+        lines = [
+            f"{title} {index + 1:06d}",
+            f"Document ID: {prefix.upper()}-{index + 1:06d}",
+            f"Effective date: {str(effective)[:10]}",
+            ""
+        ]
+        for section in range(1, int(rng.integers(4, 10)) + 1):
+            lines.append(f"Section {section}")
+            for paragraph in range(1, int(rng.integers(2, 6)) + 1):
+                sentences = rng.choice(len(DOCUMENT_SENTENCES), int(rng.integers(2, 5)), replace=False)
+                text = ' '.join(DOCUMENT_SENTENCES[s].format(
+                    hazmat=HAZMAT_CLASSES[list(HAZMAT_CLASSES)[int(rng.integers(0, len(HAZMAT_CLASSES)))]][1],
+                    aircraft=fleet[int(rng.integers(0, len(fleet)))][0],
+                    airport=AIRPORTS[int(rng.integers(0, len(AIRPORTS)))][0],
+                    component=DOCUMENT_COMPONENTS[int(rng.integers(0, len(DOCUMENT_COMPONENTS)))],
+                    check=MAINTENANCE_TYPES[int(rng.integers(1, 4))][0],
+                    limit=int(rng.integers(5, 500)) * 5,
+                    interval=int(rng.integers(3, 60)) * 50
+                ) for s in sentences)
+                lines.append(f"{section}.{paragraph} {text}")
+            lines.append("")
+        return f"{prefix}_{index + 1:06d}.txt", '\n'.join(lines)
+
+
+def write_table(generate, table_name, total, batch_size, output_dir):
+    """Generate a table batch by batch, one Parquet part file per batch"""
+    if total <= 0:
+        return []
+    table_dir = os.path.join(output_dir, table_name)
+    os.makedirs(table_dir, exist_ok=True)
+
+    start_time = time.monotonic()
+    parts = []
+    for batch_index, start in enumerate(range(0, total, batch_size)):
+        df = generate(start, min(batch_size, total - start), batch_index)
+        part = os.path.join(table_dir, f"part-{batch_index:05d}.parquet")
+        df.to_parquet(part, index=False, compression='zstd')
+        parts.append(part)
+
+    elapsed = time.monotonic() - start_time
+    print(f"Wrote {total} {table_name} rows to {len(parts)} parts in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed > 0 else 0:.0f} rows/sec)")
+    return parts
+
+
+def write_documents(data, total, output_dir):
+    """Write total text documents, skipping files that already exist"""
+    if total <= 0:
+        return
+    doc_dir = os.path.join(output_dir, 'documents')
+    os.makedirs(doc_dir, exist_ok=True)
+
+    start_time = time.monotonic()
+    written_bytes = 0
+    for index in range(total):
+        filename, text = data.document(index)
+        path = os.path.join(doc_dir, filename)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        written_bytes += len(text)
+
+    elapsed = time.monotonic() - start_time
+    print(f"Wrote {total} documents ({written_bytes / 1e6:.1f} MB) to {doc_dir} in {elapsed:.1f}s")
+
+
+def load_into_snowflake(parts_by_table):
+    """Bulk load the generated Parquet parts with SnowflakeDataLoader"""
+    from load_sample_data import SnowflakeDataLoader
+
+    loader = SnowflakeDataLoader()
+    try:
+        for table_name, parts in parts_by_table.items():
+            for part in parts:
+                loader.bulk_load(pd.read_parquet(part), table_name)
+    finally:
+        loader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic aviation data")
+    parser.add_argument('--output', default='data/synthetic')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-date', default='2024-01-01')
+    parser.add_argument('--flights-per-day', type=int, default=5000)
+    parser.add_argument('--flights', type=int, default=100000)
+    parser.add_argument('--cargo', type=int, default=300000)
+    parser.add_argument('--maintenance', type=int, default=20000)
+    parser.add_argument('--documents', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=250000)
+    parser.add_argument('--load-snowflake', action='store_true')
+    args = parser.parse_args()
+
+    # The last fifth of the generated schedule is still in the future
+    days = -(-args.flights // args.flights_per_day)
+    data = SyntheticAviationData(
+        seed=args.seed,
+        start_date=args.start_date,
+        as_of_days=max(int(days * 0.8), 1),
+        flights_per_day=args.flights_per_day
+    )
+    fleet_size = max(args.flights // 500, 10)
+    print(f"Generating synthetic aviation data (seed {args.seed}) into {args.output} at {datetime.now():%H:%M:%S}")
+
+    parts_by_table = {
+        'flights': write_table(data.flights, 'flights', args.flights, args.batch_size, args.output),
+        'cargo_manifests': write_table(
+            lambda start, count, batch: data.cargo_manifests(start, count, batch, args.flights),
+            'cargo_manifests', args.cargo, args.batch_size, args.output
+        ),
+        'aircraft_maintenance': write_table(
+            lambda start, count, batch: data.aircraft_maintenance(start, count, batch, fleet_size),
+            'aircraft_maintenance', args.maintenance, args.batch_size, args.output
+        )
+    }
+    write_documents(data, args.documents, args.output)
+
+    if args.load_snowflake:
+        load_into_snowflake(parts_by_table)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
 import snowflake.connector
+from snowflake.connector.pandas_tools import write_pandas
 import os
+import time
 from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 
 load_dotenv()
 
+# Inputs below this many rows are inserted with executemany instead of staged and COPYed
+BULK_LOAD_MIN_ROWS = 10000
+# Rows per executemany call / per Parquet file staged for COPY INTO
+INSERT_BATCH_ROWS = 5000
+COPY_CHUNK_ROWS = 500000
+
 class SnowflakeDataLoader:
     def __init__(self):
         self.conn = snowflake.connector.connect(
@@ -34,10 +43,8 @@ class SnowflakeDataLoader:
                 print(f"Error executing command: {e}")
         cursor.close()
     
-    def generate_additional_flight_data(self):
+    def generate_additional_flight_data(self, count=50):
         """Generate additional realistic flight data"""
-        cursor = self.conn.cursor()
-        
         # Generate flights for the next 7 days
         base_date = datetime.now()
         airlines = ['UAL', 'AAL', 'DAL', 'BAW', 'UAE', 'SIA', 'AFR', 'LUF']
@@ -50,54 +57,107 @@ class SnowflakeDataLoader:
             ('SFO', 'SEA', 1090), ('SEA', 'JFK', 3860), ('MIA', 'JFK', 1765)
         ]
         
-        for i in range(50):  # Generate 50 additional flights
-            flight_date = base_date + timedelta(days=i % 7)
-            airline = airlines[i % len(airlines)]
-            flight_num = f"{airline}{1000 + i}"
-            dep_airport, arr_airport, distance = routes[i % len(routes)]
-            aircraft = aircraft_types[i % len(aircraft_types)]
-            
-            scheduled_dep = flight_date.replace(hour=6 + (i % 12), minute=0, second=0)
-            scheduled_arr = scheduled_dep + timedelta(hours=3 + (i % 4))
-            
-            insert_query = """
-            INSERT INTO flights (
-                flight_number, airline_code, departure_airport, arrival_airport,
-                scheduled_departure, scheduled_arrival, status, aircraft_type, distance_km,
-                capacity_economy, capacity_business, capacity_first
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            cursor.execute(insert_query, (
-                flight_num, airline, dep_airport, arr_airport,
-                scheduled_dep, scheduled_arr, 'SCHEDULED', aircraft, distance,
-                150 + (i % 50), 20 + (i % 10), 4 + (i % 4)
-            ))
+        # Build the rows column-wise instead of one INSERT per flight
+        i = np.arange(count)
+        airline = np.array(airlines)[i % len(airlines)]
+        route = i % len(routes)
+        midnight = pd.Timestamp(base_date).normalize()
+        scheduled_dep = midnight + pd.to_timedelta(i % 7, unit='D') + pd.to_timedelta(6 + (i % 12), unit='h')
+
+        flights = pd.DataFrame({
+            'flight_number': [f"{code}{1000 + n}" for code, n in zip(airline, i)],
+            'airline_code': airline,
+            'departure_airport': [routes[r][0] for r in route],
+            'arrival_airport': [routes[r][1] for r in route],
+            'scheduled_departure': scheduled_dep,
+            'scheduled_arrival': scheduled_dep + pd.to_timedelta(3 + (i % 4), unit='h'),
+            'status': 'SCHEDULED',
+            'aircraft_type': np.array(aircraft_types)[i % len(aircraft_types)],
+            'distance_km': [routes[r][2] for r in route],
+            'capacity_economy': 150 + (i % 50),
+            'capacity_business': 20 + (i % 10),
+            'capacity_first': 4 + (i % 4)
+        })
         
-        cursor.close()
+        self.bulk_load(flights, 'flights')
         print("Generated additional flight data")
     
-    def load_from_csv(self, csv_file, table_name):
+    def load_from_csv(self, csv_file, table_name, chunk_rows=COPY_CHUNK_ROWS):
         """Load data from CSV file to Snowflake table"""
         try:
-            df = pd.read_csv(csv_file)
-            cursor = self.conn.cursor()
-            
-            # Generate placeholders for SQL
-            placeholders = ', '.join(['%s'] * len(df.columns))
-            columns = ', '.join(df.columns)
+            start = time.monotonic()
+            total = 0
+            # Stream the file so a multi-million row CSV never has to fit in memory
+            for df in pd.read_csv(csv_file, chunksize=chunk_rows):
+                total += self.bulk_load(df, table_name)
             
-            insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
-            
-            for _, row in df.iterrows():
-                cursor.execute(insert_query, tuple(row))
-            
-            cursor.close()
-            print(f"Loaded data from {csv_file} to {table_name}")
+            elapsed = time.monotonic() - start
+            print(f"Loaded {total} rows from {csv_file} to {table_name} in {elapsed:.1f}s "
+                  f"({total / elapsed if elapsed > 0 else 0:.0f} rows/sec)")
             
         except Exception as e:
             print(f"Error loading CSV: {e}")
     
+    def bulk_load(self, df, table_name):
+        """
+        Load a DataFrame into table_name: small inputs go through batched
+        executemany, larger ones are written as compressed Parquet chunks,
+        PUT to a temporary stage and loaded with one COPY INTO.
+        """
+        if df.empty:
+            return 0
+        
+        start = time.monotonic()
+        if len(df) < BULK_LOAD_MIN_ROWS:
+            method = 'executemany'
+            rows = self._insert_many(df, table_name)
+        else:
+            method = 'COPY INTO'
+            rows = self._copy_into(df, table_name)
+        
+        elapsed = time.monotonic() - start
+        print(f"Loaded {rows} rows into {table_name} via {method} in {elapsed:.1f}s "
+              f"({rows / elapsed if elapsed > 0 else 0:.0f} rows/sec)")
+        return rows
+    
+    def _insert_many(self, df, table_name):
+        """Multi-row INSERTs in batches of INSERT_BATCH_ROWS"""
+        placeholders = ', '.join(['%s'] * len(df.columns))
+        columns = ', '.join(df.columns)
+        insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        
+        # Plain Python values (datetime rather than pandas Timestamp), with NaN/NaT bound as NULL
+        df = df.astype(object).where(pd.notnull(df), None)
+        values = [
+            [value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in row]
+            for row in df.values.tolist()
+        ]
+        cursor = self.conn.cursor()
+        try:
+            for i in range(0, len(values), INSERT_BATCH_ROWS):
+                cursor.executemany(insert_query, values[i:i + INSERT_BATCH_ROWS])
+        finally:
+            cursor.close()
+        return len(values)
+    
+    def _copy_into(self, df, table_name):
+        """Stage the DataFrame as Snappy-compressed Parquet files and COPY them in one statement"""
+        df = df.copy()
+        # Parquet timestamps would land as epoch numbers, send them as text Snowflake can cast
+        for column in df.select_dtypes(include=['datetime', 'datetimetz']).columns:
+            df[column] = df[column].dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+        
+        success, chunks, rows, _ = write_pandas(
+            self.conn, df, table_name.upper(),
+            chunk_size=COPY_CHUNK_ROWS,
+            compression='snappy',
+            quote_identifiers=False
+        )
+        if not success:
+            raise RuntimeError(f"COPY INTO {table_name} did not load every staged chunk")
+        print(f"Staged {chunks} Parquet chunks for {table_name}")
+        return rows
+    
     def create_sample_views(self):
         """Create useful views for reporting"""
         cursor = self.conn.cursor()
@@ -0,0 +1,148 @@
+import argparse
+import glob
+import json
+import math
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+DEFAULT_URL = "http://localhost:8000"
+
+
+def load_queries(path: str, limit: Optional[int] = None) -> List[Dict]:
+    """
+    Logged queries (backend QueryLog JSONL) in arrival order, from a file or
+    a log directory including its rotated files
+    """
+    if os.path.isdir(path):
+        files = glob.glob(os.path.join(path, "queries.jsonl*"))
+    else:
+        files = [path]
+    queries = []
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as f:
+            queries.extend(json.loads(line) for line in f if line.strip())
+    queries.sort(key=lambda query: query["ts"])
+    return queries[:limit] if limit else queries
+
+
+def schedule(queries: List[Dict], speed: float = 1.0, rate: Optional[float] = None) -> List[float]:
+    """Send offsets in seconds: the recorded gaps divided by speed, or evenly spaced at a fixed rate"""
+    if rate:
+        return [index / rate for index in range(len(queries))]
+    start = queries[0]["ts"] if queries else 0
+    return [(query["ts"] - start) / speed for query in queries]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[max(math.ceil(p / 100 * len(values)) - 1, 0)], 4)
+
+
+class Replayer:
+    """Reissues logged queries against a backend on their schedule and collects the outcomes"""
+
+    def __init__(self, url: str, concurrency: int = 32, timeout: float = 60.0):
+        self.url = url.rstrip("/") + "/query"
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.results: List[Dict] = []
+        self.late = 0
+        self._lock = threading.Lock()
+
+    def run(self, queries: List[Dict], offsets: List[float]):
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for query, offset in zip(queries, offsets):
+                delay = start + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -1.0:
+                    # The client itself is falling behind the requested arrival rate
+                    self.late += 1
+                executor.submit(self._send, query)
+        # Includes waiting for the requests still in flight
+        return time.monotonic() - start
+
+    def _send(self, query: Dict):
+        payload = {
+            "question": query["question"],
+            "context_type": query.get("context_type") or "general",
+            "filters": query.get("filters"),
+            "include_usage": True
+        }
+        request = urllib.request.Request(
+            self.url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+        )
+        start = time.monotonic()
+        result = {"status": None, "route": None, "cache": None}
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = json.loads(response.read())
+                result["status"] = response.status
+                result["route"] = body.get("retrieval")
+                result["cache"] = (body.get("usage") or {}).get("cache") or body.get("cache")
+        except urllib.error.HTTPError as e:
+            result["status"] = e.code
+        except Exception as e:
+            result["status"] = type(e).__name__
+        result["latency_s"] = time.monotonic() - start
+        with self._lock:
+            self.results.append(result)
+
+    def report(self, elapsed: float) -> Dict:
+        ok = [result for result in self.results if result["status"] == 200]
+        latencies = [result["latency_s"] for result in ok]
+        routes = Counter(result["route"] for result in ok)
+        return {
+            "requests": len(self.results),
+            "elapsed_s": round(elapsed, 2),
+            "throughput_qps": round(len(self.results) / elapsed, 2) if elapsed else None,
+            "errors": dict(Counter(str(r["status"]) for r in self.results if r["status"] != 200)),
+            "late_sends": self.late,
+            "latency_s": {f"p{p}": percentile(latencies, p) for p in (50, 90, 95, 99)},
+            "latency_max_s": round(max(latencies), 4) if latencies else None,
+            "cache_hit_rate": round(sum(1 for r in ok if r["cache"] == "hit") / len(ok), 3) if ok else None,
+            "structured_rate": round(
+                sum(count for route, count in routes.items() if route and route.startswith("structured")) / len(ok), 3
+            ) if ok else None,
+            "routes": dict(routes)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay logged /query traffic against a backend")
+    parser.add_argument('log', help="Query log file or QUERY_LOG_DIR directory")
+    parser.add_argument('--url', default=os.getenv("BACKEND_URL", DEFAULT_URL))
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Arrival-rate multiplier over the recorded traffic, e.g. 2 replays twice as fast")
+    parser.add_argument('--rate', type=float, help="Fixed arrival rate in queries/sec instead of the recorded gaps")
+    parser.add_argument('--limit', type=int, help="Replay only the first N queries")
+    parser.add_argument('--concurrency', type=int, default=32, help="Maximum requests in flight")
+    parser.add_argument('--output', help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    queries = [query for query in load_queries(args.log, args.limit) if query.get("status", "ok") == "ok"]
+    if not queries:
+        print("No queries to replay")
+        return
+    offsets = schedule(queries, args.speed, args.rate)
+    print(f"Replaying {len(queries)} queries over {offsets[-1]:.0f}s against {args.url}")
+
+    replayer = Replayer(args.url, args.concurrency)
+    report = replayer.report(replayer.run(queries, offsets))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
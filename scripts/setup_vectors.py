@@ -1,12 +1,27 @@
+import argparse
+import hashlib
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from dotenv import load_dotenv
 
 load_dotenv()
 
 sys.path.append('./backend')
+# rag_service imports its sibling modules by name, as when main.py runs from backend/app
+sys.path.append('./backend/app')
 
 from app.rag_service import RAGService
+from search_filters import categorize
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+DOCUMENT_EXTENSIONS = ('.txt', '.md')
+# Same chunking as the Airflow vector store pipeline
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+BATCH_RETRIES = 3
 
 # Sample aviation documents
 aviation_docs = [
@@ -146,5 +161,196 @@ def setup_sample_data():
     rag_service.add_documents(aviation_docs)
     print("Sample aviation documents added to vector store!")
 
+def migrate_metadata(collection, batch_size=500):
+    """
+    Move the top-level metadata fields of vectors written before metadata was
+    nested under "metadata" into it, so the metadata.<field> pre-filters match them
+    """
+    from pymongo import UpdateOne
+
+    keep = {"_id", "text", "embedding", "content_hash", "indexed_at"}
+    batch = []
+    migrated = 0
+    for doc in collection.find({"metadata": {"$exists": False}}, {"embedding": 0}):
+        fields = {key: value for key, value in doc.items() if key not in keep}
+        batch.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"metadata": fields}, "$unset": {key: "" for key in fields}} if fields
+            else {"$set": {"metadata": {}}}
+        ))
+        if len(batch) >= batch_size:
+            migrated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        migrated += collection.bulk_write(batch, ordered=False).modified_count
+    print(f"Nested the metadata of {migrated} vectors")
+    return migrated
+
+def iter_source(source):
+    """Yield {"text", "metadata"} documents from a directory of text files or a JSONL file, in a stable order"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if not filename.endswith(DOCUMENT_EXTENSIONS):
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                yield {
+                    "text": text,
+                    "metadata": {
+                        "source": os.path.relpath(path, source),
+                        "doc_type": "document",
+                        "category": categorize(filename)
+                    }
+                }
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f):
+                if line.strip():
+                    doc = json.loads(line)
+                    metadata = doc.get("metadata", {})
+                    metadata.setdefault("source", doc.get("id", f"{os.path.basename(source)}:{line_number}"))
+                    yield {"text": doc["text"], "metadata": metadata}
+
+def iter_chunks(source):
+    """Split each document into chunks with ids derived from the source and chunk text"""
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    for doc in iter_source(source):
+        for text in splitter.split_text(doc["text"]):
+            chunk_id = hashlib.sha256(f"{doc['metadata']['source']}\x00{text}".encode('utf-8')).hexdigest()
+            yield chunk_id, {"text": text, "metadata": doc["metadata"]}
+
+def iter_batches(source, batch_size):
+    batch = []
+    for chunk in iter_chunks(source):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def count_documents(source):
+    """Document count for the ETA, without reading file contents"""
+    if os.path.isdir(source):
+        return sum(
+            1 for _, _, files in os.walk(source) for filename in files if filename.endswith(DOCUMENT_EXTENSIONS)
+        )
+    with open(source, 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip())
+
+def load_checkpoint(path, source, batch_size):
+    """Number of leading batches already loaded for this source and batch size"""
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != os.path.abspath(source) or checkpoint.get("batch_size") != batch_size:
+        print(f"Ignoring checkpoint {path}: it was written for a different source or batch size")
+        return 0
+    return checkpoint["batches_done"]
+
+def save_checkpoint(path, source, batch_size, batches_done, chunks_done):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            "source": os.path.abspath(source),
+            "batch_size": batch_size,
+            "batches_done": batches_done,
+            "chunks_done": chunks_done
+        }, f)
+    os.replace(tmp_path, path)
+
+def add_batch(rag_service, batch):
+    """Embed and upsert one batch, retrying with backoff"""
+    for attempt in range(1, BATCH_RETRIES + 1):
+        try:
+            rag_service.add_documents([doc for _, doc in batch], ids=[chunk_id for chunk_id, _ in batch])
+            return len(batch)
+        except Exception as e:
+            if attempt == BATCH_RETRIES:
+                raise
+            print(f"Batch failed ({e}), retrying in {2 ** attempt}s")
+            time.sleep(2 ** attempt)
+
+def load_corpus(source, batch_size=64, concurrency=4, checkpoint_path=None, reset=False):
+    """
+    Stream a corpus into the vector store in batches, with up to concurrency
+    batches in flight. Progress is checkpointed as the number of leading
+    batches that completed, so an interrupted run resumes after them; chunk
+    ids are stable, so batches replayed after a crash are upserted, not duplicated.
+    """
+    checkpoint_path = checkpoint_path or f"{source.rstrip(os.sep)}.checkpoint.json"
+    if reset and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    skip = load_checkpoint(checkpoint_path, source, batch_size)
+    total_docs = count_documents(source)
+    if skip:
+        print(f"Resuming after {skip} completed batches")
+
+    rag_service = RAGService()
+    start = time.monotonic()
+    chunks_done = 0
+    docs_seen = set()
+    docs_skipped = 0
+    finished = set()
+    batches_done = skip
+    in_flight = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for index, batch in enumerate(iter_batches(source, batch_size)):
+            docs_seen.update(doc["metadata"]["source"] for _, doc in batch)
+            if index < skip:
+                docs_skipped = len(docs_seen)
+                continue
+
+            # Bound the number of pending batches so memory stays flat
+            while len(in_flight) >= concurrency:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunks_done += future.result()
+                    finished.add(in_flight.pop(future))
+                while batches_done in finished:
+                    finished.remove(batches_done)
+                    batches_done += 1
+                save_checkpoint(checkpoint_path, source, batch_size, batches_done, chunks_done)
+                report_progress(start, chunks_done, len(docs_seen), docs_skipped, total_docs)
+
+            in_flight[executor.submit(add_batch, rag_service, batch)] = index
+
+        for future in in_flight:
+            chunks_done += future.result()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    elapsed = time.monotonic() - start
+    print(f"Loaded {chunks_done} chunks from {total_docs} documents in {elapsed:.1f}s")
+
+def report_progress(start, chunks_done, docs_seen, docs_skipped, total_docs):
+    elapsed = time.monotonic() - start
+    rate = (docs_seen - docs_skipped) / elapsed if elapsed > 0 else 0.0
+    eta = (total_docs - docs_seen) / rate if rate > 0 else float('inf')
+    print(f"{docs_seen}/{total_docs} documents, {chunks_done} chunks, {rate:.1f} docs/sec, ETA {eta:.0f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load aviation documents into the vector store")
+    parser.add_argument('--source', help="Directory of .txt/.md files or a JSONL file of {text, metadata}; "
+                                         "loads the built-in samples when omitted")
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--checkpoint', help="Checkpoint file (default: <source>.checkpoint.json)")
+    parser.add_argument('--reset', action='store_true', help="Ignore an existing checkpoint and start over")
+    parser.add_argument('--migrate-metadata', action='store_true',
+                        help="Nest the top-level metadata of vectors loaded by older versions, then exit")
+    args = parser.parse_args()
+
+    if args.migrate_metadata:
+        migrate_metadata(RAGService().collection)
+    elif args.source:
+        load_corpus(args.source, args.batch_size, args.concurrency, args.checkpoint, args.reset)
+    else:
+        setup_sample_data()
+
 if __name__ == "__main__":
-    setup_sample_data()
\ No newline at end of file
+    main()
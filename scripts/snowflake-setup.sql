@@ -29,7 +29,8 @@ CREATE OR REPLACE TABLE flights (
     capacity_business NUMBER(4),
     capacity_first NUMBER(4),
     created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
-    updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+    updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    loaded_at TIMESTAMP_NTZ
 );
 
 -- Cargo manifests table
@@ -48,7 +49,8 @@ CREATE OR REPLACE TABLE cargo_manifests (
     hazardous_material BOOLEAN DEFAULT FALSE,
     hazmat_class VARCHAR(10),
     storage_requirements VARCHAR(100),
-    created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+    created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
+    loaded_at TIMESTAMP_NTZ
 );
 
 -- Aircraft maintenance table
@@ -95,4 +97,11 @@ CREATE OR REPLACE TABLE flight_operations (
     delay_reason VARCHAR(200),
     weather_conditions VARCHAR(100),
     created_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
-);
\ No newline at end of file
+);
+
+-- High-water marks for incremental loads from staging (see aviation_data_pipeline)
+CREATE TABLE IF NOT EXISTS etl_watermarks (
+    source_table VARCHAR(100) NOT NULL PRIMARY KEY,
+    high_water_mark TIMESTAMP_NTZ NOT NULL,
+    updated_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+);